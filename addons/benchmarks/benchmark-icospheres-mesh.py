@@ -0,0 +1,148 @@
+####################################################################################################
+# Copyright (c) 2023, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# Usage:
+#   blender -b --python benchmark-icospheres-mesh.py -- --counts 10000 100000 1000000
+
+# Imports
+import argparse
+import os
+import sys
+import time
+
+import numpy
+import bpy
+
+# Append the VessMorphoVis package to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+import vmv.bmeshi
+import vmv.mesh
+import vmv.scene
+
+
+####################################################################################################
+# @parse_command_line_arguments
+####################################################################################################
+def parse_command_line_arguments():
+    """Parses the input arguments given after the '--' to Blender.
+
+    :return:
+        Arguments list.
+    """
+
+    # add all the options
+    description = 'Benchmarks the creation of a single mesh of many ico-spheres.'
+    parser = argparse.ArgumentParser(description=description)
+
+    arg_help = 'The numbers of spheres to benchmark.'
+    parser.add_argument('--counts',
+                        action='store', dest='counts', type=int, nargs='+',
+                        default=[10000, 100000, 1000000], help=arg_help)
+
+    arg_help = 'The number of subdivisions of the ico-spheres.'
+    parser.add_argument('--subdivisions',
+                        action='store', dest='subdivisions', type=int, default=1, help=arg_help)
+
+    arg_help = 'The largest number of spheres that is also benchmarked with the bmesh path.'
+    parser.add_argument('--bmesh-limit',
+                        action='store', dest='bmesh_limit', type=int, default=100000,
+                        help=arg_help)
+
+    # Parse the arguments given after the '--'
+    arguments = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    return parser.parse_args(arguments)
+
+
+####################################################################################################
+# @benchmark_bmesh
+####################################################################################################
+def benchmark_bmesh(centers,
+                    radii,
+                    subdivisions):
+    """Creates the spheres mesh with the per-sphere bmesh path and returns the time it takes.
+
+    :param centers:
+        An (N x 3) array of the centers of the spheres.
+    :param radii:
+        An array of the N radii of the spheres.
+    :param subdivisions:
+        The number of subdivisions of the ico-spheres.
+    :return:
+        The time in seconds.
+    """
+
+    start = time.time()
+    bmesh_object = vmv.bmeshi.create_bmesh_object_from_spheres_list_using_icospheres(
+        spheres_list=[[center, radius] for center, radius in zip(centers.tolist(), radii.tolist())],
+        subdivisions=subdivisions)
+    mesh_object = vmv.bmeshi.convert_bmesh_to_mesh(bmesh_object=bmesh_object, name='bmesh')
+    elapsed = time.time() - start
+    vmv.scene.delete_object_in_scene(scene_object=mesh_object)
+    return elapsed
+
+
+####################################################################################################
+# @benchmark_arrays
+####################################################################################################
+def benchmark_arrays(centers,
+                     radii,
+                     subdivisions):
+    """Creates the spheres mesh with the array-based path and returns the time it takes.
+
+    NOTE: The same re-meshed template of the bmesh path is used to create the same geometry.
+
+    :param centers:
+        An (N x 3) array of the centers of the spheres.
+    :param radii:
+        An array of the N radii of the spheres.
+    :param subdivisions:
+        The number of subdivisions of the ico-spheres.
+    :return:
+        The time in seconds.
+    """
+
+    start = time.time()
+    mesh_object = vmv.mesh.create_icospheres_mesh(
+        centers=centers, radii=radii, name='arrays',
+        icosphere_template=vmv.mesh.get_remeshed_icosphere_data(subdivisions=subdivisions))
+    elapsed = time.time() - start
+    vmv.scene.delete_object_in_scene(scene_object=mesh_object)
+    return elapsed
+
+
+####################################################################################################
+# @ Run the script
+####################################################################################################
+if __name__ == "__main__":
+
+    # Parse the command line arguments
+    args = parse_command_line_arguments()
+
+    random_generator = numpy.random.default_rng(0)
+    for count in args.counts:
+
+        # Random spheres in a cube of 1000 microns
+        centers = random_generator.uniform(0.0, 1000.0, size=(count, 3)).astype(numpy.float32)
+        radii = random_generator.uniform(0.5, 5.0, size=count).astype(numpy.float32)
+
+        arrays_time = benchmark_arrays(centers, radii, args.subdivisions)
+        if count <= args.bmesh_limit:
+            bmesh_time = benchmark_bmesh(centers, radii, args.subdivisions)
+            print('%d spheres: arrays %.3f s, bmesh %.3f s (x%.1f)' % (
+                count, arrays_time, bmesh_time, bmesh_time / max(arrays_time, 1e-9)))
+        else:
+            print('%d spheres: arrays %.3f s' % (count, arrays_time))
@@ -0,0 +1,195 @@
+####################################################################################################
+# Copyright (c) 2023, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# Usage:
+#   blender -b --python benchmark-poly-lines.py -- --counts 1000000 2000000 4000000
+
+# Imports
+import argparse
+import os
+import sys
+import time
+
+import numpy
+import bpy
+
+# Append the VessMorphoVis package to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+import vmv.geometry
+import vmv.skeleton
+
+
+####################################################################################################
+# @parse_command_line_arguments
+####################################################################################################
+def parse_command_line_arguments():
+    """Parses the input arguments given after the '--' to Blender.
+
+    :return:
+        Arguments list.
+    """
+
+    # add all the options
+    description = 'Benchmarks the creation of the splines of a poly-lines object.'
+    parser = argparse.ArgumentParser(description=description)
+
+    arg_help = 'The numbers of samples to benchmark.'
+    parser.add_argument('--counts',
+                        action='store', dest='counts', type=int, nargs='+',
+                        default=[1000000, 2000000, 4000000], help=arg_help)
+
+    arg_help = 'The number of samples of every poly-line.'
+    parser.add_argument('--samples-per-line',
+                        action='store', dest='samples_per_line', type=int, default=20,
+                        help=arg_help)
+
+    arg_help = 'The largest number of samples that is also benchmarked with the per-point path.'
+    parser.add_argument('--per-point-limit',
+                        action='store', dest='per_point_limit', type=int, default=4000000,
+                        help=arg_help)
+
+    # Parse the arguments given after the '--'
+    arguments = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    return parser.parse_args(arguments)
+
+
+####################################################################################################
+# @get_curve_arrays
+####################################################################################################
+def get_curve_arrays(curve):
+    """Gets the coordinates, radii and material indices of the splines of a curve.
+
+    :param curve:
+        A curve data block.
+    :return:
+        The coordinates, radii and material indices of the splines.
+    """
+
+    coordinates, radii = list(), list()
+    for spline in curve.splines:
+        spline_coordinates = numpy.zeros(4 * len(spline.points), dtype=numpy.float32)
+        spline_radii = numpy.zeros(len(spline.points), dtype=numpy.float32)
+        spline.points.foreach_get('co', spline_coordinates)
+        spline.points.foreach_get('radius', spline_radii)
+        coordinates.append(spline_coordinates)
+        radii.append(spline_radii)
+    material_indices = numpy.zeros(len(curve.splines), dtype=numpy.int32)
+    curve.splines.foreach_get('material_index', material_indices)
+    return numpy.concatenate(coordinates), numpy.concatenate(radii), material_indices
+
+
+####################################################################################################
+# @benchmark_per_point
+####################################################################################################
+def benchmark_per_point(poly_lines):
+    """Creates the splines by setting every point, and returns the time and the curve.
+
+    :param poly_lines:
+        A list of @PolyLine objects.
+    :return:
+        The time in seconds and the curve.
+    """
+
+    curve = vmv.geometry.create_poly_lines_object_base(name='per-point')
+    start = time.time()
+    for poly_line in poly_lines:
+        vmv.geometry.append_poly_line_to_poly_lines_object(
+            poly_lines_object=curve, poly_line_data=poly_line)
+    return time.time() - start, curve
+
+
+####################################################################################################
+# @benchmark_bulk
+####################################################################################################
+def benchmark_bulk(poly_lines):
+    """Creates the splines from a list of poly-lines with foreach_set, including the packing of
+    the poly-lines into arrays, and returns the time and the curve.
+
+    :param poly_lines:
+        A list of @PolyLine objects.
+    :return:
+        The time in seconds and the curve.
+    """
+
+    curve = vmv.geometry.create_poly_lines_object_base(name='bulk')
+    start = time.time()
+    vmv.geometry.append_poly_lines_to_poly_lines_object(
+        poly_lines_object=curve, poly_lines_data=poly_lines)
+    return time.time() - start, curve
+
+
+####################################################################################################
+# @benchmark_arrays
+####################################################################################################
+def benchmark_arrays(poly_lines_arrays):
+    """Creates the splines from poly-lines arrays with foreach_set, and returns the time and the
+    curve.
+
+    :param poly_lines_arrays:
+        A @PolyLinesArrays object.
+    :return:
+        The time in seconds and the curve.
+    """
+
+    curve = vmv.geometry.create_poly_lines_object_base(name='arrays')
+    start = time.time()
+    vmv.geometry.append_poly_lines_arrays_to_poly_lines_object(
+        poly_lines_object=curve, poly_lines_arrays=poly_lines_arrays)
+    return time.time() - start, curve
+
+
+####################################################################################################
+# @ Run the script
+####################################################################################################
+if __name__ == "__main__":
+
+    # Parse the command line arguments
+    args = parse_command_line_arguments()
+
+    random_generator = numpy.random.default_rng(0)
+    for count in args.counts:
+
+        # Random poly-lines in a cube of 1000 microns, with two materials
+        number_lines = max(1, count // args.samples_per_line)
+        shape = (number_lines, args.samples_per_line)
+        points = random_generator.uniform(0.0, 1000.0, size=shape + (3, ))
+        radii = random_generator.uniform(0.5, 5.0, size=shape)
+        poly_lines = [vmv.skeleton.PolyLine(
+            samples=[[(x, y, z, 1.0), radius] for (x, y, z), radius in zip(
+                line_points.tolist(), line_radii.tolist())], color_index=i % 2)
+            for i, (line_points, line_radii) in enumerate(zip(points, radii))]
+        poly_lines_arrays = vmv.skeleton.construct_poly_lines_arrays_from_poly_lines(poly_lines)
+
+        bulk_time, bulk_curve = benchmark_bulk(poly_lines)
+        arrays_time, arrays_curve = benchmark_arrays(poly_lines_arrays)
+        reference = get_curve_arrays(bulk_curve)
+        assert all(numpy.array_equal(a, b) for a, b in zip(reference, get_curve_arrays(
+            arrays_curve)))
+        bpy.data.curves.remove(arrays_curve)
+
+        samples = number_lines * args.samples_per_line
+        if samples <= args.per_point_limit:
+            per_point_time, per_point_curve = benchmark_per_point(poly_lines)
+            assert all(numpy.array_equal(a, b) for a, b in zip(reference, get_curve_arrays(
+                per_point_curve)))
+            bpy.data.curves.remove(per_point_curve)
+            print('%d samples: bulk %.3f s, arrays %.3f s, per-point %.3f s (x%.1f)' % (
+                samples, bulk_time, arrays_time, per_point_time,
+                per_point_time / max(bulk_time, 1e-9)))
+        else:
+            print('%d samples: bulk %.3f s, arrays %.3f s' % (samples, bulk_time, arrays_time))
+        bpy.data.curves.remove(bulk_curve)
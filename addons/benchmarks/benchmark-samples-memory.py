@@ -0,0 +1,179 @@
+####################################################################################################
+# Copyright (c) 2023, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# Usage:
+#   blender -b --python benchmark-samples-memory.py -- --counts 100000 1000000
+
+# Imports
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+import numpy
+import bpy
+from mathutils import Vector
+
+# Append the VessMorphoVis package to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+import vmv.file
+import vmv.skeleton
+
+
+####################################################################################################
+# @parse_command_line_arguments
+####################################################################################################
+def parse_command_line_arguments():
+    """Parses the input arguments given after the '--' to Blender.
+
+    :return:
+        Arguments list.
+    """
+
+    # add all the options
+    description = 'Benchmarks the memory of the morphology samples, in bytes per sample.'
+    parser = argparse.ArgumentParser(description=description)
+
+    arg_help = 'The numbers of samples to benchmark.'
+    parser.add_argument('--counts',
+                        action='store', dest='counts', type=int, nargs='+',
+                        default=[100000, 1000000], help=arg_help)
+
+    arg_help = 'The VMV morphology files to benchmark.'
+    parser.add_argument('--morphologies',
+                        action='store', dest='morphologies', nargs='+',
+                        default=[os.path.abspath(os.path.join(
+                            os.path.dirname(__file__), '..', '..', 'data', 'morphologies', 'vmv',
+                            'sample-1.vmv'))], help=arg_help)
+
+    # Parse the arguments given after the '--'
+    arguments = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    return parser.parse_args(arguments)
+
+
+####################################################################################################
+# @measure_memory
+####################################################################################################
+def measure_memory(function):
+    """Calls a function and returns the memory that is still allocated after the call, with the
+    result of the function.
+
+    :param function:
+        A function without arguments.
+    :return:
+        The allocated memory in bytes and the result of the function.
+    """
+
+    gc.collect()
+    tracemalloc.start()
+    result = function()
+    gc.collect()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return allocated, result
+
+
+####################################################################################################
+# @benchmark_samples
+####################################################################################################
+def benchmark_samples(points,
+                      radii):
+    """Creates the samples of a list of points with a Vector per sample, and with shared coordinate
+    rows as the VMV loader does, and returns the bytes per sample of both.
+
+    :param points:
+        An (N x 3) array of the points of the samples.
+    :param radii:
+        An array of the N radii of the samples.
+    :return:
+        The bytes per sample with Vectors and with coordinate rows.
+    """
+
+    points = points.tolist()
+    radii = radii.tolist()
+
+    # A Vector per sample, as before
+    vectors_memory, samples = measure_memory(lambda: [
+        vmv.skeleton.Sample(point=Vector(point), radius=radius, index=i)
+        for i, (point, radius) in enumerate(zip(points, radii))])
+    del samples
+
+    # The rows, that are created once and shared by the samples of the same vertex
+    rows_memory, samples = measure_memory(lambda: [
+        vmv.skeleton.Sample(point=point, radius=radius, index=i)
+        for i, (point, radius) in enumerate(zip(map(tuple, points), radii))])
+    del samples
+
+    return vectors_memory / len(points), rows_memory / len(points)
+
+
+####################################################################################################
+# @benchmark_morphology
+####################################################################################################
+def benchmark_morphology(morphology_file):
+    """Loads the sections of a VMV morphology and returns the number of samples and the bytes per
+    sample, before and after the Vectors of the samples are created.
+
+    :param morphology_file:
+        The path to a VMV morphology file.
+    :return:
+        The number of samples, the bytes per sample with coordinate rows and with Vectors.
+    """
+
+    def load_sections():
+        reader = vmv.file.VMVReader(morphology_file)
+        reader.read_data_from_file()
+        return reader.sections_list
+
+    rows_memory, sections = measure_memory(load_sections)
+    number_samples = sum(len(section.samples) for section in sections)
+
+    # Access the points, which creates the Vectors
+    tracemalloc.start()
+    for section in sections:
+        for sample in section.samples:
+            _ = sample.point
+    vectors_memory = rows_memory + tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return number_samples, rows_memory / number_samples, vectors_memory / number_samples
+
+
+####################################################################################################
+# @ Run the script
+####################################################################################################
+if __name__ == "__main__":
+
+    # Parse the command line arguments
+    args = parse_command_line_arguments()
+
+    random_generator = numpy.random.default_rng(0)
+    for count in args.counts:
+
+        # Random samples in a cube of 1000 microns
+        points = random_generator.uniform(0.0, 1000.0, size=(count, 3))
+        radii = random_generator.uniform(0.5, 5.0, size=count)
+
+        vectors_bytes, rows_bytes = benchmark_samples(points, radii)
+        print('%d samples: vectors %.1f B/sample, rows %.1f B/sample' % (
+            count, vectors_bytes, rows_bytes))
+
+    for morphology_file in args.morphologies:
+        number_samples, rows_bytes, vectors_bytes = benchmark_morphology(morphology_file)
+        print('%s [%d samples]: loaded %.1f B/sample, with vectors %.1f B/sample' % (
+            os.path.basename(morphology_file), number_samples, rows_bytes, vectors_bytes))
@@ -0,0 +1,180 @@
+####################################################################################################
+# Copyright (c) 2023, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# Usage:
+#   blender -b --python benchmark-vmv-graph.py -- --counts 1000 10000 100000
+
+# Imports
+import argparse
+import os
+import sys
+import time
+
+import numpy
+import bpy
+
+# Append the VessMorphoVis package to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+import vmv.file
+import vmv.skeleton
+
+
+####################################################################################################
+# @parse_command_line_arguments
+####################################################################################################
+def parse_command_line_arguments():
+    """Parses the input arguments given after the '--' to Blender.
+
+    :return:
+        Arguments list.
+    """
+
+    # add all the options
+    description = 'Benchmarks the linking of the strands of a VMV morphology into a graph.'
+    parser = argparse.ArgumentParser(description=description)
+
+    arg_help = 'The numbers of strands to benchmark.'
+    parser.add_argument('--counts',
+                        action='store', dest='counts', type=int, nargs='+',
+                        default=[1000, 10000, 100000], help=arg_help)
+
+    arg_help = 'The number of samples of every strand.'
+    parser.add_argument('--samples',
+                        action='store', dest='samples', type=int, default=10, help=arg_help)
+
+    arg_help = 'The largest number of strands that is also benchmarked with the all-pairs path.'
+    parser.add_argument('--all-pairs-limit',
+                        action='store', dest='all_pairs_limit', type=int, default=10000,
+                        help=arg_help)
+
+    # Parse the arguments given after the '--'
+    arguments = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    return parser.parse_args(arguments)
+
+
+####################################################################################################
+# @create_strands
+####################################################################################################
+def create_strands(number_strands,
+                   number_samples,
+                   random_generator):
+    """Creates the strands of a random tree, where every strand starts at the last sample of a
+    random earlier strand.
+
+    :param number_strands:
+        The number of strands.
+    :param number_samples:
+        The number of samples of every strand.
+    :param random_generator:
+        A numpy random generator.
+    :return:
+        A list of sections.
+    """
+
+    sections = list()
+    parents = random_generator.integers(0, numpy.maximum(numpy.arange(number_strands), 1))
+    for i in range(number_strands):
+        samples = [vmv.skeleton.Sample(point=(0.0, 0.0, 0.0), radius=1.0,
+                                       index=1 + i * number_samples + j)
+                   for j in range(number_samples)]
+
+        # Share the first sample with the last sample of the parent strand
+        if i > 0:
+            samples[0].index = sections[parents[i]].samples[-1].index
+        sections.append(vmv.skeleton.Section(index=i, samples=samples))
+    return sections
+
+
+####################################################################################################
+# @build_graph_all_pairs
+####################################################################################################
+def build_graph_all_pairs(reader):
+    """Builds the graph of a reader by comparing the terminal samples of every pair of strands.
+
+    :param reader:
+        A VMVReader with parsed sections.
+    """
+
+    sections = reader.sections_list
+    for i_section in range(len(sections)):
+        i_first_sample_index = sections[i_section].samples[0].index
+        i_last_sample_index = sections[i_section].samples[-1].index
+        for j_section in range(len(sections)):
+            if i_section == j_section:
+                continue
+            if i_first_sample_index == sections[j_section].samples[-1].index:
+                sections[i_section].parents.append(sections[j_section])
+            if i_last_sample_index == sections[j_section].samples[0].index:
+                sections[i_section].children.append(sections[j_section])
+
+    for section in sections:
+        if section.is_root():
+            reader.roots.append(section)
+
+
+####################################################################################################
+# @benchmark_graph
+####################################################################################################
+def benchmark_graph(sections,
+                    build_graph):
+    """Builds the graph of a list of sections and returns the time it takes and the number of the
+    links and the roots.
+
+    :param sections:
+        A list of sections.
+    :param build_graph:
+        A function that builds the graph of a VMVReader.
+    :return:
+        The time in seconds, the number of the parent links and the number of the roots.
+    """
+
+    for section in sections:
+        section.parents = list()
+        section.children = list()
+
+    reader = vmv.file.VMVReader(None)
+    reader.sections_list = sections
+    start = time.time()
+    build_graph(reader)
+    elapsed = time.time() - start
+    return elapsed, sum(len(section.parents) for section in sections), len(reader.roots)
+
+
+####################################################################################################
+# @ Run the script
+####################################################################################################
+if __name__ == "__main__":
+
+    # Parse the command line arguments
+    args = parse_command_line_arguments()
+
+    random_generator = numpy.random.default_rng(0)
+    for count in args.counts:
+        sections = create_strands(count, args.samples, random_generator)
+
+        graph_time, links, roots = benchmark_graph(
+            sections, vmv.file.VMVReader.build_graph_from_parsed_data)
+        if count <= args.all_pairs_limit:
+            all_pairs_time, all_pairs_links, all_pairs_roots = benchmark_graph(
+                sections, build_graph_all_pairs)
+            assert (links, roots) == (all_pairs_links, all_pairs_roots)
+            print('%d strands: indexed %.3f s, all-pairs %.3f s (x%.1f), %d links, %d roots' % (
+                count, graph_time, all_pairs_time, all_pairs_time / max(graph_time, 1e-9),
+                links, roots))
+        else:
+            print('%d strands: indexed %.3f s, %d links, %d roots' % (
+                count, graph_time, links, roots))
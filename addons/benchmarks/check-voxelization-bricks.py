@@ -0,0 +1,144 @@
+####################################################################################################
+# Copyright (c) 2023, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# Usage:
+#   blender -b --python check-voxelization-bricks.py -- --brick-sizes 10 20 50
+
+# Imports
+import argparse
+import os
+import sys
+import time
+
+import numpy
+import bpy
+
+# Append the VessMorphoVis package to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+import vmv.builders
+import vmv.file
+import vmv.mesh
+import vmv.options
+import vmv.scene
+
+
+####################################################################################################
+# @parse_command_line_arguments
+####################################################################################################
+def parse_command_line_arguments():
+    """Parses the input arguments given after the '--' to Blender.
+
+    :return:
+        Arguments list.
+    """
+
+    # add all the options
+    description = 'Checks that the voxelization in bricks creates a closed mesh with the same ' \
+                  'volume as the voxelization of the whole proxy mesh.'
+    parser = argparse.ArgumentParser(description=description)
+
+    arg_help = 'The morphology file.'
+    parser.add_argument('--morphology',
+                        action='store', dest='morphology',
+                        default=os.path.abspath(os.path.join(
+                            os.path.dirname(__file__), '..', '..', 'data', 'morphologies', 'vmv',
+                            'sample-1.vmv')), help=arg_help)
+
+    arg_help = 'The sizes of the bricks to check.'
+    parser.add_argument('--brick-sizes',
+                        action='store', dest='brick_sizes', type=float, nargs='+',
+                        default=[10.0, 20.0, 50.0], help=arg_help)
+
+    arg_help = 'The voxel size, by default half the smallest radius of the morphology.'
+    parser.add_argument('--voxel-size',
+                        action='store', dest='voxel_size', type=float, default=0.0,
+                        help=arg_help)
+
+    # Parse the arguments given after the '--'
+    arguments = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    return parser.parse_args(arguments)
+
+
+####################################################################################################
+# @check_voxelization
+####################################################################################################
+def check_voxelization(builder,
+                       brick_size,
+                       voxel_size):
+    """Voxelizes the proxy mesh of a morphology, in bricks if a brick size is given, and returns
+    the time it takes, the number of the edges that are not shared by exactly two triangles and
+    the volume of the mesh.
+
+    :param builder:
+        A VoxelizationBuilder of the morphology.
+    :param brick_size:
+        The size of the bricks, or zero to voxelize the whole proxy mesh.
+    :param voxel_size:
+        The voxel size, or zero to use half the smallest radius of the morphology.
+    :return:
+        The time in seconds, the number of open or non-manifold edges and the volume.
+    """
+
+    # The same proxy mesh of the VoxelizationBuilder
+    sections_mesh = builder.generate_optimized_sections_mesh()
+    branching_mesh = builder.generate_branching_mesh()
+    proxy_mesh = vmv.mesh.join_mesh_objects(
+        mesh_list=[branching_mesh, sections_mesh], name='Vascular Proxy Mesh')
+    if voxel_size <= 0:
+        voxel_size = builder.smallest_radius * 0.5
+
+    start = time.time()
+    builder.options.mesh.voxel_brick_size = brick_size
+    mesh_object = builder.remesh_mesh_object(mesh_object=proxy_mesh, voxel_size=voxel_size)
+    elapsed = time.time() - start
+
+    # The edges of a closed mesh are shared by two triangles
+    vertices, triangles = vmv.mesh.get_mesh_object_triangles(mesh_object)
+    edges = numpy.concatenate((triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]]))
+    _, counts = numpy.unique(numpy.sort(edges, axis=1), axis=0, return_counts=True)
+    vertices = vertices.astype(numpy.float64)
+    volume = numpy.einsum('ij,ij->i', vertices[triangles[:, 0]], numpy.cross(
+        vertices[triangles[:, 1]], vertices[triangles[:, 2]])).sum() / 6.0
+
+    vmv.scene.delete_object_in_scene(scene_object=mesh_object)
+    return elapsed, int(numpy.count_nonzero(counts != 2)), volume
+
+
+####################################################################################################
+# @ Run the script
+####################################################################################################
+if __name__ == "__main__":
+
+    # Parse the command line arguments
+    args = parse_command_line_arguments()
+
+    morphology = vmv.file.read_morphology_with_cache(args.morphology)
+    builder = vmv.builders.VoxelizationBuilder(
+        morphology=morphology, options=vmv.options.VessMorphoVisOptions())
+
+    # The whole proxy mesh is the reference
+    reference_time, reference_edges, reference_volume = check_voxelization(
+        builder, 0.0, args.voxel_size)
+    print('Whole: %.3f s, open edges %d, volume %f' % (
+        reference_time, reference_edges, reference_volume))
+
+    for brick_size in args.brick_sizes:
+        bricks_time, bricks_edges, bricks_volume = check_voxelization(
+            builder, brick_size, args.voxel_size)
+        print('Bricks of %.2f: %.3f s, open edges %d, volume %f (%+.4f %%)' % (
+            brick_size, bricks_time, bricks_edges, bricks_volume,
+            100.0 * (bricks_volume - reference_volume) / abs(reference_volume)))
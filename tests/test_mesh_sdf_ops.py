@@ -0,0 +1,258 @@
+####################################################################################################
+# Copyright (c) 2023, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# Usage, without Blender:
+#   python -m pytest tests
+#   python -m unittest discover -s tests
+
+# System imports
+import concurrent.futures
+import importlib
+import multiprocessing
+import os
+import subprocess
+import sys
+import unittest
+
+import numpy
+
+# The module only uses numpy, it is imported as a top-level module without the vmv package, as
+# the SignedDistanceBuilder does for its worker processes
+SDF_OPS_DIRECTORY = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', 'vmv', 'mesh', 'ops'))
+if SDF_OPS_DIRECTORY not in sys.path:
+    sys.path.append(SDF_OPS_DIRECTORY)
+sdf_ops = importlib.import_module('mesh_sdf_ops')
+
+
+####################################################################################################
+# @get_mesh_edges_counts
+####################################################################################################
+def get_mesh_edges_counts(triangles):
+    """Returns the number of triangles that share every directed and undirected edge of a mesh.
+
+    :param triangles:
+        An (M x 3) array of the triangles of the mesh.
+    :return:
+        The counts of the directed edges and the counts of the undirected edges.
+    """
+
+    edges = numpy.concatenate((triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]]))
+    _, directed_counts = numpy.unique(edges, axis=0, return_counts=True)
+    _, undirected_counts = numpy.unique(numpy.sort(edges, axis=1), axis=0, return_counts=True)
+    return directed_counts, undirected_counts
+
+
+####################################################################################################
+# @compute_mesh_volume
+####################################################################################################
+def compute_mesh_volume(vertices,
+                        triangles):
+    """Computes the signed volume enclosed by a closed mesh, positive if its triangles face out.
+
+    :param vertices:
+        An (N x 3) array of the vertices of the mesh.
+    :param triangles:
+        An (M x 3) array of the triangles of the mesh.
+    :return:
+        The signed volume.
+    """
+
+    a, b, c = vertices[triangles[:, 0]], vertices[triangles[:, 1]], vertices[triangles[:, 2]]
+    return numpy.einsum('ij,ij->i', a, numpy.cross(b, c)).sum() / 6.0
+
+
+####################################################################################################
+# @polygonize_capsules_in_blocks
+####################################################################################################
+def polygonize_capsules_in_blocks(starts,
+                                  ends,
+                                  radii,
+                                  voxel_size,
+                                  block_cells,
+                                  executor=None):
+    """Polygonizes a list of capsules in all the blocks of a grid that covers them, and welds the
+    blocks into a single mesh.
+
+    :param starts:
+        An (M x 3) array of the first ends of the capsules.
+    :param ends:
+        An (M x 3) array of the second ends of the capsules.
+    :param radii:
+        An array of the M radii of the capsules.
+    :param voxel_size:
+        The distance between the samples of the grid.
+    :param block_cells:
+        The number of cells of every block along every axis.
+    :param executor:
+        An optional executor to polygonize the blocks.
+    :return:
+        An (N x 3) array of the vertices and an (M x 3) array of the triangles of the mesh.
+    """
+
+    origin = numpy.minimum(starts, ends).min(axis=0) - radii.max() - 2 * voxel_size
+    extent = numpy.maximum(starts, ends).max(axis=0) + radii.max() + 2 * voxel_size - origin
+    number_blocks = numpy.ceil(extent / (block_cells * voxel_size)).astype(numpy.int64)
+    grid_samples = number_blocks * block_cells + 1
+
+    arguments = [(starts, ends, radii, radii, origin, voxel_size,
+                  numpy.array([i, j, k]) * block_cells, block_cells, grid_samples)
+                 for i in range(number_blocks[0]) for j in range(number_blocks[1])
+                 for k in range(number_blocks[2])]
+    if executor is None:
+        blocks = [sdf_ops.polygonize_capsules_in_block(*argument) for argument in arguments]
+    else:
+        blocks = list(executor.map(sdf_ops.polygonize_capsules_in_block, *zip(*arguments)))
+    return sdf_ops.weld_polygonized_blocks(blocks)
+
+
+####################################################################################################
+# @MeshSDFOpsTests
+####################################################################################################
+class MeshSDFOpsTests(unittest.TestCase):
+    """Headless tests of the signed distance field polygonization."""
+
+    ################################################################################################
+    # @assert_closed_mesh
+    ################################################################################################
+    def assert_closed_mesh(self,
+                           vertices,
+                           triangles):
+        """Asserts that a mesh is closed, consistently oriented and faces out.
+
+        :param vertices:
+            An (N x 3) array of the vertices of the mesh.
+        :param triangles:
+            An (M x 3) array of the triangles of the mesh.
+        """
+
+        self.assertGreater(len(triangles), 0)
+        directed_counts, undirected_counts = get_mesh_edges_counts(triangles)
+        self.assertTrue(numpy.all(undirected_counts == 2))
+        self.assertTrue(numpy.all(directed_counts == 1))
+        self.assertGreater(compute_mesh_volume(vertices, triangles), 0.0)
+
+    ################################################################################################
+    # @test_sphere
+    ################################################################################################
+    def test_sphere(self):
+        """A sphere sampled on a grid is closed and encloses the volume of the sphere."""
+
+        samples = 40
+        indices = numpy.arange(samples)
+        grid = numpy.stack(numpy.meshgrid(indices, indices, indices, indexing='ij'), axis=-1)
+        field = numpy.linalg.norm(grid * 0.1 - 2.0, axis=-1) - 1.3
+        keys, vertices, triangles = sdf_ops.polygonize_signed_distance_field(
+            field=field, origin=(0.0, 0.0, 0.0), voxel_size=0.1)
+
+        self.assertEqual(len(numpy.unique(keys)), len(vertices))
+        self.assert_closed_mesh(vertices, triangles)
+        self.assertAlmostEqual(compute_mesh_volume(vertices, triangles) /
+                               (4.0 / 3.0 * numpy.pi * 1.3 ** 3), 1.0, delta=0.02)
+
+    ################################################################################################
+    # @test_sphere_in_blocks
+    ################################################################################################
+    def test_sphere_in_blocks(self):
+        """A sphere polygonized in blocks and welded is identical to the single block one."""
+
+        samples = 40
+        indices = numpy.arange(samples)
+        grid = numpy.stack(numpy.meshgrid(indices, indices, indices, indexing='ij'), axis=-1)
+        field = numpy.linalg.norm(grid * 0.1 - 2.0, axis=-1) - 1.3
+        _, vertices, triangles = sdf_ops.polygonize_signed_distance_field(
+            field=field, origin=(0.0, 0.0, 0.0), voxel_size=0.1)
+
+        # Blocks of 20 cells, that share the samples of their faces
+        blocks = list()
+        for x in (0, 20):
+            for y in (0, 20):
+                for z in (0, 20):
+                    blocks.append(sdf_ops.polygonize_signed_distance_field(
+                        field=field[x:x + 21, y:y + 21, z:z + 21],
+                        origin=(0.0, 0.0, 0.0), voxel_size=0.1, offset=(x, y, z),
+                        grid_samples=field.shape))
+        welded_vertices, welded_triangles = sdf_ops.weld_polygonized_blocks(blocks)
+
+        self.assertEqual(len(welded_vertices), len(vertices))
+        self.assertEqual(len(welded_triangles), len(triangles))
+        self.assert_closed_mesh(welded_vertices, welded_triangles)
+
+    ################################################################################################
+    # @test_capsules_in_blocks
+    ################################################################################################
+    def test_capsules_in_blocks(self):
+        """A branching set of capsules across several blocks is welded into a closed mesh."""
+
+        starts = numpy.array([[0.0, 0.0, 0.0], [4.0, 0.0, 0.0], [4.0, 0.0, 0.0]])
+        ends = numpy.array([[4.0, 0.0, 0.0], [7.0, 3.0, 0.0], [7.0, -2.0, 1.0]])
+        radii = numpy.array([1.0, 0.6, 0.5])
+        vertices, triangles = polygonize_capsules_in_blocks(
+            starts, ends, radii, voxel_size=0.1, block_cells=16)
+        self.assert_closed_mesh(vertices, triangles)
+
+    ################################################################################################
+    # @test_large_grid_keys
+    ################################################################################################
+    def test_large_grid_keys(self):
+        """The keys of the vertices are unique and do not overflow in a grid of 2000^3 samples."""
+
+        samples = 20
+        indices = numpy.arange(samples)
+        grid = numpy.stack(numpy.meshgrid(indices, indices, indices, indexing='ij'), axis=-1)
+        field = numpy.linalg.norm(grid * 0.1 - 1.0, axis=-1) - 0.6
+        keys, vertices, _ = sdf_ops.polygonize_signed_distance_field(
+            field=field, origin=(0.0, 0.0, 0.0), voxel_size=0.1, offset=(1980, 1980, 1980),
+            grid_samples=(2000, 2000, 2000))
+
+        self.assertEqual(len(numpy.unique(keys)), len(vertices))
+        self.assertTrue(numpy.all(keys >= 0))
+        self.assertLess(int(keys.max()), 7 * 2000 ** 3)
+
+    ################################################################################################
+    # @test_spawned_workers
+    ################################################################################################
+    def test_spawned_workers(self):
+        """The blocks are polygonized in spawned worker processes that do not import vmv."""
+
+        # The module is importable without the vmv package
+        process = subprocess.run(
+            [sys.executable, '-c', 'import sys; sys.path.append(sys.argv[1]); '
+                                   'import mesh_sdf_ops; assert "vmv" not in sys.modules',
+             SDF_OPS_DIRECTORY], capture_output=True)
+        self.assertEqual(process.returncode, 0, process.stderr.decode())
+
+        starts = numpy.array([[0.0, 0.0, 0.0]])
+        ends = numpy.array([[3.0, 1.0, 0.0]])
+        radii = numpy.array([0.8])
+        vertices, triangles = polygonize_capsules_in_blocks(
+            starts, ends, radii, voxel_size=0.1, block_cells=16)
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=2, mp_context=multiprocessing.get_context('spawn')) as executor:
+            spawned_vertices, spawned_triangles = polygonize_capsules_in_blocks(
+                starts, ends, radii, voxel_size=0.1, block_cells=16, executor=executor)
+
+        self.assertTrue(numpy.allclose(spawned_vertices, vertices))
+        self.assertTrue(numpy.array_equal(spawned_triangles, triangles))
+        self.assert_closed_mesh(spawned_vertices, spawned_triangles)
+
+
+####################################################################################################
+# @ Run the tests
+####################################################################################################
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,212 @@
+####################################################################################################
+# Copyright (c) 2023, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# Usage, without Blender:
+#   python -m pytest tests
+#   python -m unittest discover -s tests
+
+# System imports
+import importlib
+import os
+import sys
+import types
+import unittest
+from unittest import mock
+
+PACKAGE_DIRECTORY = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+MORPHOLOGIES_DIRECTORY = os.path.join(PACKAGE_DIRECTORY, 'data', 'morphologies')
+
+
+####################################################################################################
+# @StubModule
+####################################################################################################
+class StubModule(types.ModuleType):
+    """A module that creates a mock for every attribute that is accessed, to stand in for the
+    Blender modules when the tests run without Blender."""
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        attribute = mock.MagicMock(name='%s.%s' % (self.__name__, name))
+        setattr(self, name, attribute)
+        return attribute
+
+
+####################################################################################################
+# @Vector
+####################################################################################################
+class Vector(list):
+    """A minimal stand-in for mathutils.Vector, enough to load the morphologies."""
+
+    def __init__(self, values=(0.0, 0.0, 0.0)):
+        list.__init__(self, (float(value) for value in values))
+
+    def __add__(self, other):
+        return Vector(a + b for a, b in zip(self, other))
+
+    def __sub__(self, other):
+        return Vector(a - b for a, b in zip(self, other))
+
+    def __mul__(self, scalar):
+        return Vector(a * scalar for a in self)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, scalar):
+        return Vector(a / scalar for a in self)
+
+    def copy(self):
+        return Vector(self)
+
+
+####################################################################################################
+# @install_blender_stubs
+####################################################################################################
+def install_blender_stubs():
+    """Installs stubs of the Blender modules, only if Blender is not available, so that the vmv
+    package can be imported."""
+
+    try:
+        importlib.import_module('bpy')
+        return
+    except ImportError:
+        pass
+
+    for name in ['bpy', 'bpy.app', 'bpy.app.handlers', 'bpy.props', 'bpy.utils',
+                 'bpy.utils.previews', 'bpy_extras', 'bpy_extras.io_utils', 'bmesh', 'bmesh.ops',
+                 'mathutils', 'mathutils.bvhtree', 'mathutils.geometry', 'mathutils.kdtree', 'gpu',
+                 'blf']:
+        sys.modules[name] = StubModule(name)
+
+    # The add-on classes derive from the Blender types
+    base = type('Base', (object, ), dict())
+    sys.modules['bpy'].types = types.SimpleNamespace(
+        Panel=base, Operator=base, PropertyGroup=base, Scene=base, Object=base, Menu=base,
+        UIList=base, AddonPreferences=base)
+    sys.modules['bpy'].context = types.SimpleNamespace(scene=types.SimpleNamespace())
+    sys.modules['mathutils'].Vector = Vector
+
+
+install_blender_stubs()
+if PACKAGE_DIRECTORY not in sys.path:
+    sys.path.append(PACKAGE_DIRECTORY)
+import vmv.file
+import vmv.skeleton
+
+
+####################################################################################################
+# @build_sections_from_paths_all_pairs
+####################################################################################################
+def build_sections_from_paths_all_pairs(loader):
+    """Builds the sections of an SWC loader from its paths, as the loader did before, by looking up
+    every terminal sample in every path.
+
+    :param loader:
+        An SWCLoader with its connected paths.
+    """
+
+    for path in loader.paths:
+
+        # The sorted terminal samples along the path
+        samples_located_along_path = sorted(
+            sample_index for sample_index in loader.sections_terminal_samples_indices
+            if sample_index in path)
+
+        # Every section spans the path between two consecutive terminals
+        for i in range(0, len(samples_located_along_path) - 1):
+            first_sample_index = path.index(samples_located_along_path[i])
+            last_sample_index = path.index(samples_located_along_path[i + 1])
+            loader.sections_samples_indices_list.append(
+                [path[j] for j in range(first_sample_index, last_sample_index + 1)])
+
+
+####################################################################################################
+# @update_sections_parenting_all_pairs
+####################################################################################################
+def update_sections_parenting_all_pairs(sections_list):
+    """Updates the parenting of the sections, as the loader did before, by comparing every pair of
+    sections.
+
+    :param sections_list:
+        A list of all the sections of an arbor.
+    """
+
+    for section in sections_list:
+        vmv.skeleton.ops.update_section_parenting(section, sections_list)
+
+
+####################################################################################################
+# @load_sections_summary
+####################################################################################################
+def load_sections_summary(swc_file,
+                          all_pairs=False):
+    """Loads the sections of an SWC file, and summarizes every section by its type and index, the
+    indices of its samples, the index of its parent and the indices of its children.
+
+    :param swc_file:
+        The path to the SWC file.
+    :param all_pairs:
+        Use the previous all-pairs section building and parenting.
+    :return:
+        A list of the summaries of the sections.
+    """
+
+    loader = vmv.file.readers.SWCLoader(morphology_file=swc_file)
+    if all_pairs:
+        loader.build_sections_from_paths = lambda: build_sections_from_paths_all_pairs(loader)
+        with mock.patch.object(vmv.skeleton.ops, 'update_sections_parenting',
+                               update_sections_parenting_all_pairs):
+            morphology = loader.construct_morphology_object()
+    else:
+        morphology = loader.construct_morphology_object()
+
+    return [(section.type, section.index, [sample.index for sample in section.samples],
+             section.parent_index, [child.index for child in section.children])
+            for section in morphology.sections_list]
+
+
+####################################################################################################
+# @SWCLoaderTests
+####################################################################################################
+class SWCLoaderTests(unittest.TestCase):
+    """Regression tests of the SWC loader on the bundled morphologies."""
+
+    ################################################################################################
+    # @test_sections_match_all_pairs
+    ################################################################################################
+    def test_sections_match_all_pairs(self):
+        """The sections of every bundled SWC file, with their samples, parents and children, are
+        the same as those of the previous all-pairs implementation."""
+
+        swc_files = sorted(
+            os.path.join(root, file_name)
+            for root, _, file_names in os.walk(MORPHOLOGIES_DIRECTORY)
+            for file_name in file_names if file_name.lower().endswith('.swc'))
+        self.assertGreater(len(swc_files), 0)
+
+        for swc_file in swc_files:
+            with self.subTest(swc_file=os.path.relpath(swc_file, MORPHOLOGIES_DIRECTORY)):
+                sections = load_sections_summary(swc_file)
+                self.assertGreater(len(sections), 0)
+                self.assertEqual(sections, load_sections_summary(swc_file, all_pairs=True))
+
+
+####################################################################################################
+# @ Run the tests
+####################################################################################################
+if __name__ == '__main__':
+    unittest.main()
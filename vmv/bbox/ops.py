@@ -17,6 +17,7 @@
 
 # System imports
 import math
+import numpy
 
 # Blender imports
 import bpy
@@ -312,6 +313,103 @@ def compute_bounding_box_for_list_of_points(points):
     return bounding_box
 
 
+####################################################################################################
+# @compute_bounding_box_for_array_of_points
+####################################################################################################
+def compute_bounding_box_for_array_of_points(points):
+    """Computes the bounding box of an array of points using vectorized operations.
+
+    :param points:
+        A numpy array of the shape (N, 3) containing the Cartesian coordinates of the points.
+    :return:
+        The bounding box of the given array of points
+    """
+
+    # An empty array, use the default infinite bounding box
+    if len(points) == 0:
+        return compute_bounding_box_for_list_of_points(list())
+
+    # Get the minimum and maximum points along every axis
+    p_min = points.min(axis=0)
+    p_max = points.max(axis=0)
+
+    # Build bounding box object
+    bounding_box = vmv.bbox.BoundingBox(p_min=Vector((p_min[0], p_min[1], p_min[2])),
+                                        p_max=Vector((p_max[0], p_max[1], p_max[2])))
+
+    # Return a reference to the computed bounding box
+    return bounding_box
+
+
+####################################################################################################
+# @split_bounding_boxes_into_bricks
+####################################################################################################
+def split_bounding_boxes_into_bricks(minimum_corners,
+                                     maximum_corners,
+                                     brick_size,
+                                     margin):
+    """Splits the bounding box of a list of bounding boxes into a grid of cubic bricks, and finds
+    the bounding boxes that intersect every brick, where the bricks are extended by a margin on
+    every side to overlap.
+
+    :param minimum_corners:
+        An (N x 3) array of the minimum corners of the bounding boxes.
+    :param maximum_corners:
+        An (N x 3) array of the maximum corners of the bounding boxes.
+    :param brick_size:
+        The size of every brick.
+    :param margin:
+        The overlap of the bricks, added to every side of the brick.
+    :return:
+        A list of the non-empty bricks, where every brick is given by a tuple of its minimum and
+        maximum corners, not extended by the margin, and an array of the indices of the bounding
+        boxes that intersect it.
+    """
+
+    if len(minimum_corners) == 0:
+        return list()
+
+    # The grid of the bricks around all the bounding boxes
+    origin = minimum_corners.min(axis=0) - margin
+    dimensions = numpy.maximum(numpy.ceil(
+        (maximum_corners.max(axis=0) + margin - origin) / brick_size), 1).astype(numpy.int64)
+
+    # The range of bricks that intersect every bounding box
+    first = numpy.floor((minimum_corners - margin - origin) / brick_size)
+    last = numpy.floor((maximum_corners + margin - origin) / brick_size)
+    first = numpy.clip(first, 0, dimensions - 1).astype(numpy.int64)
+    last = numpy.clip(last, 0, dimensions - 1).astype(numpy.int64)
+    extents = last - first + 1
+
+    # A pair of (bounding box, brick) for every brick of every bounding box
+    counts = numpy.prod(extents, axis=1)
+    offsets = numpy.zeros(len(counts) + 1, dtype=numpy.int64)
+    numpy.cumsum(counts, out=offsets[1:])
+    boxes = numpy.repeat(numpy.arange(len(counts)), counts)
+    local = numpy.arange(offsets[-1]) - offsets[:-1][boxes]
+    extents = extents[boxes]
+    i = first[boxes, 0] + local % extents[:, 0]
+    j = first[boxes, 1] + (local // extents[:, 0]) % extents[:, 1]
+    k = first[boxes, 2] + local // (extents[:, 0] * extents[:, 1])
+    bricks = (i * dimensions[1] + j) * dimensions[2] + k
+
+    # Group the bounding boxes by brick
+    order = numpy.argsort(bricks, kind='stable')
+    bricks, boxes = bricks[order], boxes[order]
+    unique_bricks, starts = numpy.unique(bricks, return_index=True)
+    ends = numpy.append(starts[1:], len(bricks))
+
+    # The corners and the bounding boxes of every brick
+    output = list()
+    for brick, start, end in zip(unique_bricks.tolist(), starts.tolist(), ends.tolist()):
+        index = numpy.array([brick // (dimensions[1] * dimensions[2]),
+                             (brick // dimensions[2]) % dimensions[1],
+                             brick % dimensions[2]])
+        minimum = origin + index * brick_size
+        output.append((minimum, minimum + brick_size, boxes[start:end]))
+    return output
+
+
 ####################################################################################################
 # @compute_unified_extent_bounding_box
 ####################################################################################################
@@ -224,16 +224,19 @@ def create_icosphere_template(subdivisions=1,
     icosphere_bmesh.verts.ensure_lookup_table()
     icosphere_bmesh.faces.ensure_lookup_table()
 
-    # Fill-up the vertices list
+    # Fill-up the vertices list, with copies that remain valid after the bmesh is released
     vertices = list()
     for v in icosphere_bmesh.verts:
-        vertices.append(v.co)
+        vertices.append(v.co.copy())
 
     # Fill-up the faces list
     faces = list()
     for f in icosphere_bmesh.faces:
         faces.append([f.verts[0].index, f.verts[1].index, f.verts[2].index])
 
+    # Release the bmesh
+    icosphere_bmesh.free()
+
     # Return the vertices and faces list
     return [vertices, faces]
 
@@ -32,6 +32,22 @@ def triangulate_faces(bmesh_object):
     bmesh.ops.triangulate(bmesh_object, faces=bmesh_object.faces[:])
 
 
+####################################################################################################
+# @delete_faces
+####################################################################################################
+def delete_faces(bmesh_object,
+                 faces):
+    """
+    Deletes some faces from a bmesh object, with their vertices and edges that are not used by
+    any other face.
+
+    :param bmesh_object: A given bmesh object.
+    :param faces: A list of the faces to delete.
+    """
+
+    bmesh.ops.delete(bmesh_object, geom=faces, context='FACES')
+
+
 ####################################################################################################
 # @get_face_from_index
 ####################################################################################################
@@ -17,5 +17,6 @@
 
 from .meta_builder import *
 from .polyline_builder import *
+from .signed_distance_builder import *
 from .skinning_builder import *
 from .voxelization_builder import *
@@ -17,9 +17,12 @@
 
 # System imports
 import time
+import numpy
 
 # Internal modules
+import vmv.bbox
 import vmv.bops
+import vmv.consts
 import vmv.enums
 import vmv.mesh
 import vmv.skeleton
@@ -65,192 +68,307 @@ class MetaBuilder(MeshBuilder):
         self.smallest_radius = 1e10
 
     ################################################################################################
-    # @create_meta_segment
+    # @get_meta_radii
     ################################################################################################
-    def create_meta_segment(self,
-                            p1,
-                            p2,
-                            r1,
-                            r2):
-        """Constructs a segment that is composed of two points with a meta object.
-
-        :param p1:
-            First point coordinate.
-        :param p2:
-            Second point coordinate.
-        :param r1:
-            First point radius.
-        :param r2:
-            Second point radius.
-        """
-
-        # Segment vector
-        segment = p2 - p1
-        segment_length = segment.length
-
-        # Make sure that the segment length is not zero
-        # TODO: Verify this when the radii are greater than the distance
-        if segment_length < 0.001:
-            return
+    def get_meta_radii(self,
+                       radii):
+        """Gets the radii of the meta elements of the samples according to the radii options.
 
-        # Verify the radii, or fix them
-        if r1 < 0.001 * segment_length:
-            r1 = 0.001 * segment_length
-        if r2 < 0.001 * segment_length:
-            r2 = 0.001 * segment_length
+        :param radii:
+            An array of the radii of the samples.
+        :return:
+            An array of the radii of the meta elements of the samples.
+        """
 
-        if r1 < self.smallest_radius:
-            self.smallest_radius = r1
-        if r2 < self.smallest_radius:
-            self.smallest_radius = r2
+        # Fixed radii
+        if self.options.morphology.radii == vmv.enums.Morphology.Radii.FIXED:
+            radii = numpy.full(len(radii), self.options.morphology.sections_fixed_radii_value)
 
-        # Compute the deltas between the first and last points along the segments
-        dr = r2 - r1
-        dx = p2[0] - p1[0]
-        dy = p2[1] - p1[1]
-        dz = p2[2] - p1[2]
+        # Scaled radii
+        elif self.options.morphology.radii == vmv.enums.Morphology.Radii.SCALED:
+            radii = radii * self.options.morphology.sections_radii_scale
 
-        # Keep track on the distance traveled along the segment while building, initially 0
-        travelled_distance = 0.0
+        # Minimum threshold
+        elif self.options.morphology.radii == vmv.enums.Morphology.Radii.MINIMUM:
+            radii = numpy.maximum(radii, self.options.morphology.sections_radii_minimum)
 
-        # Local points, initially at the first point
-        r = r1
-        x = p1[0]
-        y = p1[1]
-        z = p1[2]
+        # Default radii as specified in the morphology file
+        return radii * self.magic_scale_factor
 
-        # Construct the meta elements along the segment
-        i = 0
-        while travelled_distance < segment_length:
+    ################################################################################################
+    # @compute_meta_distances
+    ################################################################################################
+    @staticmethod
+    def compute_meta_distances(r1,
+                               ratios,
+                               logs,
+                               segments,
+                               k):
+        """Computes the arc-lengths d(k) = 0.5 r1 (a^k - 1) / (a - 1) of the k-th meta elements
+        along some segments.
 
-            # Make a meta ball (or sphere) at this point
-            meta_element = self.meta_skeleton.elements.new()
+        :param r1:
+            An array of the radii of the first samples of all the segments.
+        :param ratios:
+            An array of (a - 1) of all the segments.
+        :param logs:
+            An array of log(a) of all the segments.
+        :param segments:
+            An array of the indices of the segments.
+        :param k:
+            An array of the indices of the elements along the segments.
+        :return:
+            An array of the arc-lengths.
+        """
 
-            # Set its radius
-            if i == 0:
-                meta_element.radius = r * 0.90
-            else:
-                meta_element.radius = r
+        ratios = ratios[segments]
+        constant = ratios == 0.0
+        geometric = numpy.expm1(k * logs[segments]) / numpy.where(constant, 1.0, ratios)
+        return 0.5 * r1[segments] * numpy.where(constant, k, geometric)
 
-            # Update its coordinates
-            meta_element.co = (x, y, z)
+    ################################################################################################
+    # @compute_meta_elements
+    ################################################################################################
+    def compute_meta_elements(self):
+        """Computes the centers and radii of all the meta elements of the morphology at once.
 
-            # Proceed to the next point
-            travelled_distance += 0.5 * r
+        Along every segment, the elements are placed at the arc-lengths d(k + 1) = d(k) + 0.5 r(k),
+        where the radius r(k) is interpolated linearly between the radii of the segment samples.
+        This recurrence is geometric, so the number of the elements of every segment and their
+        arc-lengths are computed in closed form for all the segments without marching.
 
-            r = r1 + (travelled_distance * dr / segment_length)
+        :return:
+            An (N x 3) array of the centers and an array of the N radii of the elements.
+        """
 
-            # Get the next point
-            x = p1[0] + (travelled_distance * dx / segment_length)
-            y = p1[1] + (travelled_distance * dy / segment_length)
-            z = p1[2] + (travelled_distance * dz / segment_length)
+        # Use the arrays of the morphology, if any, otherwise construct them from the sections
+        arrays = self.morphology.arrays
+        if arrays is None:
+            arrays = vmv.skeleton.construct_morphology_arrays_from_sections(
+                self.morphology.sections_list)
+
+        # The samples of the segments
+        first_samples = vmv.skeleton.get_segments_first_samples(arrays)
+        radii = self.get_meta_radii(arrays.radii.astype(numpy.float64))
+        p1 = arrays.points[first_samples].astype(numpy.float64)
+        p2 = arrays.points[first_samples + 1].astype(numpy.float64)
+        r1 = radii[first_samples]
+        r2 = radii[first_samples + 1]
+
+        # Make sure that the segment lengths are not zero
+        lengths = numpy.linalg.norm(p2 - p1, axis=1)
+        valid = lengths >= 0.001
+        p1, p2, r1, r2, lengths = p1[valid], p2[valid], r1[valid], r2[valid], lengths[valid]
 
-            i += 1
+        # Verify the radii, or fix them
+        r1 = numpy.maximum(r1, 0.001 * lengths)
+        r2 = numpy.maximum(r2, 0.001 * lengths)
+        if len(lengths) > 0:
+            self.smallest_radius = min(self.smallest_radius, float(r1.min()), float(r2.min()))
+
+        # The segments that are shorter than the first step have only a single element
+        single = 0.5 * r1 >= lengths
+
+        # d(k) = 0.5 r1 (a^k - 1) / (a - 1), where a - 1 = 0.5 (r2 - r1) / length, and a > 0 for
+        # all the segments that have more than one element
+        ratios = numpy.where(single, 0.0, 0.5 * (r2 - r1) / lengths)
+        logs = numpy.log1p(ratios)
+
+        # The number of elements of every segment, the first k with d(k) >= length
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            counts = numpy.where(ratios == 0.0, lengths / (0.5 * r1), numpy.log1p(
+                numpy.where(single, 0.0, (r2 - r1) / r1)) / logs)
+        counts = numpy.where(single, 1, numpy.ceil(counts)).astype(numpy.int64)
+        counts = numpy.maximum(counts, 1)
+
+        # Correct the rounding errors of the closed form
+        segments = numpy.arange(len(lengths))
+        counts += self.compute_meta_distances(r1, ratios, logs, segments, counts) < lengths
+        counts -= (counts > 1) & (self.compute_meta_distances(
+            r1, ratios, logs, segments, counts - 1) >= lengths)
+
+        # The arc-lengths and radii of the elements
+        segments = numpy.repeat(segments, counts)
+        offsets = numpy.zeros(len(counts) + 1, dtype=numpy.int64)
+        numpy.cumsum(counts, out=offsets[1:])
+        k = numpy.arange(offsets[-1]) - offsets[:-1][segments]
+        t = self.compute_meta_distances(r1, ratios, logs, segments, k) / lengths[segments]
+        centers = p1[segments] + t[:, None] * (p2 - p1)[segments]
+        elements_radii = r1[segments] + t * (r2 - r1)[segments]
+
+        # The first element of every segment is slightly smaller
+        elements_radii[offsets[:-1]] *= 0.90
+
+        # Return the centers and radii
+        return centers, elements_radii
 
     ################################################################################################
-    # @create_meta_section
+    # @get_meta_resolution
     ################################################################################################
-    def create_meta_section(self,
-                            section):
-        """Create a section with meta objects.
+    def get_meta_resolution(self):
+        """Gets the resolution of the meta object, either automatic or as set by the user.
 
-        :param section:
-            A given section to extrude a mesh around it.
+        :return:
+            The resolution of the meta object.
         """
 
-        # Get the list of samples
-        samples = section.samples
-
-        # Ensure that the section has at least two samples, otherwise it will give an error
-        if len(samples) < 2:
-            return
-
-        # Fixed radii
-        if self.options.morphology.radii == vmv.enums.Morphology.Radii.FIXED:
-
-            # Proceed segment by segment
-            for i in range(len(samples) - 1):
-
-                # Create the meta segment
-                self.create_meta_segment(
-                    p1=samples[i].point,
-                    p2=samples[i + 1].point,
-                    r1=self.options.morphology.sections_fixed_radii_value * self.magic_scale_factor,
-                    r2=self.options.morphology.sections_fixed_radii_value * self.magic_scale_factor)
+        if self.options.mesh.meta_auto_resolution:
+            return self.smallest_radius * 0.9
+        return self.options.mesh.meta_resolution
 
-        # Scaled radii
-        elif self.options.morphology.radii == vmv.enums.Morphology.Radii.SCALED:
+    ################################################################################################
+    # @estimate_polygonization_cells
+    ################################################################################################
+    @staticmethod
+    def estimate_polygonization_cells(radii,
+                                      resolution):
+        """Estimates the number of cells that the polygonization of the meta object visits.
+
+        The polygonizer follows the surface, so its cost is proportional to the area of the surface
+        divided by the area of a cell. Every element covers a band of about 2 pi r x 0.5 r of the
+        surface of its segment.
+
+        :param radii:
+            An array of the radii of the meta elements.
+        :param resolution:
+            The resolution of the meta object.
+        :return:
+            The estimated number of cells.
+        """
 
-            # Get the scale value
-            scale = self.options.morphology.sections_radii_scale
+        return int(numpy.pi * numpy.dot(radii, radii) / (resolution * resolution))
 
-            # Proceed segment by segment
-            for i in range(len(samples) - 1):
-                # Create the meta segment
-                self.create_meta_segment(
-                    p1=samples[i].point,
-                    p2=samples[i + 1].point,
-                    r1=samples[i].radius * self.magic_scale_factor * scale,
-                    r2=samples[i + 1].radius * self.magic_scale_factor * scale)
+    ################################################################################################
+    # @add_meta_elements
+    ################################################################################################
+    @staticmethod
+    def add_meta_elements(meta_skeleton,
+                          centers,
+                          radii):
+        """Adds a list of meta elements to a meta skeleton, and then sets their coordinates and
+        radii in bulk.
+
+        :param meta_skeleton:
+            A given meta skeleton (meta-balls data).
+        :param centers:
+            An (N x 3) array of the centers of the elements.
+        :param radii:
+            An array of the N radii of the elements.
+        """
 
-        # Minimum threshold
-        elif self.options.morphology.radii == vmv.enums.Morphology.Radii.MINIMUM:
+        elements = meta_skeleton.elements
+        for _ in range(len(radii)):
+            elements.new()
+        elements.foreach_set('co', numpy.asarray(centers, dtype=numpy.float32).ravel())
+        elements.foreach_set('radius', numpy.asarray(radii, dtype=numpy.float32))
 
-            # Get the scale value
-            value = self.options.morphology.sections_radii_minimum
+    ################################################################################################
+    # @build_meta_brick
+    ################################################################################################
+    def build_meta_brick(self,
+                         name,
+                         centers,
+                         radii,
+                         resolution):
+        """Builds a meta object of some elements and converts it to a mesh.
+
+        :param name:
+            The name of the meta object.
+        :param centers:
+            An (N x 3) array of the centers of the elements.
+        :param radii:
+            An array of the N radii of the elements.
+        :param resolution:
+            The resolution of the meta object.
+        :return:
+            A reference to the mesh object.
+        """
 
-            # Proceed segment by segment
-            for i in range(len(samples) - 1):
+        # Create the meta object
+        meta_skeleton = vmv.bops.create_new_metaballs(name=name)
+        meta_skeleton.resolution = resolution
+        meta_object = vmv.bops.create_new_metaballs_object_from_data(
+            name=name, metaballs_data=meta_skeleton)
+        vmv.scene.link_object_to_scene(input_object=meta_object)
 
-                if samples[i].radius < value:
-                    r1 = value
-                else:
-                    r1 = samples[i].radius
+        # Add the elements
+        self.add_meta_elements(meta_skeleton, centers, radii)
 
-                if samples[i + 1].radius < value:
-                    r2 = value
-                else:
-                    r2 = samples[i + 1].radius
+        # Convert it to a mesh from meta-balls
+        vmv.scene.ops.deselect_all()
+        vmv.scene.select_object(scene_object=meta_object)
+        vmv.set_active_object(scene_object=meta_object)
+        vmv.bops.convert_to_mesh()
 
-                # Create the meta segment
-                self.create_meta_segment(
-                    p1=samples[i].point,
-                    p2=samples[i + 1].point,
-                    r1=r1 * self.magic_scale_factor,
-                    r2=r2 * self.magic_scale_factor)
+        # Release the meta object, if still there, to free its memory before the next brick
+        meta_object = vmv.scene.get_object_by_name(object_name=name)
+        if meta_object is not None:
+            vmv.scene.delete_object_in_scene(scene_object=meta_object)
 
-        # Default radii as specified in the morphology file
-        else:
+        # Return a reference to the mesh
+        return vmv.scene.get_object_by_name(name + '.001')
 
-            # Proceed segment by segment
-            for i in range(len(samples) - 1):
+    ################################################################################################
+    # @build_meta_bricks
+    ################################################################################################
+    def build_meta_bricks(self):
+        """Builds the mesh of the sections in bricks, where every brick is polygonized as an
+        independent meta object that has only the elements that intersect the brick.
+
+        The bricks overlap by two cells, so that the surface within every brick is the same as
+        the surface of the complete meta object. The mesh of every brick is clipped to the brick
+        and the meshes are joined, with the duplicate vertices along the seams merged. Only a
+        single brick is polygonized at any time.
+        """
 
-                # Create the meta segment
-                self.create_meta_segment(
-                    p1=samples[i].point,
-                    p2=samples[i + 1].point,
-                    r1=samples[i].radius * self.magic_scale_factor,
-                    r2=samples[i + 1].radius * self.magic_scale_factor)
+        # Compute all the elements before adding any of them
+        centers, radii = self.compute_meta_elements()
+        resolution = self.get_meta_resolution()
+        self.options.mesh.meta_resolution = resolution
+        bricks = vmv.bbox.split_bounding_boxes_into_bricks(
+            centers - radii[:, None], centers + radii[:, None], self.options.mesh.meta_brick_size,
+            2.0 * resolution)
+        vmv.logger.info('Meta elements: [%d], Estimated polygonization cells: [%d]' % (
+            len(radii), self.estimate_polygonization_cells(radii, resolution)))
+        vmv.logger.info('MetaBall resolution: [%f], Bricks: [%d]' % (resolution, len(bricks)))
+
+        # NOTE: The names of the bricks have no dots, otherwise Blender would consider all the
+        # bricks a single family of meta objects and polygonize them together
+        prefix = self.morphology.name.replace('.', '_')
+
+        # Polygonize the bricks one by one
+        meshes = list()
+        for i, (minimum, maximum, elements) in enumerate(bricks):
+            vmv.utilities.show_progress('\t\t* Bricks', i, len(bricks))
+            mesh_object = self.build_meta_brick(
+                name='%s_brick_%d' % (prefix, i), centers=centers[elements],
+                radii=radii[elements], resolution=resolution)
+            if mesh_object is None:
+                continue
+            vmv.mesh.clip_mesh_object_to_box(mesh_object, minimum, maximum)
+            meshes.append(mesh_object)
+        vmv.utilities.show_progress('\t\t* Bricks', len(bricks), len(bricks), True)
+
+        # Join the bricks and merge the vertices along the seams
+        self.mesh = vmv.mesh.join_mesh_objects(mesh_list=meshes, name=self.morphology.name)
+        if self.mesh is not None and len(meshes) > 1:
+            vmv.mesh.remove_doubles(mesh_object=self.mesh, distance=min(
+                vmv.consts.Meshing.DOUBLES_THRESHOLD, 0.01 * resolution))
 
     ################################################################################################
-    # @initialize_meta_object
+    # @build_meta_object
     ################################################################################################
     def build_meta_object(self):
         """Builds the meta object of the sections.
         """
 
-        # For every section, in the morphology, create a meta-section
-        for i, section in enumerate(self.morphology.sections_list):
+        # Compute all the elements before adding any of them
+        centers, radii = self.compute_meta_elements()
+        vmv.logger.info('Meta elements: [%d], Estimated polygonization cells: [%d]' % (
+            len(radii), self.estimate_polygonization_cells(radii, self.get_meta_resolution())))
 
-            # Current iteration
-            vmv.utilities.show_progress('\t\t* Progress', i, len(self.morphology.sections_list))
-
-            # Create the section
-            self.create_meta_section(section)
-
-        # Process done
-        vmv.utilities.show_progress('\t\t* Progress', len(self.morphology.sections_list),
-                                    len(self.morphology.sections_list), True)
+        # Add the elements
+        self.add_meta_elements(self.meta_skeleton, centers, radii)
 
     ################################################################################################
     # @initialize_meta_object
@@ -289,10 +407,7 @@ class MetaBuilder(MeshBuilder):
         # Header
         # vmv.logger.header('Meshing the Meta Object')
 
-        if self.options.mesh.meta_auto_resolution:
-            self.meta_skeleton.resolution = self.smallest_radius * 0.9
-        else:
-            self.meta_skeleton.resolution = self.options.mesh.meta_resolution
+        self.meta_skeleton.resolution = self.get_meta_resolution()
 
         # Update the interface
         vmv.logger.info('MetaBall resolution: [%f]' % self.meta_skeleton.resolution)
@@ -327,18 +442,25 @@ class MetaBuilder(MeshBuilder):
         # Clear the scene
         vmv.scene.clear_scene()
 
-        # Initialize the meta object
+        # Build the mesh in bricks, if requested, to bound the memory of the polygonization
         start = time.time()
-        vmv.logger.info('Initialization')
-        self.initialize_meta_object()
+        if self.options.mesh.meta_brick_size > 0:
+            vmv.logger.info('Building Meta Object in Bricks')
+            self.build_meta_bricks()
+
+        else:
+
+            # Initialize the meta object
+            vmv.logger.info('Initialization')
+            self.initialize_meta_object()
 
-        # Build the meta object
-        vmv.logger.info('Building Meta Object')
-        self.build_meta_object()
+            # Build the meta object
+            vmv.logger.info('Building Meta Object')
+            self.build_meta_object()
 
-        # Finalize the meta object and create the actual mesh
-        vmv.logger.info('Reconstructing Mesh')
-        self.finalize_meta_object()
+            # Finalize the meta object and create the actual mesh
+            vmv.logger.info('Reconstructing Mesh')
+            self.finalize_meta_object()
         end = time.time()
 
         # Time
@@ -0,0 +1,245 @@
+####################################################################################################
+# Copyright (c) 2019 - 2023, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import concurrent.futures
+import multiprocessing
+import time
+import numpy
+
+# Internal modules
+import vmv.bbox
+import vmv.consts
+import vmv.mesh
+import vmv.scene
+import vmv.skeleton
+import vmv.utilities
+from .base import MeshBuilder
+
+
+####################################################################################################
+# @SignedDistanceBuilder
+####################################################################################################
+class SignedDistanceBuilder(MeshBuilder):
+    """Mesh builder that creates watertight meshes from the signed distance field of the union of
+    capsules along the segments of the morphology. The field is sampled on a sparse grid of blocks
+    and polygonized with numpy, and the resulting arrays are written to a single mesh."""
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 morphology,
+                 options):
+        """Constructor
+
+        :param morphology:
+            A given morphology skeleton to create the mesh for.
+        :param options:
+            Loaded options from VessMorphoVis.
+        """
+
+        # Base
+        MeshBuilder.__init__(self, morphology=morphology, options=options)
+
+        # Builder name
+        self.builder_name = 'SignedDistanceBuilder'
+
+    ################################################################################################
+    # @get_capsules
+    ################################################################################################
+    def get_capsules(self):
+        """Gets the capsules of all the segments of the morphology, and a sphere for every section
+        that has a single sample.
+
+        :return:
+            Two (N x 3) arrays of the ends of the capsules and two arrays of their radii.
+        """
+
+        # Use the arrays of the morphology, if any, otherwise construct them from the sections
+        arrays = self.morphology.arrays
+        if arrays is None:
+            arrays = vmv.skeleton.construct_morphology_arrays_from_sections(
+                self.morphology.sections_list)
+
+        # The segments, and the sections with a single sample as degenerate segments
+        counts = numpy.diff(arrays.section_offsets)
+        first_samples = vmv.skeleton.get_segments_first_samples(arrays)
+        single_samples = arrays.section_offsets[:-1][counts == 1]
+        starts = numpy.concatenate((first_samples, single_samples))
+        ends = numpy.concatenate((first_samples + 1, single_samples))
+
+        points = arrays.points.astype(numpy.float64)
+        radii = arrays.radii.astype(numpy.float64)
+        return points[starts], points[ends], radii[starts], radii[ends]
+
+    ################################################################################################
+    # @get_voxel_size
+    ################################################################################################
+    def get_voxel_size(self,
+                       radii):
+        """Gets the voxel size of the grid, either given in the options or half the smallest radius
+        of the morphology.
+
+        :param radii:
+            An array of the radii of the capsules.
+        :return:
+            The voxel size.
+        """
+
+        if self.options.mesh.sdf_voxel_size > 0:
+            return self.options.mesh.sdf_voxel_size
+
+        # Ignore the samples with zero radii
+        radii = radii[radii > 0]
+        if len(radii) == 0:
+            return vmv.consts.Meshing.SDF_VOXEL_SIZE
+        return 0.5 * radii.min()
+
+    ################################################################################################
+    # @polygonize_capsules
+    ################################################################################################
+    def polygonize_capsules(self,
+                            starts,
+                            ends,
+                            starts_radii,
+                            ends_radii,
+                            voxel_size):
+        """Polygonizes the signed distance field of a list of capsules on a sparse grid of blocks,
+        where only the blocks that intersect the bounding boxes of the capsules are sampled, and
+        every block only evaluates the capsules that are close to it.
+
+        The blocks are independent and are processed in a pool of worker processes if more than a
+        single worker is given in the options.
+
+        :param starts:
+            An (M x 3) array of the first ends of the capsules.
+        :param ends:
+            An (M x 3) array of the second ends of the capsules.
+        :param starts_radii:
+            An array of the M radii of the capsules at their first ends.
+        :param ends_radii:
+            An array of the M radii of the capsules at their second ends.
+        :param voxel_size:
+            The voxel size of the grid.
+        :return:
+            An (N x 3) array of the vertices and an (M x 3) array of the triangles of the mesh.
+        """
+
+        # The blocks that intersect the bounding boxes of the capsules
+        minimum_corners = numpy.minimum(starts - starts_radii[:, None], ends - ends_radii[:, None])
+        maximum_corners = numpy.maximum(starts + starts_radii[:, None], ends + ends_radii[:, None])
+        block_cells = vmv.consts.Meshing.SDF_BLOCK_CELLS
+        margin = vmv.consts.Meshing.SDF_BLOCK_MARGIN * voxel_size
+        blocks = vmv.bbox.split_bounding_boxes_into_bricks(
+            minimum_corners, maximum_corners, block_cells * voxel_size, margin)
+
+        # The grid of the blocks, where the first sample is at the minimum corner of the first block
+        origin = minimum_corners.min(axis=0) - margin
+        offsets = [numpy.rint((minimum - origin) / voxel_size).astype(numpy.int64)
+                   for minimum, _, _ in blocks]
+        grid_samples = numpy.max(offsets, axis=0) + block_cells + 1
+        vmv.logger.info('Grid: [%d x %d x %d] samples, [%d] blocks' % (
+            grid_samples[0], grid_samples[1], grid_samples[2], len(blocks)))
+
+        # The arguments of every block
+        arguments = [(starts[capsules], ends[capsules], starts_radii[capsules],
+                      ends_radii[capsules], origin, voxel_size, offset, block_cells, grid_samples)
+                     for (_, _, capsules), offset in zip(blocks, offsets)]
+
+        # The module of the polygonization only uses numpy, it is imported as a top-level module
+        # such that the worker processes do not import the vmv package, or Blender
+        sdf_ops = vmv.utilities.import_standalone_module(vmv.mesh.ops.mesh_sdf_ops.__file__)
+
+        # Polygonize the blocks, in parallel if requested
+        results = list()
+        if self.options.mesh.sdf_workers > 1:
+
+            # The forked workers do not import anything, the spawned ones only import the module
+            start_method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() \
+                else 'spawn'
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.options.mesh.sdf_workers,
+                    mp_context=multiprocessing.get_context(start_method)) as executor:
+                futures = [executor.submit(sdf_ops.polygonize_capsules_in_block, *argument)
+                           for argument in arguments]
+                for i, future in enumerate(futures):
+                    vmv.utilities.show_progress('\t\t* Blocks', i, len(futures))
+                    results.append(future.result())
+        else:
+            for i, argument in enumerate(arguments):
+                vmv.utilities.show_progress('\t\t* Blocks', i, len(arguments))
+                results.append(sdf_ops.polygonize_capsules_in_block(*argument))
+        vmv.utilities.show_progress('\t\t* Blocks', len(arguments), len(arguments), True)
+
+        # Weld the blocks into a single mesh
+        return sdf_ops.weld_polygonized_blocks(results)
+
+    ################################################################################################
+    # @build_mesh
+    ################################################################################################
+    def build_mesh(self):
+        """Reconstructs the vascular mesh.
+
+        :return:
+            A reference to the reconstructed vascular mesh.
+        """
+
+        vmv.logger.header('Building Mesh: %s' % self.builder_name)
+
+        # Clear the scene
+        vmv.scene.clear_scene()
+
+        # The capsules of the morphology
+        start = time.time()
+        starts, ends, starts_radii, ends_radii = self.get_capsules()
+        voxel_size = self.get_voxel_size(numpy.concatenate((starts_radii, ends_radii)))
+        vmv.logger.info('Capsules: [%d], Resolution [%f]' % (len(starts), voxel_size))
+
+        # Keep the thin capsules at least one voxel thick to avoid losing them in the grid
+        starts_radii = numpy.maximum(starts_radii, voxel_size)
+        ends_radii = numpy.maximum(ends_radii, voxel_size)
+
+        # Polygonize the signed distance field and write the arrays to a mesh
+        vmv.logger.info('Polygonizing Signed Distance Field')
+        vertices, triangles = self.polygonize_capsules(
+            starts, ends, starts_radii, ends_radii, voxel_size)
+        vmv.logger.info('Mesh: [%d] vertices, [%d] triangles' % (len(vertices), len(triangles)))
+        self.mesh = vmv.mesh.create_mesh_from_triangles(
+            vertices=vertices, triangles=triangles, name='Vascular Mesh')
+        end = time.time()
+
+        # Time
+        vmv.logger.info('Building Time [ %f ]' % (end - start))
+
+        # Create the materials
+        vmv.logger.info('Assigning Material')
+        self.create_skeleton_materials()
+
+        # Assign the material to the mesh
+        self.assign_material_to_mesh()
+
+        # Update its name with the mesh suffix to be able to locate it
+        self.set_default_mesh_name()
+
+        # Tessellate the mesh, if requested
+        self.tessellate_mesh()
+
+        # Mission done
+        vmv.logger.header('Done!')
+
+        return self.mesh
@@ -16,7 +16,6 @@
 ####################################################################################################
 
 # Internal modules
-import vmv.bmeshi
 import vmv.builders
 import vmv.enums
 import vmv.mesh
@@ -57,83 +56,49 @@ class SkinningBuilder(MeshBuilder):
         # Create the skeleton materials during the initialization
         self.create_skeleton_materials()
 
-        # A list containing the radii of the vertices in order
-        self.indexed_samples_list = list()
-
     ################################################################################################
-    # @skin_morphology_into_mesh
+    # @build_graph_arrays
     ################################################################################################
-    def skin_morphology_into_mesh(self):
-        """Generate a vascular mesh from the morphology using Skinning modifier."""
+    def build_graph_arrays(self):
+        """Builds the graph of the morphology with numpy, merges its duplicate vertices and updates
+        the radii of its branching vertices.
 
-        # Create the bmesh object
-        bmesh_object = vmv.bmeshi.create_bmesh_object()
+        The duplicate vertices are merged through an index map of the samples to the merged
+        vertices, so every merged vertex keeps the radius of its samples.
 
-        tqdm = vmv.utilities.import_module('tqdm')
-        if tqdm:
-            _loop = tqdm.tqdm(self.morphology.sections_list,
-                              desc='\t* Building Graph (Vertices)',
-                              bar_format=vmv.consts.String.BAR_FORMAT)
-        else:
-            _loop = self.morphology.sections_list
-
-        # Build the graph bmesh from the sections
-        vertex_index = 0
-        for i_section in _loop:
-
-            # The section must have at least two samples to be considered
-            if len(i_section.samples) < 2:
-                continue
-
-            # Add the corresponding vertex of the first sample of the section
-            vmv.bmeshi.add_vertex_to_bmesh_without_lookup(
-                bmesh_object, i_section.samples[0].point)
-            self.indexed_samples_list.append(i_section.samples[0].radius)
-            vertex_index += 1
-
-            # Add the vertices of the rest of samples
-            for j in range(1, len(i_section.samples)):
-                vmv.bmeshi.add_vertex_to_bmesh_without_lookup(
-                    bmesh_object, i_section.samples[j].point)
-                self.indexed_samples_list.append(i_section.samples[j].radius)
-                vertex_index += 1
-
-        # Update the geometry of the bmesh to be able to query it
-        bmesh_object.verts.ensure_lookup_table()
-
-        # Reconstruct the edges of the graph
-        vertex_index = 0
-        if tqdm:
-            _loop = tqdm.tqdm(self.morphology.sections_list,
-                              desc='\t* Building Graph (Edges)',
-                              bar_format=vmv.consts.String.BAR_FORMAT)
-        else:
-            _loop = self.morphology.sections_list
-        for i_section in _loop:
-            for j in range(0, len(i_section.samples) - 1):
-                v1 = bmesh_object.verts[j + vertex_index]
-                v2 = bmesh_object.verts[j + vertex_index + 1]
-                bmesh_object.edges.new((v1, v2))
-            vertex_index += len(i_section.samples)
-
-        # Convert the bmesh to a mesh
-        self.mesh = vmv.bmeshi.convert_bmesh_to_mesh(bmesh_object=bmesh_object, name='Graph')
-        vmv.scene.set_active_object(self.mesh)
+        :return:
+            An (N x 3) array of the positions of the vertices, an array of their N radii and an
+            (M x 2) array of the edges.
+        """
 
-        # Store the radii within the local bevel_weight parameter of the mesh before losing them
-        for i in range(len(self.mesh.data.vertices)):
-            self.mesh.data.vertices[i].bevel_weight = self.indexed_samples_list[i] * 0.001
+        # Use the arrays of the morphology, if any, otherwise construct them from the sections
+        arrays = self.morphology.arrays
+        if arrays is None:
+            arrays = vmv.skeleton.construct_morphology_arrays_from_sections(
+                self.morphology.sections_list)
 
-        # The graph mesh must be active
-        vmv.scene.set_active_object(self.mesh)
+        # Build the graph, merge the duplicate vertices and update the radii of the branchings
+        points, radii, edges = vmv.skeleton.build_morphology_graph_arrays(arrays)
+        points, radii, edges = vmv.skeleton.weld_graph_vertices(points, radii, edges, distance=0.01)
+        radii = vmv.skeleton.adjust_graph_branching_radii(radii, edges)
+        return points, radii, edges
 
-        # Remove the duplicate vertices from the graph
-        vmv.mesh.remove_doubles(mesh_object=self.mesh, distance=0.01)
+    ################################################################################################
+    # @skin_morphology_into_mesh
+    ################################################################################################
+    def skin_morphology_into_mesh(self):
+        """Generate a vascular mesh from the morphology using Skinning modifier."""
+
+        # Create the graph mesh, where the radii are stored in a float attribute of the vertices
+        points, radii, edges = self.build_graph_arrays()
+        self.mesh = vmv.mesh.create_graph_mesh(points=points, radii=radii, edges=edges,
+                                               name='Graph')
 
         # The graph mesh must be active
         vmv.scene.set_active_object(self.mesh)
 
-        # Separate the graph mesh into partitions
+        # Separate the graph mesh into partitions, the radius attribute is carried along, or the
+        # radii are looked up by the positions of the vertices before Blender 2.91
         vmv.bops.separate_mesh_partitions()
 
         # Get a list of all the graph partitions meshes
@@ -148,7 +113,7 @@ class SkinningBuilder(MeshBuilder):
                               desc='\t* Skinning Graph Partitions',
                               bar_format=vmv.consts.String.BAR_FORMAT)
         else:
-            _loop = self.morphology.sections_list
+            _loop = enumerate(graph_partitions)
 
         for i, graph_partition in _loop:
 
@@ -158,18 +123,12 @@ class SkinningBuilder(MeshBuilder):
             # Set this mesh partition to be active
             vmv.scene.set_active_object(graph_partition)
 
-            # Update the radii of the branching points
-            vmv.skeleton.adjust_branching_points_radii(mesh_object=graph_partition)
-
             # Add the Skinning modifier
-            # graph_partition.modifiers.new(name="Skin", type='SKIN')
             vmv.bops.create_skin_modifier(mesh_object=graph_partition)
 
-            # Update the radii of the resulting skinned mesh
-            for j in range(0, len(graph_partition.data.skin_vertices[0].data)):
-                vertex = graph_partition.data.skin_vertices[0].data[j]
-                radius = graph_partition.data.vertices[j].bevel_weight * 1000
-                vertex.radius = radius, radius
+            # Update the radii of the resulting skinned mesh from the radius attribute
+            vmv.mesh.set_skin_radii_from_attribute(
+                mesh_object=graph_partition, points=points, radii=radii)
 
             # Apply the skinning modifier
             vmv.bops.apply_skin_modifier()
@@ -187,6 +146,36 @@ class SkinningBuilder(MeshBuilder):
         # Shade the mesh object
         vmv.bops.shade_smooth()
 
+    ################################################################################################
+    # @skin_morphology_in_workers
+    ################################################################################################
+    def skin_morphology_in_workers(self):
+        """Generate a vascular mesh from the morphology using Skinning modifier, where the graph is
+        built and separated into partitions with numpy, and the partitions are skinned in a pool of
+        background Blender processes. The resulting meshes are concatenated into a single mesh."""
+
+        # Build the graph and separate it into partitions
+        points, radii, edges = self.build_graph_arrays()
+        labels = vmv.skeleton.compute_graph_partitions(len(points), edges)
+        partitions = vmv.skeleton.split_graph_partitions(points, radii, edges, labels)
+        vmv.logger.info('Skinning [%d] Graph Partitions in [%d] Workers' % (
+            len(partitions), self.options.mesh.skinning_workers))
+
+        # Skin the partitions and concatenate the resulting meshes
+        meshes = vmv.mesh.skin_graph_partitions_in_workers(
+            partitions, workers=self.options.mesh.skinning_workers, subdivision_level=2)
+        vertices, polygons_vertices, polygons_offsets = \
+            vmv.mesh.concatenate_polygons_meshes(meshes)
+        self.mesh = vmv.mesh.create_mesh_from_polygons(
+            vertices=vertices, polygons_vertices=polygons_vertices,
+            polygons_offsets=polygons_offsets, name='%s' % self.morphology.name)
+
+        # Select the resulting mesh
+        vmv.scene.set_active_object(scene_object=self.mesh)
+
+        # Shade the mesh object
+        vmv.bops.shade_smooth()
+
     ################################################################################################
     # @build_mesh
     ################################################################################################
@@ -206,7 +195,10 @@ class SkinningBuilder(MeshBuilder):
         self.center = self.morphology.bounding_box.center
 
         # Generate a vascular mesh from the morphology using Skinning modifier
-        self.skin_morphology_into_mesh()
+        if self.options.mesh.skinning_workers > 1:
+            self.skin_morphology_in_workers()
+        else:
+            self.skin_morphology_into_mesh()
 
         # Update its name with the mesh suffix to be able to locate it
         self.set_default_mesh_name()
@@ -17,11 +17,14 @@
 
 # System imports
 import time
+import numpy
 
 # Internal modules
+import vmv.bbox
 import vmv.bmeshi
 import vmv.geometry
 import vmv.mesh
+import vmv.skeleton
 import vmv.utilities
 from .base import MeshBuilder
 
@@ -213,12 +216,13 @@ class VoxelizationBuilder(MeshBuilder):
         # Obtain a data list containing the locations and radii of the branching samples
         branching_samples_data = self.morphology.get_branching_samples_data()
 
-        # Creating a bmesh object
-        bmesh_object = vmv.bmeshi.create_bmesh_object_from_spheres_list_using_icospheres(
-            spheres_list=branching_samples_data, subdivisions=2)
-
-        # Creating the corresponding mesh
-        return vmv.bmeshi.convert_bmesh_to_mesh(bmesh_object=bmesh_object, name='Branching')
+        # Creating the mesh of all the spheres at once, from the same re-meshed icosphere template
+        # that was used to create the spheres one by one in a bmesh object
+        return vmv.mesh.create_icospheres_mesh(
+            centers=[sample[0][:] for sample in branching_samples_data],
+            radii=[sample[1] for sample in branching_samples_data],
+            icosphere_template=vmv.mesh.get_remeshed_icosphere_data(subdivisions=2),
+            name='Branching')
 
     ################################################################################################
     # @generate_terminal_samples_mesh
@@ -288,10 +292,308 @@ class VoxelizationBuilder(MeshBuilder):
         self.mesh = vmv.mesh.join_mesh_objects(
             mesh_list=[branching_mesh, sections_mesh], name='Vascular Proxy Mesh')
 
-        # Apply the voxelization modifier to the proxy mesh to create a single manifold
-        vmv.mesh.remesh_using_voxelization(
+        # Re-mesh the proxy mesh at the resolution of the smallest radius
+        self.mesh = self.remesh_mesh_object(
             mesh_object=self.mesh, voxel_size=self.smallest_radius * 0.5)
 
+    ################################################################################################
+    # @remesh_mesh_object
+    ################################################################################################
+    def remesh_mesh_object(self,
+                           mesh_object,
+                           voxel_size):
+        """Re-meshes a proxy mesh object into a single manifold using the voxelization re-meshing
+        modifier, in bricks if a brick size is given in the options.
+
+        :param mesh_object:
+            A proxy mesh object.
+        :param voxel_size:
+            The voxelization resolution.
+        :return:
+            A reference to the re-meshed mesh object.
+        """
+
+        # Re-mesh in bricks, if requested, to bound the memory of the voxel grid
+        if self.options.mesh.voxel_brick_size > 0:
+            return self.remesh_mesh_object_in_bricks(
+                mesh_object=mesh_object, voxel_size=voxel_size)
+
+        # Report the size of the voxel grid before the voxelization
+        vertices, _ = vmv.mesh.get_mesh_object_triangles(mesh_object)
+        if len(vertices) > 0:
+            self.log_voxel_grid_size(
+                'Voxel grid', vertices.min(axis=0), vertices.max(axis=0), voxel_size)
+
+        # Apply the voxelization modifier to the proxy mesh to create a single manifold
+        vmv.mesh.remesh_using_voxelization(mesh_object=mesh_object, voxel_size=voxel_size)
+        return mesh_object
+
+    ################################################################################################
+    # @log_voxel_grid_size
+    ################################################################################################
+    @staticmethod
+    def log_voxel_grid_size(label,
+                            minimum,
+                            maximum,
+                            voxel_size):
+        """Logs the dimensions and the number of voxels of the grid that covers a box.
+
+        :param label:
+            A label of the grid.
+        :param minimum:
+            The minimum corner of the box.
+        :param maximum:
+            The maximum corner of the box.
+        :param voxel_size:
+            The size of the voxels.
+        :return:
+            The number of voxels.
+        """
+
+        dimensions = numpy.ceil((numpy.asarray(maximum) - numpy.asarray(minimum)) / voxel_size)
+        dimensions = numpy.maximum(dimensions, 1).astype(numpy.int64)
+        number_voxels = int(numpy.prod(dimensions))
+        vmv.logger.info('%s: [%d x %d x %d] = [%d] voxels' % (
+            label, dimensions[0], dimensions[1], dimensions[2], number_voxels))
+        return number_voxels
+
+    ################################################################################################
+    # @remesh_mesh_object_in_bricks
+    ################################################################################################
+    def remesh_mesh_object_in_bricks(self,
+                                     mesh_object,
+                                     voxel_size):
+        """Re-meshes a proxy mesh in bricks, where every brick is voxelized independently with
+        only the closed parts of the proxy mesh that intersect it.
+
+        The voxel re-mesher needs a closed surface. The loose parts of the proxy mesh, i.e. the
+        capped tubes of the sections and the spheres, are closed, and every brick gets all the
+        parts that intersect it, cut at the brick extended by a margin of a few voxels and capped
+        to remain closed. Therefore, the voxel grid of a brick never exceeds the brick and its
+        margin, however long the parts are. The bricks overlap by the margin, so that the geometry
+        near the seam between two bricks is the same in both of them, and the voxel re-mesher
+        samples every brick at multiples of the voxel size, on the same grid. The re-meshed
+        surface of every brick is clipped to the brick, away from the caps, and the surfaces are
+        joined, with the duplicate vertices along the seams merged. Only the voxel grid of a
+        single brick exists at any time.
+
+        :param mesh_object:
+            A proxy mesh object, deleted after it is split into the bricks.
+        :param voxel_size:
+            The voxelization resolution.
+        :return:
+            A reference to the re-meshed mesh object.
+        """
+
+        # The triangles of the proxy mesh
+        name = mesh_object.name
+        vertices, triangles = vmv.mesh.get_mesh_object_triangles(mesh_object)
+
+        # The closed parts of the proxy mesh, where the coincident vertices are merged since the
+        # caps of the tubes can have their own vertices, and the cuts of the parts must be closed
+        vertices, positions = numpy.unique(vertices, axis=0, return_inverse=True)
+        positions = positions.reshape(-1)[triangles]
+        parts = vmv.skeleton.compute_graph_partitions(positions.max() + 1 if len(triangles) else 0,
+                                                      numpy.concatenate((positions[:, [0, 1]],
+                                                                         positions[:, [1, 2]])))
+        _, triangles_parts = numpy.unique(parts[positions[:, 0]], return_inverse=True)
+        triangles_parts = triangles_parts.reshape(-1)
+        triangles = positions
+
+        # The bounding boxes of the parts
+        number_parts = triangles_parts.max() + 1 if len(triangles) > 0 else 0
+        triangles_vertices = vertices[triangles]
+        parts_minimum = numpy.full((number_parts, 3), numpy.inf)
+        parts_maximum = numpy.full((number_parts, 3), -numpy.inf)
+        numpy.minimum.at(parts_minimum, triangles_parts, triangles_vertices.min(axis=1))
+        numpy.maximum.at(parts_maximum, triangles_parts, triangles_vertices.max(axis=1))
+        del triangles_vertices
+
+        # The bricks, and the triangles sorted by part to gather the triangles of the parts
+        brick_size = self.options.mesh.voxel_brick_size
+        margin = vmv.consts.Meshing.VOXEL_BRICK_MARGIN * voxel_size
+        bricks = vmv.bbox.split_bounding_boxes_into_bricks(
+            parts_minimum, parts_maximum, brick_size, margin)
+        triangles_order = numpy.argsort(triangles_parts, kind='stable')
+        parts_offsets = numpy.searchsorted(triangles_parts[triangles_order],
+                                           numpy.arange(number_parts + 1))
+
+        # Report the size of the grids before the voxelization, the grid of a brick covers its
+        # parts, at most the brick and its margin
+        if len(vertices) > 0:
+            self.log_voxel_grid_size(
+                'Complete voxel grid', vertices.min(axis=0), vertices.max(axis=0), voxel_size)
+        if len(bricks) > 0:
+            extents = [numpy.minimum(parts_maximum[brick_parts].max(axis=0), maximum + margin) -
+                       numpy.maximum(parts_minimum[brick_parts].min(axis=0), minimum - margin)
+                       for minimum, maximum, brick_parts in bricks]
+            self.log_voxel_grid_size('Largest brick voxel grid', numpy.zeros(3),
+                                     numpy.max(extents, axis=0), voxel_size)
+        vmv.logger.info('Bricks: [%d], Parts: [%d]' % (len(bricks), number_parts))
+
+        # The proxy mesh is not needed anymore
+        vmv.scene.delete_object_in_scene(scene_object=mesh_object)
+
+        # Re-mesh the bricks one by one
+        meshes = list()
+        for i, (minimum, maximum, brick_parts) in enumerate(bricks):
+            vmv.utilities.show_progress('\t\t* Bricks', i, len(bricks))
+
+            # The triangles of all the parts of the brick
+            counts = parts_offsets[brick_parts + 1] - parts_offsets[brick_parts]
+            faces = triangles_order[numpy.repeat(
+                parts_offsets[brick_parts] - numpy.cumsum(counts) + counts, counts) +
+                numpy.arange(counts.sum())]
+
+            # A mesh of the triangles of the brick
+            brick_vertices, brick_triangles = numpy.unique(triangles[faces], return_inverse=True)
+            brick_mesh = vmv.mesh.create_mesh_from_triangles(
+                vertices=vertices[brick_vertices], triangles=brick_triangles.reshape(-1, 3),
+                name='Brick %d' % i)
+
+            # Cut the parts at the brick and its margin, to limit the voxel grid to the brick
+            vmv.mesh.cut_mesh_object_to_box(brick_mesh, minimum - margin, maximum + margin)
+
+            # Voxelize it, and keep only the surface within the brick
+            vmv.mesh.remesh_using_voxelization(mesh_object=brick_mesh, voxel_size=voxel_size)
+            vmv.mesh.clip_mesh_object_to_box(brick_mesh, minimum, maximum)
+            meshes.append(brick_mesh)
+        vmv.utilities.show_progress('\t\t* Bricks', len(bricks), len(bricks), True)
+
+        # Join the bricks and merge the vertices along the seams
+        mesh_object = vmv.mesh.join_mesh_objects(mesh_list=meshes, name=name)
+        if mesh_object is not None and len(meshes) > 1:
+            vmv.mesh.remove_doubles(mesh_object=mesh_object, distance=min(
+                vmv.consts.Meshing.DOUBLES_THRESHOLD, 0.01 * voxel_size))
+        return mesh_object
+
+    ################################################################################################
+    # @compute_radius_bands
+    ################################################################################################
+    @staticmethod
+    def compute_radius_bands(arrays,
+                             number_bands):
+        """Groups the sections of a morphology into bands of similar average radii, where the
+        boundaries of the bands are spaced geometrically between the smallest and largest average
+        radii of the sections.
+
+        :param arrays:
+            The @MorphologyArrays of the morphology.
+        :param number_bands:
+            The number of bands.
+        :return:
+            A list of (sections, radius) tuples of the non-empty bands, from the thinnest to the
+            thickest one, where sections is an array of the indices of the sections of the band
+            and radius is the smallest average radius of these sections. The radius of the first
+            band is the smallest radius of its samples instead, to re-mesh the thinnest sections
+            at the same resolution of the proxy mesh of the whole morphology.
+        """
+
+        # The non-empty sections, with their average and smallest radii
+        counts = numpy.diff(arrays.section_offsets)
+        sections = numpy.flatnonzero(counts > 0)
+        if len(sections) == 0:
+            return list()
+        average_radii = arrays.compute_sections_average_radii()[sections].astype(numpy.float64)
+        smallest_radii = numpy.minimum.reduceat(
+            arrays.radii, arrays.section_offsets[:-1][sections]).astype(numpy.float64)
+
+        # The band of every section
+        lower = max(average_radii.min(), 1e-6)
+        upper = average_radii.max()
+        if number_bands > 1 and upper > lower:
+            edges = numpy.geomspace(lower, upper, number_bands + 1)
+            bands = numpy.searchsorted(edges[1:-1], average_radii, side='right')
+        else:
+            bands = numpy.zeros(len(sections), dtype=numpy.int64)
+
+        radius_bands = [(sections[bands == band], average_radii[bands == band].min())
+                        for band in range(max(number_bands, 1)) if numpy.any(bands == band)]
+        radius_bands[0] = (radius_bands[0][0], smallest_radii[bands == bands.min()].min())
+        return radius_bands
+
+    ################################################################################################
+    # @generate_band_proxy_mesh
+    ################################################################################################
+    def generate_band_proxy_mesh(self,
+                                 sections,
+                                 name,
+                                 cross_sectional_sides=16):
+        """Generates a proxy mesh for a band of sections, with a sphere at either end of every
+        section. The spheres bridge the sections of the band, and since the terminal samples of
+        the sections are shared at the branching samples, they also overlap the proxy meshes of
+        the neighbouring bands to fuse them later.
+
+        :param sections:
+            The indices of the sections of the band.
+        :param name:
+            The name of the proxy mesh.
+        :param cross_sectional_sides:
+            Number of sides of the bevel object used to reconstruct the cross-sectional geometry.
+        :return:
+            A reference to the proxy mesh of the band.
+        """
+
+        sections_list = [self.morphology.sections_list[i] for i in sections]
+
+        # The sections
+        poly_lines = [vmv.skeleton.ops.get_color_coded_section_poly_line_with_single_color(
+            section=section) for section in sections_list]
+        bevel_object = vmv.mesh.create_bezier_circle(
+            vertices=cross_sectional_sides, name='%s Bevel' % name)
+        poly_lines_object = vmv.geometry.create_poly_lines_object_from_poly_lines_data(
+            poly_lines_data=poly_lines, name='%s Sections' % name, bevel_object=bevel_object)
+        sections_mesh = vmv.scene.convert_object_to_mesh(scene_object=poly_lines_object)
+
+        # The terminal samples
+        terminal_samples = [sample for section in sections_list
+                            for sample in (section.samples[0], section.samples[-1])]
+        terminals_mesh = vmv.mesh.create_icospheres_mesh(
+            centers=[sample.point[:] for sample in terminal_samples],
+            radii=[sample.radius for sample in terminal_samples],
+            icosphere_template=vmv.mesh.get_remeshed_icosphere_data(subdivisions=2),
+            name='%s Terminals' % name)
+
+        return vmv.mesh.join_mesh_objects(mesh_list=[terminals_mesh, sections_mesh], name=name)
+
+    ################################################################################################
+    # @build_radius_bands_mesh
+    ################################################################################################
+    def build_radius_bands_mesh(self):
+        """Builds the mesh in radius bands, where every band is re-meshed at a resolution that is
+        proportional to the radii of its sections, rather than re-meshing the whole proxy mesh at
+        the resolution of the smallest radius in the morphology. The re-meshed bands are
+        fused with a boolean union, starting from the thickest one.
+
+        :return:
+            A reference to the fused mesh.
+        """
+
+        # Use the arrays of the morphology, if any, otherwise construct them from the sections
+        arrays = self.morphology.arrays
+        if arrays is None:
+            arrays = vmv.skeleton.construct_morphology_arrays_from_sections(
+                self.morphology.sections_list)
+
+        bands = self.compute_radius_bands(arrays, self.options.mesh.voxel_radius_bands)
+        if len(bands) == 0:
+            return None
+        self.smallest_radius = bands[0][1]
+
+        # Re-mesh the bands one by one
+        band_meshes = list()
+        for i, (sections, radius) in enumerate(bands):
+            voxel_size = radius * 0.5
+            vmv.logger.info('Radius Band [%d]: [%d] sections, Resolution [%f]' %
+                            (i, len(sections), voxel_size))
+            band_mesh = self.generate_band_proxy_mesh(sections=sections, name='Band %d' % i)
+            band_meshes.append(self.remesh_mesh_object(
+                mesh_object=band_mesh, voxel_size=voxel_size))
+
+        # Fuse the bands at the branching regions
+        vmv.logger.info('Fusing [%d] Radius Bands' % len(band_meshes))
+        return vmv.mesh.union_mesh_objects_in_list(band_meshes[::-1])
+
     ################################################################################################
     # @build_mesh
     ################################################################################################
@@ -307,24 +609,33 @@ class VoxelizationBuilder(MeshBuilder):
         # Update the center of the mesh to the center of the bounding box of the morphology
         self.center = self.morphology.bounding_box.center
 
-        # Create the branching mesh
         start = time.time()
-        vmv.logger.info('Generating Branching Mesh, without Terminals')
-        branching_mesh = self.generate_branching_mesh()
-
-        # Create the terminal samples mesh
-        # vmv.logger.info('Generating Branching Mesh, with Terminals')
-        # branching_mesh = self.generate_terminal_samples_mesh()
-
-        # Create the sections mesh
-        vmv.logger.info('Generating Sections Mesh')
-        # sections_mesh = self.generate_sections_mesh()
-        sections_mesh = self.generate_optimized_sections_mesh()
-
-        # Re-mesh the proxy mesh into a single manifold
-        vmv.logger.info('Re-meshing and Reconstructing Vascular Mesh: Resolution [%f]' %
-                        (self.smallest_radius * 0.5))
-        self.remesh_proxy_mesh(branching_mesh=branching_mesh, sections_mesh=sections_mesh)
+
+        # Re-mesh every radius band at its own resolution, if requested
+        if self.options.mesh.voxel_radius_bands > 1:
+            vmv.logger.info('Re-meshing and Reconstructing Vascular Mesh in [%d] Radius Bands' %
+                            self.options.mesh.voxel_radius_bands)
+            self.mesh = self.build_radius_bands_mesh()
+
+        else:
+
+            # Create the branching mesh
+            vmv.logger.info('Generating Branching Mesh, without Terminals')
+            branching_mesh = self.generate_branching_mesh()
+
+            # Create the terminal samples mesh
+            # vmv.logger.info('Generating Branching Mesh, with Terminals')
+            # branching_mesh = self.generate_terminal_samples_mesh()
+
+            # Create the sections mesh
+            vmv.logger.info('Generating Sections Mesh')
+            # sections_mesh = self.generate_sections_mesh()
+            sections_mesh = self.generate_optimized_sections_mesh()
+
+            # Re-mesh the proxy mesh into a single manifold
+            vmv.logger.info('Re-meshing and Reconstructing Vascular Mesh: Resolution [%f]' %
+                            (self.smallest_radius * 0.5))
+            self.remesh_proxy_mesh(branching_mesh=branching_mesh, sections_mesh=sections_mesh)
         end = time.time()
 
         # Time
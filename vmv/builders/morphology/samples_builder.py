@@ -15,12 +15,16 @@
 # If not, see <http://www.gnu.org/licenses/>.
 ####################################################################################################
 
+# System imports
+import numpy
+
 # Internal imports
 import vmv.geometry
 import vmv.mesh
 import vmv.bmeshi
 import vmv.scene
 import vmv.skeleton
+import vmv.utilities
 from .base import MorphologyBuilder
 
 
@@ -101,6 +105,58 @@ class SamplesBuilder(MorphologyBuilder):
         vmv.shading.create_material_specific_illumination(
             material_type=self.options.morphology.material)
 
+    ################################################################################################
+    # @get_samples_points_and_radii
+    ################################################################################################
+    def get_samples_points_and_radii(self):
+        """Gets the points and radii of all the samples of all the sections of the morphology.
+
+        :return:
+            An (N x 3) array of the points and an array of the N radii of the samples.
+        """
+
+        samples = [sample for section in self.morphology.sections_list
+                   for sample in section.samples]
+        points = numpy.array([sample.point[:] for sample in samples], dtype=numpy.float32)
+        radii = numpy.array([sample.radius for sample in samples], dtype=numpy.float32)
+        return points.reshape(-1, 3), radii
+
+    ################################################################################################
+    # @link_and_shade_instanced_spheres
+    ################################################################################################
+    def link_and_shade_instanced_spheres(self,
+                                         prefix):
+        """Creates a point cloud of all the samples, with a radius per sample, and instances a
+        single shared sphere on it.
+
+        NOTE: This requires Blender 3.0 or later, for the geometry nodes.
+
+        :param prefix:
+            Prefix to name the point cloud object after linking it to the scene.
+        """
+
+        points, radii = self.get_samples_points_and_radii()
+
+        # Link the point cloud to the scene
+        self.morphology_skeleton = vmv.mesh.create_point_cloud(
+            points=points, radii=radii, name=prefix)
+
+        # Create a simple material
+        material = vmv.shading.create_material(
+            name='morphology_skeleton', material_type=self.options.morphology.material,
+            color=self.options.morphology.color)
+
+        # Assign the material
+        vmv.shading.set_material_to_object(self.morphology_skeleton, material)
+
+        # Instance the sphere, with smooth shading and the material
+        vmv.mesh.instance_ico_sphere_on_vertices(
+            mesh_object=self.morphology_skeleton, subdivisions=1, material=material)
+
+        # Create the corresponding illumination
+        vmv.shading.create_material_specific_illumination(
+            material_type=self.options.morphology.material)
+
     ################################################################################################
     # @build_skeleton
     ################################################################################################
@@ -129,6 +185,15 @@ class SamplesBuilder(MorphologyBuilder):
         vmv.logger.info('Adjusting Radii')
         vmv.skeleton.update_skeleton_radii(morphology=self.morphology, options=self.options)
 
+        # Instance a single sphere on the samples, the geometry nodes require Blender 3.0
+        if self.options.morphology.instance_samples:
+            if vmv.utilities.is_blender_3():
+                vmv.logger.info('Instancing spheres')
+                self.link_and_shade_instanced_spheres(prefix=self.morphology_name)
+                return self.morphology_skeleton
+            vmv.logger.info('Instancing spheres requires Blender 3.0 or later, '
+                            'creating a sphere per sample')
+
         # Construct the final object and add it to the morphology
         vmv.logger.info('Constructing Object')
 
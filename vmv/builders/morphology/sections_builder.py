@@ -15,11 +15,18 @@
 # If not, see <http://www.gnu.org/licenses/>.
 ####################################################################################################
 
+# System imports
+import numpy
+
+# Blender imports
+import bpy
+
 # Internal imports
 import vmv.geometry
 import vmv.mesh
 import vmv.scene
 import vmv.skeleton
+import vmv.utilities
 from .base import MorphologyBuilder
 
 
@@ -53,6 +60,11 @@ class SectionsBuilder(MorphologyBuilder):
         # Use smooth curves to plot the sections instead of the polylines
         self.use_smooth_curves = use_smooth_curves
 
+        # The vertex (or radius) indices of the points of all the splines, and the offsets of the
+        # points of every spline into them, computed once on demand for the simulations
+        self.splines_points_vertex_indices = None
+        self.splines_points_offsets = None
+
     ################################################################################################
     # @get_poly_lines_data_colored_with_single_color
     ################################################################################################
@@ -322,6 +334,39 @@ class SectionsBuilder(MorphologyBuilder):
         else:
             return self.get_poly_lines_data_colored_with_single_color()
 
+    ################################################################################################
+    # @get_sections_poly_lines_arrays
+    ################################################################################################
+    def get_sections_poly_lines_arrays(self):
+        """Gets the poly-lines of all the sections in the morphology in flat arrays, color-coded
+        based on the color-coding scheme.
+
+        NOTE: This is the batched counterpart of @get_sections_poly_lines_data, where the metrics
+        of all the sections are computed at once and no @PolyLine objects are created.
+
+        :return:
+            A @PolyLinesArrays object of the poly-lines.
+        """
+
+        # Use the arrays of the morphology, if any, otherwise construct them from the sections
+        arrays = self.morphology.arrays
+        if arrays is None:
+            arrays = vmv.skeleton.construct_morphology_arrays_from_sections(
+                self.morphology.sections_list)
+
+        poly_lines_arrays, value_range = vmv.skeleton.construct_sections_poly_lines_arrays(
+            arrays=arrays, color_coding=self.options.morphology.color_coding,
+            color_map_resolution=self.options.morphology.color_map_resolution,
+            duplicate_terminal_samples=self.use_smooth_curves)
+
+        # Update the interface with the minimum and maximum values for the color-mapping
+        if value_range is not None and self.context is not None:
+            self.context.scene.VMV_MinimumValue = str(value_range[0])
+            self.context.scene.VMV_MaximumValue = str(value_range[1])
+
+        # Return the poly-lines
+        return poly_lines_arrays
+
     ################################################################################################
     # @build_skeleton
     ################################################################################################
@@ -354,19 +399,32 @@ class SectionsBuilder(MorphologyBuilder):
             scene_object=bevel_object, shift=self.morphology.bounding_box.center)
         vmv.scene.hide_object(scene_object=bevel_object)
 
-        # Construct sections poly-lines
-        vmv.logger.info('Constructing Poly-lines')
-        poly_lines_data = self.get_sections_poly_lines_data()
+        # Adaptively resampling the reconstructed sections requires the poly-lines objects
+        if self.options.morphology.adaptive_resampling:
 
-        # Pre-process the radii
-        vmv.logger.info('Adjusting Radii')
-        vmv.skeleton.update_poly_lines_radii(poly_lines=poly_lines_data, options=self.options)
+            # Construct sections poly-lines
+            vmv.logger.info('Constructing Poly-lines')
+            poly_lines_data = self.get_sections_poly_lines_data()
+
+            # Pre-process the radii
+            vmv.logger.info('Adjusting Radii')
+            vmv.skeleton.update_poly_lines_radii(poly_lines=poly_lines_data, options=self.options)
 
-        # Adaptively resampling the reconstructed sections
-        if self.options.morphology.adaptive_resampling:
             vmv.logger.info('Re-sampling poly-lines')
             vmv.skeleton.resample_poly_lines_adaptively(poly_lines=poly_lines_data)
 
+        # Otherwise, construct all the poly-lines at once in flat arrays
+        else:
+
+            # Construct sections poly-lines
+            vmv.logger.info('Constructing Poly-lines')
+            poly_lines_data = self.get_sections_poly_lines_arrays()
+
+            # Pre-process the radii
+            vmv.logger.info('Adjusting Radii')
+            vmv.skeleton.update_poly_lines_arrays_radii(
+                poly_lines_arrays=poly_lines_data, options=self.options)
+
         # Construct the final object and add it to the morphology
         vmv.logger.info('Drawing Object')
 
@@ -377,87 +435,128 @@ class SectionsBuilder(MorphologyBuilder):
         return self.morphology_skeleton
 
     ################################################################################################
-    # @adjust_point_radius_at_time_step
+    # @load_radius_simulation_data_at_step
     ################################################################################################
-    def adjust_point_radius_at_time_step(self,
-                                         polyline,
-                                         point_index,
-                                         section_index,
-                                         time_step):
-        """Adjusts the radius of a point along a morphological section at a given time step.
+    def load_radius_simulation_data_at_step(self,
+                                            time_step,
+                                            context=None):
+        """Loads the radius simulation data at a specific time step.
 
-        :param polyline:
-            Spline polyline.
-        :param point_index:
-            The unique index of the point.
-        :param section_index:
-            Morphological section index.
+        NOTE: No keyframes are inserted here, the keyframes of all the time steps are baked at
+        once with @load_radius_simulation_data.
 
         :param time_step:
             The time step.
+        :param context:
+            Blender context.
         """
 
-        # Get the index of the radius from the samples list
-        radius_index = self.morphology.sections_list[section_index].samples[point_index].index
-
-        # Get a reference to the radii
-        radius_list = self.morphology.radius_simulation_data[radius_index - 1]
-
-        # Update the point radius along the spline
-        polyline.points[point_index].radius = radius_list[time_step]
+        # Update the context
+        self.context = context
 
-        # Set the keyframe to the time step
-        polyline.points[point_index].keyframe_insert('radius', frame=time_step)
+        # Set the radii of all the spline points at this time step
+        self.apply_radius_simulation_at_step(time_step)
 
     ################################################################################################
-    # @update_section_radii_at_step
+    # @compute_splines_points_vertex_indices
     ################################################################################################
-    def update_section_radii_at_step(self,
-                                     section_index,
-                                     time_step):
-        """Updates the radii of a given section at a time.
-
-        :param section_index:
-            The index of the section.
-        :param time_step:
-            The time step.
+    def compute_splines_points_vertex_indices(self):
+        """Computes the vertex (or radius) indices of the points of all the splines in the
+        morphology skeleton, which are used to map the simulation data to the splines.
         """
 
-        if len(self.morphology.sections_list[section_index].samples) > 0:
+        # Already computed
+        if self.splines_points_vertex_indices is not None:
+            return
+
+        splines = self.morphology_skeleton.data.splines
 
-            # Get a reference to the polyline
-            polyline = self.morphology_skeleton.data.splines[section_index]
+        vertex_indices = list()
+        offsets = [0]
+        for i_section, section in enumerate(self.morphology.sections_list):
+            if len(section.samples) > 0:
+                vertex_indices.extend(section.samples[i_point].index - 1
+                                      for i_point in range(len(splines[i_section].points)))
+            offsets.append(len(vertex_indices))
 
-            [self.adjust_point_radius_at_time_step(polyline, i_point, section_index, time_step)
-             for i_point in range(len(polyline.points))]
+        self.splines_points_vertex_indices = numpy.array(vertex_indices, dtype=numpy.int64)
+        self.splines_points_offsets = numpy.array(offsets, dtype=numpy.int64)
 
     ################################################################################################
-    # @load_radius_simulation_data_at_step
+    # @apply_radius_simulation_at_step
     ################################################################################################
-    def load_radius_simulation_data_at_step(self,
-                                            time_step,
-                                            context=None):
-        """Loads the radius simulation data at a specific time step.
+    def apply_radius_simulation_at_step(self,
+                                        time_step):
+        """Applies the radius simulation data at a given time step directly on the splines of the
+        morphology skeleton without inserting any keyframes.
 
         :param time_step:
             The time step.
-        :param context:
-            Blender context.
         """
 
-        # Update the context
-        self.context = context
+        self.compute_splines_points_vertex_indices()
 
-        # Do it per section
-        [self.update_section_radii_at_step(i_section, time_step)
-         for i_section in range(len(self.morphology.sections_list))]
+        # The radii of all the spline points at this time step
+        radii = numpy.asarray(self.morphology.get_radius_simulation_data_at_step(time_step),
+                              dtype=numpy.float32)[self.splines_points_vertex_indices]
+
+        splines = self.morphology_skeleton.data.splines
+        offsets = self.splines_points_offsets
+        for i_section in range(len(offsets) - 1):
+            if offsets[i_section + 1] > offsets[i_section]:
+                splines[i_section].points.foreach_set(
+                    'radius', radii[offsets[i_section]:offsets[i_section + 1]])
 
     ################################################################################################
     # @load_radius_simulation_data
     ################################################################################################
     def load_radius_simulation_data(self):
-        """Loads the radius simulation data for all the time steps."""
+        """Loads the radius simulation data for all the time steps.
+
+        NOTE: Instead of inserting a keyframe per point per time step, the F-curves of the radii of
+        all the spline points are created once and their keyframes are filled in bulk from the
+        simulation data with foreach_set.
+        """
 
-        # Add simulation data
-        [self.load_radius_simulation_data_at_step(time_step=time_step)
-         for time_step in range(0, len(self.morphology.radius_simulation_data[0]))]
+        timer = vmv.utilities.Timer()
+        timer.start()
+
+        number_steps = self.morphology.get_number_radius_simulation_steps()
+
+        # The data paths of the radii of all the spline points and their vertex (or radius) indices
+        self.compute_splines_points_vertex_indices()
+        vertex_indices = self.splines_points_vertex_indices
+        offsets = self.splines_points_offsets
+        data_paths = ['splines[%d].points[%d].radius' % (i_section, i_point)
+                      for i_section in range(len(offsets) - 1)
+                      for i_point in range(offsets[i_section + 1] - offsets[i_section])]
+
+        # Gather the radii of all the points along the time steps, a row per point
+        radii = numpy.empty((len(vertex_indices), number_steps), dtype=numpy.float32)
+        for time_step in range(number_steps):
+            radii[:, time_step] = numpy.asarray(
+                self.morphology.get_radius_simulation_data_at_step(time_step),
+                dtype=numpy.float32)[vertex_indices]
+
+        # Create a new action for the skeleton data, replacing any previously loaded simulation
+        curve_data = self.morphology_skeleton.data
+        if curve_data.animation_data is None:
+            curve_data.animation_data_create()
+        action = bpy.data.actions.new('%s_radius_simulation' % self.morphology_name)
+        curve_data.animation_data.action = action
+
+        # The keyframes are stored in the format [frame, radius] per time step
+        keyframes = numpy.empty((number_steps, 2), dtype=numpy.float32)
+        keyframes[:, 0] = numpy.arange(number_steps, dtype=numpy.float32)
+
+        # Create the F-curve of every point and fill its keyframes at once
+        for data_path, point_radii in zip(data_paths, radii):
+            keyframes[:, 1] = point_radii
+            fcurve = action.fcurves.new(data_path)
+            fcurve.keyframe_points.add(number_steps)
+            fcurve.keyframe_points.foreach_set('co', keyframes.ravel())
+            fcurve.update()
+
+        timer.end()
+        vmv.logger.info('Radius simulation of [%d] points and [%d] steps loaded in [%f] seconds'
+                        % (len(data_paths), number_steps, timer.duration()))
@@ -15,6 +15,12 @@
 # If not, see <http://www.gnu.org/licenses/>.
 ####################################################################################################
 
+# System imports
+import numpy
+
+# Blender imports
+import bpy
+
 # Internal imports
 import vmv.geometry
 import vmv.mesh
@@ -49,6 +55,13 @@ class SegmentsBuilder(MorphologyBuilder):
         # Base
         MorphologyBuilder.__init__(self, morphology=morphology, options=options)
 
+        # The vertex (or radius) indices of the first samples of all the segments, computed once on
+        # demand for the simulations
+        self.segments_vertex_indices = None
+
+        # The (segment x step) color indices of the radius simulation, computed once on demand
+        self.radius_simulation_color_indices = None
+
     ################################################################################################
     # @get_poly_line_data_colored_with_single_color
     ################################################################################################
@@ -295,6 +308,38 @@ class SegmentsBuilder(MorphologyBuilder):
         else:
             return self.get_poly_line_data_colored_with_single_color()
 
+    ################################################################################################
+    # @get_segments_poly_lines_arrays
+    ################################################################################################
+    def get_segments_poly_lines_arrays(self):
+        """Gets the poly-lines of all the segments in the morphology in flat arrays, color-coded
+        based on the color-coding scheme.
+
+        NOTE: This is the batched counterpart of @get_segments_poly_lines_data, where the metrics
+        of all the segments are computed at once and no @PolyLine objects are created.
+
+        :return:
+            A @PolyLinesArrays object of the poly-lines.
+        """
+
+        # Use the arrays of the morphology, if any, otherwise construct them from the sections
+        arrays = self.morphology.arrays
+        if arrays is None:
+            arrays = vmv.skeleton.construct_morphology_arrays_from_sections(
+                self.morphology.sections_list)
+
+        poly_lines_arrays, value_range = vmv.skeleton.construct_segments_poly_lines_arrays(
+            arrays=arrays, color_coding=self.options.morphology.color_coding,
+            color_map_resolution=self.options.morphology.color_map_resolution)
+
+        # Update the interface with the minimum and maximum values for the color-mapping
+        if value_range is not None and self.context is not None:
+            self.context.scene.VMV_MinimumValue = str(value_range[0])
+            self.context.scene.VMV_MaximumValue = str(value_range[1])
+
+        # Return the poly-lines
+        return poly_lines_arrays
+
     ################################################################################################
     # @build_skeleton
     ################################################################################################
@@ -319,11 +364,12 @@ class SegmentsBuilder(MorphologyBuilder):
 
         # Construct sections poly-lines
         vmv.logger.info('Constructing polylines')
-        poly_lines_data = self.get_segments_poly_lines_data()
+        poly_lines_data = self.get_segments_poly_lines_arrays()
 
         # Pre-process the radii
         vmv.logger.info('Adjusting Radii')
-        vmv.skeleton.update_poly_lines_radii(poly_lines=poly_lines_data, options=self.options)
+        vmv.skeleton.update_poly_lines_arrays_radii(
+            poly_lines_arrays=poly_lines_data, options=self.options)
 
         # Construct the final object and add it to the morphology
         vmv.logger.info('Drawing Polylines')
@@ -342,19 +388,30 @@ class SegmentsBuilder(MorphologyBuilder):
         self.context.scene.VMV_MinimumValue = str(self.minimum_simulation_value)
         self.context.scene.VMV_MaximumValue = str(self.maximum_simulation_value)
 
+    ################################################################################################
+    # @update_simulation_dynamic_range
+    ################################################################################################
+    def update_simulation_dynamic_range(self,
+                                        statistics):
+        """Extends the dynamic range of the simulation to include the range of some statistics.
+
+        :param statistics:
+            The @SimulationStatistics of the simulation data, or None if there are no data.
+        """
+
+        if statistics is None or len(statistics.steps_minimum) == 0:
+            return
+        self.minimum_simulation_value = min(self.minimum_simulation_value, statistics.minimum)
+        self.maximum_simulation_value = max(self.maximum_simulation_value, statistics.maximum)
+
     ################################################################################################
     # @identify_radius_simulation_dynamic_range
     ################################################################################################
     def identify_radius_simulation_dynamic_range(self):
         """Identifies the dynamic range of the radius simulation, or variation, data."""
 
-        # Scan the entire simulation data to obtain the dynamic range
-        for sample_simulation_list in self.morphology.radius_simulation_data:
-            for value in sample_simulation_list:
-                if value < self.minimum_simulation_value:
-                    self.minimum_simulation_value = value
-                if value > self.maximum_simulation_value:
-                    self.maximum_simulation_value = value
+        # The statistics are computed once and shared by all the builders
+        self.update_simulation_dynamic_range(self.morphology.get_radius_simulation_statistics())
 
         # Update the values
         self.update_ui_minimum_and_maximum_values()
@@ -365,13 +422,8 @@ class SegmentsBuilder(MorphologyBuilder):
     def identify_flow_simulation_dynamic_range(self):
         """Identifies the dynamic range for the flow simulation data."""
 
-        # Scan the entire simulation data to obtain the dynamic range
-        for sample_simulation_list in self.morphology.flow_simulation_data:
-            for value in sample_simulation_list:
-                if value < self.minimum_simulation_value:
-                    self.minimum_simulation_value = value
-                if value > self.maximum_simulation_value:
-                    self.maximum_simulation_value = value
+        # The statistics are computed once and shared by all the builders
+        self.update_simulation_dynamic_range(self.morphology.get_flow_simulation_statistics())
 
         # Update the values
         self.update_ui_minimum_and_maximum_values()
@@ -382,78 +434,158 @@ class SegmentsBuilder(MorphologyBuilder):
     def identify_pressure_simulation_dynamic_range(self):
         """Identifies the dynamic range of the pressure simulation data."""
 
-        # Scan the entire simulation data to obtain the dynamic range
-        for sample_simulation_list in self.morphology.pressure_simulation_data:
-            for value in sample_simulation_list:
-                if value < self.minimum_simulation_value:
-                    self.minimum_simulation_value = value
-                if value > self.maximum_simulation_value:
-                    self.maximum_simulation_value = value
+        # The statistics are computed once and shared by all the builders
+        self.update_simulation_dynamic_range(self.morphology.get_pressure_simulation_statistics())
 
         # Update the values
         self.update_ui_minimum_and_maximum_values()
 
     ################################################################################################
-    # @load_radius_simulation_data_at_step
+    # @compute_segments_vertex_indices
     ################################################################################################
-    def load_radius_simulation_data_at_step(self,
-                                            time_step,
-                                            context=None):
-        """Loads radius simulation data at a specific time step.
+    def compute_segments_vertex_indices(self):
+        """Computes the vertex (or radius) indices of the first samples of all the segments in the
+        morphology, which are used to map the simulation data to the splines.
+        """
+
+        # Already computed
+        if self.segments_vertex_indices is not None:
+            return
+
+        self.segments_vertex_indices = numpy.array(
+            [section.samples[i_sample].index - 1 for section in self.morphology.sections_list
+             for i_sample in range(len(section.samples) - 1)], dtype=numpy.int64)
+
+    ################################################################################################
+    # @apply_radius_simulation_at_step
+    ################################################################################################
+    def apply_radius_simulation_at_step(self,
+                                        time_step):
+        """Applies the radius simulation data at a given time step directly on the material
+        indices of the splines of the morphology skeleton without inserting any keyframes.
 
         :param time_step:
-            The time which the simulation data will be loaded into.
-        :param context:
-            Blender context.
+            The time step.
         """
 
-        self.context = context
+        self.compute_segments_vertex_indices()
 
-        segment_index = 0
+        # The radii of all the segments at this time step
+        radii = numpy.asarray(self.morphology.get_radius_simulation_data_at_step(time_step),
+                              dtype=numpy.float32)[self.segments_vertex_indices]
 
-        # For every section in the morphology
-        for section in self.morphology.sections_list:
+        # Compute the material indices, clamped to the color map as Blender does
+        color_indices = vmv.utilities.get_indices(
+            values=radii,
+            minimum_value=self.minimum_simulation_value,
+            maximum_value=self.maximum_simulation_value,
+            number_steps=self.options.morphology.color_map_resolution)
+        color_indices = numpy.clip(
+            color_indices, 0, self.options.morphology.color_map_resolution - 1)
 
-            # For every segment in the section
-            for i_sample in range(len(section.samples) - 1):
+        self.morphology_skeleton.data.splines.foreach_set('material_index', color_indices)
 
-                # The index
-                radius_index = section.samples[i_sample].index
+    ################################################################################################
+    # @compute_radius_simulation_color_indices
+    ################################################################################################
+    def compute_radius_simulation_color_indices(self):
+        """Computes the color (or material) indices of all the segments at all the time steps of
+        the radius simulation at once, in a (segment x step) matrix.
+        """
 
-                # Get a reference to the radii
-                radius_list = self.morphology.radius_simulation_data[radius_index - 1]
+        # Already computed
+        if self.radius_simulation_color_indices is not None:
+            return
 
-                # Get the segment polyline
-                segment_polyline = self.morphology_skeleton.data.splines[segment_index]
+        # The dynamic range is needed to map the radii to the colormap
+        if self.minimum_simulation_value > self.maximum_simulation_value:
+            self.identify_radius_simulation_dynamic_range()
 
-                # Compute the material index
-                color_index = vmv.utilities.get_index(
-                    value=radius_list[time_step],
-                    minimum_value=self.minimum_simulation_value,
-                    maximum_value=self.maximum_simulation_value,
-                    number_steps=self.options.morphology.color_map_resolution)
+        self.compute_segments_vertex_indices()
 
-                if self.context is not None:
-                    if radius_list[time_step] < float(self.context.scene.VMV_MinimumValue):
-                        self.context.scene.VMV_MinimumValue = str(radius_list[time_step])
+        number_steps = self.morphology.get_number_radius_simulation_steps()
+        resolution = self.options.morphology.color_map_resolution
+        self.radius_simulation_color_indices = numpy.empty(
+            (len(self.segments_vertex_indices), number_steps),
+            dtype=numpy.uint8 if resolution <= 256 else numpy.uint16)
 
-                    if radius_list[time_step] > float(self.context.scene.VMV_MaximumValue):
-                        self.context.scene.VMV_MaximumValue = str(radius_list[time_step])
+        # Map the radii of all the segments to the colormap, a time step at once
+        for time_step in range(number_steps):
+            radii = numpy.asarray(self.morphology.get_radius_simulation_data_at_step(time_step),
+                                  dtype=numpy.float32)[self.segments_vertex_indices]
+            color_indices = vmv.utilities.get_indices(
+                values=radii,
+                minimum_value=self.minimum_simulation_value,
+                maximum_value=self.maximum_simulation_value,
+                number_steps=resolution)
+            self.radius_simulation_color_indices[:, time_step] = numpy.clip(
+                color_indices, 0, resolution - 1)
 
-                # Get a reference to the material list of the morphology skeleton
-                segment_polyline.material_index = color_index
-                segment_polyline.keyframe_insert('material_index', frame=time_step)
+    ################################################################################################
+    # @load_radius_simulation_data_at_step
+    ################################################################################################
+    def load_radius_simulation_data_at_step(self,
+                                            time_step,
+                                            context=None):
+        """Loads radius simulation data at a specific time step.
+
+        NOTE: No keyframes are inserted here, the keyframes of all the time steps are baked at
+        once with @load_radius_simulation_data.
 
-                segment_index += 1
+        :param time_step:
+            The time which the simulation data will be loaded into.
+        :param context:
+            Blender context.
+        """
+
+        self.context = context
+
+        # The color indices of all the segments are computed once for all the time steps
+        self.compute_radius_simulation_color_indices()
+
+        # Set the material indices of all the segments at once
+        splines = self.morphology_skeleton.data.splines
+        splines.foreach_set('material_index',
+                            self.radius_simulation_color_indices[:, time_step].astype(numpy.int32))
 
     ################################################################################################
     # @load_radius_simulation_data
     ################################################################################################
     def load_radius_simulation_data(self):
-        """Loads the radius simulation data."""
+        """Loads the radius simulation data.
 
-        self.identify_radius_simulation_dynamic_range()
+        NOTE: The F-curves of the material indices of all the segments are created once and their
+        keyframes are filled in bulk from the color indices matrix with foreach_set.
+        """
+
+        timer = vmv.utilities.Timer()
+        timer.start()
 
-        # Add simulation data
-        for time_step in range(0, len(self.morphology.radius_simulation_data[0])):
-            self.load_radius_simulation_data_at_step(time_step=time_step)
+        self.identify_radius_simulation_dynamic_range()
+        self.compute_radius_simulation_color_indices()
+
+        number_steps = self.morphology.get_number_radius_simulation_steps()
+
+        # Create a new action for the skeleton data, replacing any previously loaded simulation
+        curve_data = self.morphology_skeleton.data
+        if curve_data.animation_data is None:
+            curve_data.animation_data_create()
+        action = bpy.data.actions.new('%s_radius_simulation' % self.morphology_name)
+        curve_data.animation_data.action = action
+
+        # The keyframes are stored in the format [frame, material index] per time step
+        keyframes = numpy.empty((number_steps, 2), dtype=numpy.float32)
+        keyframes[:, 0] = numpy.arange(number_steps, dtype=numpy.float32)
+
+        # Create the F-curve of every segment and fill its keyframes at once
+        for segment_index, color_indices in enumerate(self.radius_simulation_color_indices):
+            keyframes[:, 1] = color_indices
+            fcurve = action.fcurves.new('splines[%d].material_index' % segment_index)
+            fcurve.keyframe_points.add(number_steps)
+            fcurve.keyframe_points.foreach_set('co', keyframes.ravel())
+            fcurve.update()
+
+        timer.end()
+        vmv.logger.info('Radius simulation of [%d] segments and [%d] steps loaded in [%f] seconds'
+                        % (len(self.radius_simulation_color_indices), number_steps,
+                           timer.duration()))
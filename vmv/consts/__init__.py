@@ -16,6 +16,7 @@
 ####################################################################################################
 
 from .bevel_consts import *
+from .cache_consts import *
 from .color_consts import *
 from .image_consts import *
 from .geometry_conts import *
@@ -27,3 +28,4 @@ from .path_consts import *
 from .skeleton_consts import *
 from .suffix_consts import *
 from .string_consts import *
+from .vmvb_consts import *
@@ -0,0 +1,62 @@
+####################################################################################################
+# Copyright (c) 2019 - 2023, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+####################################################################################################
+# @MorphologyCache
+####################################################################################################
+class MorphologyCache:
+    """Constants of the on-disk cache of the parsed morphologies.
+
+    Every cached morphology is a VMVB file, whose name is a hash of the content of the source
+    file, the version of the readers and the loading options.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self):
+        pass
+
+    # The version of the readers, must be incremented if the readers produce a different output
+    READERS_VERSION = 1
+
+    # An environment variable to set the cache directory, the cache is disabled if it is not set
+    DIRECTORY_ENVIRONMENT_VARIABLE = 'VMV_CACHE_DIRECTORY'
+
+    # An environment variable to override the maximum size of the cache in bytes
+    MAXIMUM_SIZE_ENVIRONMENT_VARIABLE = 'VMV_CACHE_MAXIMUM_SIZE'
+
+    # The default maximum size of the cache in bytes, the least recently used files are evicted
+    DEFAULT_MAXIMUM_SIZE = 8 * 1024 * 1024 * 1024
+
+    # The extension of the cached files
+    EXTENSION = '.vmvb'
+
+    # The names of the arrays of the cached morphology
+    POINTS = 'POINTS'
+    RADII = 'RADII'
+    SECTION_OFFSETS = 'SECTION_OFFSETS'
+    SECTION_INDICES = 'SECTION_INDICES'
+    SAMPLE_INDICES = 'SAMPLE_INDICES'
+    PARENTS_OFFSETS = 'PARENTS_OFFSETS'
+    PARENTS = 'PARENTS'
+    CHILDREN_OFFSETS = 'CHILDREN_OFFSETS'
+    CHILDREN = 'CHILDREN'
+    ROOTS = 'ROOTS'
+
+    # [number_samples, number_sections, section_connectivity_available]
+    METADATA = 'METADATA'
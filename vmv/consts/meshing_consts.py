@@ -47,6 +47,45 @@ class Meshing:
     # Minimum meta ball resolution
     MAX_META_BALL_RESOLUTION = 10.0
 
+    # Default size of the bricks of the tiled meshing techniques, in microns
+    BRICK_SIZE = 100.0
+
+    # Minimum size of the bricks
+    MIN_BRICK_SIZE = 1.0
+
+    # Maximum size of the bricks
+    MAX_BRICK_SIZE = 100000.0
+
+    # The overlap of the bricks of the tiled voxelization, in voxels
+    VOXEL_BRICK_MARGIN = 4
+
+    # Maximum number of radius bands of the adaptive voxelization
+    MAX_VOXEL_RADIUS_BANDS = 8
+
+    # Default voxel size of the signed distance field, if the morphology has no radii
+    SDF_VOXEL_SIZE = 0.1
+
+    # Minimum voxel size of the signed distance field
+    MIN_SDF_VOXEL_SIZE = 0.01
+
+    # Maximum voxel size of the signed distance field
+    MAX_SDF_VOXEL_SIZE = 10.0
+
+    # The number of cells of the blocks of the signed distance field along every axis
+    SDF_BLOCK_CELLS = 32
+
+    # The distance, in voxels, within which the capsules are evaluated around every block
+    SDF_BLOCK_MARGIN = 2
+
+    # Maximum number of worker processes of the signed distance field
+    MAX_SDF_WORKERS = 64
+
+    # Maximum number of worker processes of the skinning
+    MAX_SKINNING_WORKERS = 64
+
+    # The number of batches of graph partitions per skinning worker, to balance the load
+    SKINNING_BATCHES_PER_WORKER = 4
+
     # Minimum decimation ratio
     MIN_DECIMATION_RATIO = 0.001
 
@@ -0,0 +1,91 @@
+####################################################################################################
+# Copyright (c) 2019 - 2023, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+
+####################################################################################################
+# @VMVB
+####################################################################################################
+class VMVB:
+    """Constants of the binary VMVB morphology format.
+
+    The file starts with a header [MAGIC (4 bytes), VERSION, NUMBER_ARRAYS, RESERVED], all
+    unsigned 32-bit integers, followed by a table of arrays, where each entry is
+    [NAME (16 bytes), DTYPE (4 bytes), ROWS, COLUMNS, OFFSET], all unsigned 64-bit integers.
+    Every array is stored flat, in little-endian and row-major order, at its OFFSET in the file,
+    and therefore can be memory-mapped directly. The COLUMNS is zero for 1D arrays.
+
+    The simulation arrays are stored step-major (step x vertex), where each time step is
+    contiguous in the file to page in only the time steps that are visualized.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self):
+        pass
+
+    # The magic number at the beginning of the file
+    MAGIC = b'VMVB'
+
+    # The current version of the format
+    VERSION = 1
+
+    # The layout of the header
+    HEADER_FORMAT = '<4sIII'
+
+    # The layout of an entry in the arrays table
+    TABLE_ENTRY_FORMAT = '<16s4sQQQ'
+
+    # The alignment of the arrays in the file, in bytes
+    ALIGNMENT = 64
+
+    # The size of the chunks, in bytes, in which the arrays are written
+    WRITE_CHUNK_SIZE = 64 * 1024 * 1024
+
+    # Vertices, (N x 4) float32 [X, Y, Z, RADIUS], where the i-th row is the vertex (i + 1)
+    VERTICES = 'VERTICES'
+
+    # The original indices of the strands, (M) int32
+    STRANDS_INDICES = 'STRANDS_INDICES'
+
+    # The offsets of the strands in the STRANDS_VERTICES array, (M + 1) int64
+    STRANDS_OFFSETS = 'STRANDS_OFFSETS'
+
+    # The zero-based indices of the vertices of all the strands, concatenated, (K) int32
+    STRANDS_VERTICES = 'STRANDS_VERTICES'
+
+    # The links between the strands, (L x 2) int32 [PARENT, CHILD]
+    LINKS = 'LINKS'
+
+    # Radius simulation, (T x N) float32
+    SIM_RADIUS = 'SIM_RADIUS'
+
+    # Flow simulation, (T x N) float32
+    SIM_FLOW = 'SIM_FLOW'
+
+    # Pressure simulation, (T x N) float32
+    SIM_PRESSURE = 'SIM_PRESSURE'
+
+    # The statistics of the radius simulation, (T + 1) x (2 + P) float32, where the first row has
+    # the global [MINIMUM, MAXIMUM, PERCENTILES] and every other row has those of a time step
+    STAT_RADIUS = 'STAT_RADIUS'
+
+    # The statistics of the flow simulation, (T + 1) x (2 + P) float32
+    STAT_FLOW = 'STAT_FLOW'
+
+    # The statistics of the pressure simulation, (T + 1) x (2 + P) float32
+    STAT_PRESSURE = 'STAT_PRESSURE'
@@ -48,6 +48,9 @@ class Meshing:
         # Voxelization
         VOXELIZATION = 'MESHING_TECHNIQUE_VOXELIZATION'
 
+        # Signed distance field
+        SIGNED_DISTANCE = 'MESHING_TECHNIQUE_SIGNED_DISTANCE'
+
         ############################################################################################
         # @__init__
         ############################################################################################
@@ -76,6 +79,10 @@ class Meshing:
             elif argument == 'voxelization':
                 return Meshing.Technique.VOXELIZATION
 
+            # Signed distance field
+            elif argument == 'signed-distance':
+                return Meshing.Technique.SIGNED_DISTANCE
+
             # By default use piecewise-watertight
             else:
                 return Meshing.Technique.PIECEWISE_WATERTIGHT
@@ -95,6 +102,10 @@ class Meshing:
             (VOXELIZATION,
              'Voxelization',
              'Use voxelization-based remeshing to construct a watertight mesh'),
+            (SIGNED_DISTANCE,
+             'Signed Distance',
+             'Polygonizes the signed distance field of the segments to construct a watertight '
+             'mesh, without using Blender operators'),
             (META_BALLS,
              'Meta Balls',
              'Creates watertight mesh models using the meta balls algorithm. '
@@ -17,5 +17,7 @@
 
 from .loader import *
 from .morphio_loader import *
+from .morphology_cache import *
 from .vmv_loader import *
+from .vmvb_loader import *
 from .swc_loader import *
@@ -45,6 +45,10 @@ def create_morphology_reader(morphology_file_path):
     elif '.swc' in morphology_extension:
         return vmv.file.readers.SWCLoader(morphology_file=morphology_file_path)
 
+    # If it is a .vmvb file, use the VMVBReader
+    elif '.vmvb' in morphology_extension:
+        return vmv.file.readers.VMVBReader(vmvb_file=morphology_file_path)
+
     # If it is a .vmv file, use the VMVReader
     elif '.vmv' in morphology_extension:
         return vmv.file.readers.VMVReader(vmv_file=morphology_file_path)
@@ -55,3 +59,25 @@ def create_morphology_reader(morphology_file_path):
                        morphology_extension)
         return None
 
+
+####################################################################################################
+# @read_morphology_from_file
+####################################################################################################
+def read_morphology_from_file(options):
+    """Reads the morphology file given in the options, using the cache of the parsed morphologies.
+
+    :param options:
+        System options.
+    :return:
+        A tuple (loading_flag, morphology_object), where the flag is False if the morphology
+        cannot be loaded.
+    """
+
+    # Read the morphology file
+    morphology_object = vmv.file.read_morphology_with_cache(
+        file_path=options.morphology.file_path,
+        center_at_origin=options.io.center_morphology_at_origin,
+        resample_morphology=options.io.resample_morphology)
+
+    # Return the loading flag and the morphology
+    return morphology_object is not None, morphology_object
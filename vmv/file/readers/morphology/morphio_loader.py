@@ -81,115 +81,196 @@ class MorphIOLoader:
         # The number of loaded strands or segments
         self.number_loaded_strands = None
 
+        # The structure-of-arrays representation of the loaded morphology, if loaded from arrays
+        self.morphology_arrays = None
+
     ################################################################################################
-    # @read_data_from_file
+    # @read_data_from_arrays
     ################################################################################################
-    def read_data_from_file(self,
-                            center_at_origin=False):
-        """Loads the data from the given file in the constructor.
+    def read_data_from_arrays(self,
+                              morphology_data,
+                              center_at_origin=False):
+        """Constructs the sections from the flat arrays of the morphology loaded by MorphIO.
 
-        :param: center_at_origin:
+        NOTE: The points and radii are read once, and the sections are lazy views of their slices,
+        where the section ID is its position in the arrays.
+
+        :param morphology_data:
+            The morphology loaded by MorphIO.
+        :param center_at_origin:
             Centers the morphology at the origin.
         """
 
-        try:
+        import numpy
 
-            # Import the required module
-            import numpy
-            import vmv.utilities
-            import vmv.skeleton
-            import morphio.vasculature as vasculature
-            from morphio import RawDataError, VasculatureSectionType
+        # The points and the radii of all the sections
+        points = numpy.array(morphology_data.points, dtype=numpy.float32).reshape(-1, 3)
+        radii = 0.5 * numpy.asarray(morphology_data.diameters, dtype=numpy.float32)
 
-            # Ignore the console warning and output
-            vmv.utilities.disable_std_output()
+        # Compute the bounding box of the morphology
+        self.bounding_box = vmv.bbox.compute_bounding_box_for_array_of_points(points)
+        self.number_loaded_vertices = len(points)
 
-            # Load the morphology data using MorphIO
-            morphology_data = vasculature.Vasculature(self.morphology_file)
+        # Center the morphology at the origin if required by the user
+        if center_at_origin:
+            points -= numpy.array(self.bounding_box.center, dtype=numpy.float32)
+
+        # The offsets of the sections, terminated by the number of points
+        number_sections = len(morphology_data.section_types)
+        section_offsets = numpy.zeros(number_sections + 1, dtype=numpy.int64)
+        offsets = numpy.asarray(morphology_data.section_offsets, dtype=numpy.int64)
+        section_offsets[:len(offsets)] = offsets[:number_sections + 1]
+        section_offsets[number_sections] = len(points)
+
+        # The connectivity between the sections, pairs of (parent, child) IDs
+        links = numpy.asarray(morphology_data.section_connectivity, dtype=numpy.int64)
+        links = links.reshape(-1, 2)
+        parents_offsets, parents = vmv.skeleton.construct_csr_adjacency(
+            links[:, ::-1], number_sections)
+        children_offsets, children = vmv.skeleton.construct_csr_adjacency(links, number_sections)
+
+        # Construct the arrays of the morphology
+        self.morphology_arrays = vmv.skeleton.MorphologyArrays(
+            points=points, radii=radii, section_offsets=section_offsets,
+            parents_offsets=parents_offsets, parents=parents,
+            children_offsets=children_offsets, children=children)
+
+        # The sections are lazy views of the arrays
+        self.sections_list = self.morphology_arrays.get_sections_list()
+        self.number_loaded_strands = number_sections
+
+    ################################################################################################
+    # @read_data_from_sections
+    ################################################################################################
+    def read_data_from_sections(self,
+                                morphology_data,
+                                center_at_origin=False):
+        """Constructs the sections by iterating over the sections of the morphology loaded by
+        MorphIO.
+
+        :param morphology_data:
+            The morphology loaded by MorphIO.
+        :param center_at_origin:
+            Centers the morphology at the origin.
+        """
 
-            # Get a list of points using the iterator
-            points = numpy.vstack([section.points for section in morphology_data.iter()])
+        import numpy
 
-            # Get a list of all the points to compute the bounding box quickly
-            points_list = [Vector((point[0], point[1], point[2])) for point in points]
+        # Get a list of points using the iterator
+        points = numpy.vstack([section.points for section in morphology_data.iter()])
 
-            # Compute the bounding box of the morphology
-            self.bounding_box = vmv.bbox.compute_bounding_box_for_list_of_points(points_list)
+        # Get a list of all the points to compute the bounding box quickly
+        points_list = [Vector((point[0], point[1], point[2])) for point in points]
 
-            # Update the number of samples
-            self.number_loaded_vertices = copy.deepcopy(len(points_list))
+        # Compute the bounding box of the morphology
+        self.bounding_box = vmv.bbox.compute_bounding_box_for_list_of_points(points_list)
 
-            # Delete the points list
-            points_list.clear()
+        # Update the number of samples
+        self.number_loaded_vertices = copy.deepcopy(len(points_list))
 
-            # Transform the data of the morphology into a normal structure
-            sections_morphio = numpy.vstack(
-                [self.SectionMorphIO(section.id, section.points, 0.5 * section.diameters,
-                                     section.predecessors, section.successors) for section in
-                 morphology_data.iter()])
+        # Delete the points list
+        points_list.clear()
 
-            # A dictionary to keep track on the indices of the parents in the array
-            index_parent_dictionary = {}
-            for i_section, sec in enumerate(sections_morphio):
-                index_parent_dictionary[sec[0].id] = i_section
+        # Transform the data of the morphology into a normal structure
+        sections_morphio = numpy.vstack(
+            [self.SectionMorphIO(section.id, section.points, 0.5 * section.diameters,
+                                 section.predecessors, section.successors) for section in
+             morphology_data.iter()])
 
-            # Construct a list of sections to be given to the Morphology constructor
-            sections_list = list()
+        # A dictionary to keep track on the indices of the parents in the array
+        index_parent_dictionary = {}
+        for i_section, sec in enumerate(sections_morphio):
+            index_parent_dictionary[sec[0].id] = i_section
 
-            # On-a-per-section basis
-            for section_morphio in sections_morphio:
+        # Construct a list of sections to be given to the Morphology constructor
+        sections_list = list()
 
-                # Just construct the section
-                section = vmv.skeleton.Section(index=section_morphio[0].id)
+        # On-a-per-section basis
+        for section_morphio in sections_morphio:
 
-                # Build the Samples list
-                samples = list()
-                for i in range(len(section_morphio[0].points)):
+            # Just construct the section
+            section = vmv.skeleton.Section(index=section_morphio[0].id)
 
-                    # A reference to the point
-                    point = Vector((section_morphio[0].points[i][0],
-                                    section_morphio[0].points[i][1],
-                                    section_morphio[0].points[i][2]))
+            # Build the Samples list
+            samples = list()
+            for i in range(len(section_morphio[0].points)):
 
-                    # Center the morphology at the origin if required by the user
-                    if center_at_origin:
-                        point[0] -= self.bounding_box.center[0]
-                        point[1] -= self.bounding_box.center[1]
-                        point[2] -= self.bounding_box.center[2]
+                # A reference to the point
+                point = Vector((section_morphio[0].points[i][0],
+                                section_morphio[0].points[i][1],
+                                section_morphio[0].points[i][2]))
 
-                    # Build the sample
-                    sample = vmv.skeleton.Sample(point=point, radius=section_morphio[0].radii[i])
+                # Center the morphology at the origin if required by the user
+                if center_at_origin:
+                    point[0] -= self.bounding_box.center[0]
+                    point[1] -= self.bounding_box.center[1]
+                    point[2] -= self.bounding_box.center[2]
 
-                    # Add it to the samples list
-                    samples.append(sample)
+                # Build the sample
+                sample = vmv.skeleton.Sample(point=point, radius=section_morphio[0].radii[i])
 
-                # Link the samples list to the section
-                section.samples = samples
+                # Add it to the samples list
+                samples.append(sample)
 
-                # Append the section to the sections list
-                sections_list.append(section)
+            # Link the samples list to the section
+            section.samples = samples
 
-            # Updating parents and children
-            # This is only needed in case we use the ConnectedSectionsBuilder
-            for i in range(len(sections_list)):
+            # Append the section to the sections list
+            sections_list.append(section)
 
-                # Update the parents IDs
-                parents_ids = [j.id for j in sections_morphio[i][0].predecessors]
+        # Updating parents and children
+        # This is only needed in case we use the ConnectedSectionsBuilder
+        for i in range(len(sections_list)):
 
-                # Update the children IDs
-                children_ids = [k.id for k in sections_morphio[i][0].successors]
+            # Update the parents IDs
+            parents_ids = [j.id for j in sections_morphio[i][0].predecessors]
 
-                # Update the parents list
-                sections_list[i].parents = [sections_list[index_parent_dictionary[parent_id]]
-                                            for parent_id in parents_ids]
-                # Update the children list
-                sections_list[i].children = [sections_list[index_parent_dictionary[children_id]]
-                                             for children_id in children_ids]
-            # Data
-            self.sections_list = sections_list
+            # Update the children IDs
+            children_ids = [k.id for k in sections_morphio[i][0].successors]
+
+            # Update the parents list
+            sections_list[i].parents = [sections_list[index_parent_dictionary[parent_id]]
+                                        for parent_id in parents_ids]
+            # Update the children list
+            sections_list[i].children = [sections_list[index_parent_dictionary[children_id]]
+                                         for children_id in children_ids]
+        # Data
+        self.sections_list = sections_list
+
+        # Number of strands
+        self.number_loaded_strands = len(sections_list)
+
+    ################################################################################################
+    # @read_data_from_file
+    ################################################################################################
+    def read_data_from_file(self,
+                            center_at_origin=False):
+        """Loads the data from the given file in the constructor.
+
+        :param: center_at_origin:
+            Centers the morphology at the origin.
+        """
+
+        try:
+
+            # Import the required module
+            import vmv.utilities
+            import vmv.skeleton
+            import morphio.vasculature as vasculature
+            from morphio import RawDataError, VasculatureSectionType
+
+            # Ignore the console warning and output
+            vmv.utilities.disable_std_output()
+
+            # Load the morphology data using MorphIO
+            morphology_data = vasculature.Vasculature(self.morphology_file)
 
-            # Number of strands
-            self.number_loaded_strands = len(sections_list)
+            # Use the flat arrays of the morphology if they are exposed by MorphIO, otherwise
+            # iterate over the sections
+            if hasattr(morphology_data, 'section_offsets'):
+                self.read_data_from_arrays(morphology_data, center_at_origin=center_at_origin)
+            else:
+                self.read_data_from_sections(morphology_data, center_at_origin=center_at_origin)
 
             # Detect the root sections and update the list
             for section in self.sections_list:
@@ -240,7 +321,8 @@ class MorphIOLoader:
             file_path=self.morphology_file,
             number_samples=self.number_loaded_vertices,
             number_sections=self.number_loaded_strands,
-            sections_list=self.sections_list, roots=self.roots)
+            sections_list=self.sections_list, roots=self.roots,
+            arrays=None if resample_morphology else self.morphology_arrays)
 
         # Return the object
         return morphology_object
@@ -0,0 +1,291 @@
+####################################################################################################
+# Copyright (c) 2019 - 2023, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import hashlib
+import os
+import numpy
+
+# Blender imports
+import bpy
+
+# Internal imports
+import vmv
+import vmv.consts
+import vmv.file
+import vmv.skeleton
+
+
+####################################################################################################
+# @get_morphology_cache_directory
+####################################################################################################
+def get_morphology_cache_directory():
+    """Returns the directory of the morphology cache.
+
+    NOTE: The cache is opt-in, it is only enabled if its directory is set in the environment.
+
+    :return:
+        The directory of the cache, or None if the cache is disabled.
+    """
+
+    directory = os.environ.get(vmv.consts.MorphologyCache.DIRECTORY_ENVIRONMENT_VARIABLE)
+    return directory if directory else None
+
+
+####################################################################################################
+# @compute_morphology_cache_key
+####################################################################################################
+def compute_morphology_cache_key(file_path,
+                                 center_at_origin=False,
+                                 resample_morphology=False):
+    """Computes the key of a morphology in the cache from the content of its file, the version of
+    the readers and the loading options.
+
+    :param file_path:
+        The path to the morphology file.
+    :param center_at_origin:
+        If the morphology is centered at the origin.
+    :param resample_morphology:
+        If the morphology is resampled.
+    :return:
+        A hexadecimal string of the key.
+    """
+
+    key = hashlib.sha256()
+    with open(file_path, 'rb') as file_handler:
+        for chunk in iter(lambda: file_handler.read(1 << 24), b''):
+            key.update(chunk)
+    key.update(('%s:%d:%d:%d' % (os.path.splitext(file_path)[1],
+                                 vmv.consts.MorphologyCache.READERS_VERSION,
+                                 center_at_origin, resample_morphology)).encode())
+    return key.hexdigest()
+
+
+####################################################################################################
+# @evict_morphology_cache
+####################################################################################################
+def evict_morphology_cache(cache_directory,
+                           maximum_size):
+    """Removes the least recently used morphologies from the cache until its size is below a
+    given maximum size.
+
+    :param cache_directory:
+        The directory of the cache.
+    :param maximum_size:
+        The maximum size of the cache in bytes.
+    """
+
+    # The cached files, the modification time is updated whenever a file is used
+    cached_files = list()
+    for file_name in os.listdir(cache_directory):
+        if file_name.endswith(vmv.consts.MorphologyCache.EXTENSION):
+            status = os.stat(os.path.join(cache_directory, file_name))
+            cached_files.append((status.st_mtime, status.st_size, file_name))
+
+    # Remove the oldest files first
+    cache_size = sum(size for _, size, _ in cached_files)
+    for _, size, file_name in sorted(cached_files):
+        if cache_size <= maximum_size:
+            break
+        try:
+            os.remove(os.path.join(cache_directory, file_name))
+            cache_size -= size
+        except OSError:
+            pass
+
+
+####################################################################################################
+# @write_morphology_to_cache
+####################################################################################################
+def write_morphology_to_cache(morphology_object,
+                              cache_file):
+    """Writes a morphology object to a file in the cache.
+
+    :param morphology_object:
+        A given morphology object.
+    :param cache_file:
+        The path to the cached file.
+    """
+
+    # Use the arrays of the morphology if any, otherwise construct them from the sections
+    arrays = morphology_object.arrays
+    if arrays is None:
+        arrays = vmv.skeleton.construct_morphology_arrays_from_sections(
+            morphology_object.sections_list)
+
+    # The sample indices are only stored if all the samples have indices
+    cached_arrays = {
+        vmv.consts.MorphologyCache.POINTS: arrays.points,
+        vmv.consts.MorphologyCache.RADII: arrays.radii,
+        vmv.consts.MorphologyCache.SECTION_OFFSETS: arrays.section_offsets,
+        vmv.consts.MorphologyCache.SECTION_INDICES: arrays.section_indices,
+        vmv.consts.MorphologyCache.PARENTS_OFFSETS: arrays.parents_offsets,
+        vmv.consts.MorphologyCache.PARENTS: arrays.parents,
+        vmv.consts.MorphologyCache.CHILDREN_OFFSETS: arrays.children_offsets,
+        vmv.consts.MorphologyCache.CHILDREN: arrays.children}
+    if arrays.sample_indices is not None:
+        cached_arrays[vmv.consts.MorphologyCache.SAMPLE_INDICES] = arrays.sample_indices
+
+    # The positions of the roots in the sections list
+    positions = {id(section): i for i, section in enumerate(morphology_object.sections_list)}
+    cached_arrays[vmv.consts.MorphologyCache.ROOTS] = numpy.array(
+        [positions[id(root)] for root in morphology_object.roots or list()], dtype=numpy.int32)
+
+    # The meta-data
+    cached_arrays[vmv.consts.MorphologyCache.METADATA] = numpy.array(
+        [morphology_object.number_samples or 0, morphology_object.number_sections or 0,
+         morphology_object.section_connectivity_available], dtype=numpy.int64)
+
+    # The simulation data, stored step-major. The lazily-loaded data are parsed once into a
+    # step-major array, which is written as is without a copy
+    for name, data in [(vmv.consts.VMVB.SIM_RADIUS, morphology_object.radius_simulation_data),
+                       (vmv.consts.VMVB.SIM_FLOW, morphology_object.flow_simulation_data),
+                       (vmv.consts.VMVB.SIM_PRESSURE, morphology_object.pressure_simulation_data)]:
+        if isinstance(data, vmv.skeleton.SimulationData):
+            cached_arrays[name] = data.get_data()
+        elif data is not None and len(data) > 0:
+            cached_arrays[name] = numpy.asarray(data).T
+
+    # The statistics of the simulation data, computed once here from the parsed data and stored
+    # with the data
+    cached_arrays.update(vmv.file.construct_simulation_statistics_vmvb_arrays(morphology_object))
+
+    # Write to a temporary file, then rename it to avoid reading incomplete files
+    temporary_file = '%s.%d.tmp' % (cache_file, os.getpid())
+    vmv.file.write_vmvb_arrays_to_file(arrays=cached_arrays, file_path=temporary_file)
+    os.replace(temporary_file, cache_file)
+
+
+####################################################################################################
+# @read_morphology_from_cache
+####################################################################################################
+def read_morphology_from_cache(cache_file,
+                               file_path):
+    """Reads a morphology object from a file in the cache.
+
+    :param cache_file:
+        The path to the cached file.
+    :param file_path:
+        The path to the source morphology file.
+    :return:
+        A reference to the morphology object.
+    """
+
+    arrays = vmv.file.read_vmvb_arrays_table(cache_file)
+
+    # The structure-of-arrays representation of the morphology, read into memory
+    morphology_arrays = vmv.skeleton.MorphologyArrays(
+        points=numpy.array(arrays[vmv.consts.MorphologyCache.POINTS]),
+        radii=numpy.array(arrays[vmv.consts.MorphologyCache.RADII]),
+        section_offsets=arrays[vmv.consts.MorphologyCache.SECTION_OFFSETS],
+        section_indices=arrays[vmv.consts.MorphologyCache.SECTION_INDICES],
+        sample_indices=arrays.get(vmv.consts.MorphologyCache.SAMPLE_INDICES),
+        parents_offsets=arrays[vmv.consts.MorphologyCache.PARENTS_OFFSETS],
+        parents=arrays[vmv.consts.MorphologyCache.PARENTS],
+        children_offsets=arrays[vmv.consts.MorphologyCache.CHILDREN_OFFSETS],
+        children=arrays[vmv.consts.MorphologyCache.CHILDREN])
+    number_samples, number_sections, section_connectivity_available = \
+        arrays[vmv.consts.MorphologyCache.METADATA].tolist()
+
+    # The simulation data remain mapped, the transposed views are indexed (vertex x step)
+    simulation_data = [arrays[name].T if name in arrays else None for name in
+                       (vmv.consts.VMVB.SIM_RADIUS, vmv.consts.VMVB.SIM_FLOW,
+                        vmv.consts.VMVB.SIM_PRESSURE)]
+    if simulation_data[0] is not None:
+        bpy.context.scene.VMV_RadiusVariationsSteps = simulation_data[0].shape[1]
+    simulation_statistics = vmv.file.read_simulation_statistics_from_vmvb_arrays(arrays)
+
+    # Construct the morphology object
+    sections_list = morphology_arrays.get_sections_list()
+    return vmv.skeleton.Morphology(
+        name=vmv.file.ops.get_file_name_from_path(file_path),
+        file_path=file_path,
+        number_samples=number_samples,
+        number_sections=number_sections,
+        sections_list=sections_list,
+        roots=[sections_list[i] for i in
+               arrays[vmv.consts.MorphologyCache.ROOTS].tolist()],
+        section_connectivity_available=bool(section_connectivity_available),
+        radius_simulation_data=simulation_data[0],
+        flow_simulation_data=simulation_data[1],
+        pressure_simulation_data=simulation_data[2],
+        arrays=morphology_arrays,
+        radius_simulation_statistics=simulation_statistics[0],
+        flow_simulation_statistics=simulation_statistics[1],
+        pressure_simulation_statistics=simulation_statistics[2])
+
+
+####################################################################################################
+# @read_morphology_with_cache
+####################################################################################################
+def read_morphology_with_cache(file_path,
+                               center_at_origin=False,
+                               resample_morphology=False):
+    """Reads a morphology from the cache if it was loaded before with the same options, otherwise
+    reads it from its file and adds it to the cache.
+
+    :param file_path:
+        The path to the morphology file.
+    :param center_at_origin:
+        Center the morphology at the origin.
+    :param resample_morphology:
+        Resample the morphology.
+    :return:
+        A reference to the morphology object, or None if the file cannot be read.
+    """
+
+    # The cache
+    cache_directory = get_morphology_cache_directory()
+    cache_file = None
+    if cache_directory is not None:
+        try:
+            os.makedirs(cache_directory, exist_ok=True)
+            cache_file = os.path.join(cache_directory, '%s%s' % (
+                compute_morphology_cache_key(file_path, center_at_origin, resample_morphology),
+                vmv.consts.MorphologyCache.EXTENSION))
+        except OSError:
+            vmv.logger.info('The morphology cache [%s] is not accessible' % cache_directory)
+
+    # Load the morphology from the cache, and mark it as recently used
+    if cache_file is not None and os.path.exists(cache_file):
+        try:
+            morphology_object = read_morphology_from_cache(cache_file, file_path)
+            os.utime(cache_file)
+            vmv.logger.info('Morphology loaded from the cache [%s]' % cache_file)
+            return morphology_object
+        except (OSError, ValueError, KeyError):
+            vmv.logger.info('Invalid cached morphology [%s], reloading' % cache_file)
+
+    # Otherwise, read the file
+    morphology_reader = vmv.file.create_morphology_reader(file_path)
+    if morphology_reader is None:
+        return None
+    morphology_object = morphology_reader.construct_morphology_object(
+        center_at_origin=center_at_origin, resample_morphology=resample_morphology)
+
+    # Add the morphology to the cache, and evict the least recently used ones if needed
+    if cache_file is not None:
+        try:
+            write_morphology_to_cache(morphology_object, cache_file)
+            evict_morphology_cache(cache_directory, int(os.environ.get(
+                vmv.consts.MorphologyCache.MAXIMUM_SIZE_ENVIRONMENT_VARIABLE,
+                vmv.consts.MorphologyCache.DEFAULT_MAXIMUM_SIZE)))
+        except OSError:
+            vmv.logger.info('Cannot write the morphology to the cache [%s]' % cache_directory)
+
+    # Return the morphology object
+    return morphology_object
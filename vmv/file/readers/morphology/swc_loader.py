@@ -197,44 +197,26 @@ class SWCLoader:
         morphology.
         """
 
-        for path in self.paths:
-
-            # A list of all the samples located along the path
-            samples_located_along_path = list()
+        # A set of the terminal samples for constant-time lookups
+        terminal_samples_indices = set(self.sections_terminal_samples_indices)
 
-            # Get the list
-            for sample_index in self.sections_terminal_samples_indices:
+        for path in self.paths:
 
-                # If the sample index exists in the path
-                if sample_index in path:
-                    # Append it to the list
-                    samples_located_along_path.append(sample_index)
+            # The position of the first occurrence of every sample index along the path
+            positions = dict()
+            for i, sample_index in enumerate(path):
+                positions.setdefault(sample_index, i)
 
-            # Order the list
-            samples_located_along_path = sorted(samples_located_along_path)
+            # An ordered list of all the terminal samples located along the path
+            samples_located_along_path = sorted(
+                sample_index for sample_index in positions
+                if sample_index in terminal_samples_indices)
 
-            # Build the sections
+            # Build the sections, every section spans the path between two consecutive terminals
             for i in range(0, len(samples_located_along_path) - 1):
-
-                # A list of the section indices
-                section_indices = list()
-
-                # Get the first index along the section
-                first_sample = samples_located_along_path[i]
-
-                # Get the last index along the section
-                last_sample = samples_located_along_path[i + 1]
-
-                # Get the index of the first sample
-                first_sample_index = path.index(first_sample)
-
-                # Get the index of the last sample
-                last_sample_index = path.index(last_sample)
-
-                for j in range(first_sample_index, last_sample_index + 1):
-                    section_indices.append(path[j])
-
-                self.sections_samples_indices_list.append(section_indices)
+                self.sections_samples_indices_list.append(
+                    path[positions[samples_located_along_path[i]]:
+                         positions[samples_located_along_path[i + 1]] + 1])
 
     ################################################################################################
     # @read_samples
@@ -531,8 +513,7 @@ class SWCLoader:
             section.type = arbor_type
 
         # Updates the sections parenting
-        for section in sections_list:
-            vmv.skeleton.ops.update_section_parenting(section, sections_list)
+        vmv.skeleton.ops.update_sections_parenting(sections_list)
 
         # Return a list of sections
         return sections_list
@@ -15,9 +15,13 @@
 # If not, see <http://www.gnu.org/licenses/>.
 ####################################################################################################
 
+# System imports
+import mmap
+import tempfile
+import numpy
+
 # Blender imports
 import bpy
-from mathutils import Vector
 
 # Internal imports
 import vmv
@@ -25,6 +29,7 @@ import vmv.bbox
 import vmv.consts
 import vmv.file
 import vmv.skeleton
+import vmv.utilities
 
 
 ####################################################################################################
@@ -64,12 +69,15 @@ class VMVReader:
         # The number of loaded strands or sections
         self.number_loaded_strands = None
 
-        # A list containing all the points of the morphology in a Cartesian format(X, Y, Z)
+        # An array containing all the points of the morphology in a Cartesian format(X, Y, Z)
         self.points_list = None
 
-        # A list containing all the radii of the morphology
+        # An array containing all the radii of the morphology
         self.radii_list = None
 
+        # An array containing the indices of all the points of the morphology
+        self.indices_list = None
+
         # A list of all the sections that were extracted from the loaded data, input to VMV
         self.sections_list = list()
 
@@ -79,9 +87,12 @@ class VMVReader:
         # Number of steps for radius simulation, if existing
         self.radius_simulation_steps = 0
 
-        #
+        # Radius simulation data, (vertex x step) values loaded lazily on the first access
         self.radius_simulation_data = None
 
+        # The range of the radius simulation block in the file
+        self.radius_simulation_block = None
+
         # Number of steps for flow simulation, if existing
         self.flow_simulation_steps = 0
 
@@ -93,38 +104,40 @@ class VMVReader:
     ################################################################################################
     def build_graph_from_parsed_data(self):
         """Builds the graph from the parsed data.
+
+        NOTE: Two sections are linked if the last sample of one of them is the first sample of the
+        other one. The terminal samples of all the sections are indexed by their sample index
+        in dictionaries, and therefore the graph is built in linear time w.r.t the number of
+        strands instead of comparing every section against every other one.
         """
 
-        self.sections_list = set(self.sections_list)
+        # A dictionary mapping the index of a sample to the sections starting with it
+        sections_starting_at_sample = dict()
 
-        # Build the graph from the connectivity list
-        for i_section in range(len(self.sections_list)):
+        # A dictionary mapping the index of a sample to the sections ending with it
+        sections_ending_at_sample = dict()
 
-            # The index of the first sample on the section
-            i_first_sample_index = self.sections_list[i_section].samples[0].index
+        # Index the terminal samples of all the sections, keeping the order of the sections
+        for section in self.sections_list:
+            sections_starting_at_sample.setdefault(section.samples[0].index, list()).append(section)
+            sections_ending_at_sample.setdefault(section.samples[-1].index, list()).append(section)
 
-            # The index of the last sample on the section
-            i_last_sample_index = self.sections_list[i_section].samples[-1].index
+        # Build the graph from the connectivity tables
+        for section in self.sections_list:
 
-            for j_section in range(len(self.sections_list)):
+            # The parents are the sections ending with the first sample of the section
+            for parent in sections_ending_at_sample.get(section.samples[0].index, list()):
 
                 # Parenting of the same section is not valid, indeed
-                if i_section == j_section:
-                    continue
-
-                # The index of the first sample on the section
-                j_first_sample_index = self.sections_list[j_section].samples[0].index
-
-                # The index of the last sample on the section
-                j_last_sample_index = self.sections_list[j_section].samples[-1].index
+                if parent is not section:
+                    section.parents.append(parent)
 
-                # J is parent to I
-                if i_first_sample_index == j_last_sample_index:
-                    self.sections_list[i_section].parents.append(self.sections_list[j_section])
+            # The children are the sections starting with the last sample of the section
+            for child in sections_starting_at_sample.get(section.samples[-1].index, list()):
 
-                # J is a child of I
-                if i_last_sample_index == j_first_sample_index:
-                    self.sections_list[i_section].children.append(self.sections_list[j_section])
+                # Parenting of the same section is not valid, indeed
+                if child is not section:
+                    section.children.append(child)
 
         # Detect the root sections and update the list
         for section in self.sections_list:
@@ -135,97 +148,181 @@ class VMVReader:
     # @load_data_from_file
     ################################################################################################
     def load_data_from_file(self):
-        """Only loads the data from the given morphology file, silently.
+        """Maps the morphology file into memory and locates all its data blocks in a single pass,
+        silently.
+
+        NOTE: A data block is the content between two tags, $NAME_BEGIN and $NAME_END. Only the
+        tags are searched for, and therefore the content of the blocks is not tokenized here.
 
         :return
-            Returns the loaded data from the file in the form of a list that is easier to index.
+            A tuple of the memory-mapped file and a dictionary that maps the name of every block
+            (for example, VERT_LIST) to the range (begin, end) of its content in the file.
         """
 
-        # Open the morphology file
-        file_handler = open(self.morphology_file, 'r')
+        # Map the morphology file into memory
+        with open(self.morphology_file, 'rb') as file_handler:
+            data = mmap.mmap(file_handler.fileno(), 0, access=mmap.ACCESS_READ)
 
-        # Load the file into a LIST where it would make it easier to search and index
-        data = list()
+        # The ranges of the located blocks, and the beginnings of the blocks being located
+        blocks = dict()
+        beginnings = dict()
 
-        # Get the data sizes from the file
-        for line in file_handler:
+        # The position of the first tag, where every tag starts with a '$' at a new line
+        position = 0
+        if data[:1] != b'$':
+            position = data.find(b'\n$')
+            position = position + 1 if position != -1 else -1
 
-            # Ignore comments
-            if '#' in line:
-                continue
+        # Locate all the tags
+        while position != -1:
 
-            # Ignore empty lines
-            if not line.strip():
-                continue
+            # Get the tag name
+            end_of_line = data.find(b'\n', position)
+            if end_of_line == -1:
+                end_of_line = len(data)
+            tag = data[position + 1:end_of_line].strip().decode()
 
-            # Replace multiple spaces with a single space
-            line = ' '.join(line.split())
+            # Beginning of a block, the content starts after the tag line
+            if tag.endswith('_BEGIN'):
+                beginnings[tag[:-len('_BEGIN')]] = end_of_line + 1
 
-            # Replace the '\n' with empty
-            line = line.replace('\n', '')
+            # End of a block, the content ends before the tag line
+            elif tag.endswith('_END') and tag[:-len('_END')] in beginnings:
+                blocks[tag[:-len('_END')]] = (beginnings[tag[:-len('_END')]], position)
 
-            # # Add the filtered line to the data list, if it is not an empty line
-            if len(line) > 0:
-                data.append(line)
+            # The next tag
+            position = data.find(b'\n$', end_of_line)
+            position = position + 1 if position != -1 else -1
 
-        # Close the file
-        file_handler.close()
+        # Return a reference to the data and the blocks
+        return data, blocks
 
-        # Return a reference to the data
-        return data
+    ################################################################################################
+    # @get_block_lines
+    ################################################################################################
+    @staticmethod
+    def get_block_lines(data,
+                        blocks,
+                        name):
+        """Gets the non-empty lines of a given data block, ignoring the comments.
+
+        :param data:
+            The memory-mapped morphology file.
+        :param blocks:
+            A dictionary of the ranges of the data blocks in the file.
+        :param name:
+            The name of the block.
+        :return:
+            A list of the lines of the block.
+        """
+
+        # If the block does not exist, return an empty list
+        if name not in blocks:
+            return list()
+
+        # Get the lines, ignoring the empty lines and comments
+        begin, end = blocks[name]
+        return [line for line in data[begin:end].decode().splitlines()
+                if line.strip() and '#' not in line]
+
+    ################################################################################################
+    # @parse_numeric_block
+    ################################################################################################
+    @staticmethod
+    def parse_numeric_block(data,
+                            blocks,
+                            name):
+        """Parses a block of numbers, where each line has the same number of columns, into a 2D
+        array in bulk.
+
+        :param data:
+            The memory-mapped morphology file.
+        :param blocks:
+            A dictionary of the ranges of the data blocks in the file.
+        :param name:
+            The name of the block.
+        :return:
+            A 2D numpy array with a row per line, or None if the block does not exist.
+        """
+
+        # If the block does not exist, return None
+        if name not in blocks:
+            return None
+
+        # Get the content of the block
+        begin, end = blocks[name]
+        content = data[begin:end]
+
+        # Remove the comments, if any
+        if b'#' in content:
+            content = b'\n'.join([line for line in content.splitlines() if b'#' not in line])
+
+        # Get the number of columns from the first non-empty line
+        number_columns = 0
+        position = 0
+        while number_columns == 0 and position < len(content):
+            end_of_line = content.find(b'\n', position)
+            if end_of_line == -1:
+                end_of_line = len(content)
+            number_columns = len(content[position:end_of_line].split())
+            position = end_of_line + 1
+
+        # An empty block
+        if number_columns == 0:
+            return numpy.zeros((0, 0))
+
+        # Convert the entire block at once
+        values = numpy.fromstring(content, sep=' ')
+
+        # The lines must have the same number of columns
+        if len(values) % number_columns != 0:
+            vmv.logger.info('The block [%s] has rows with different number of columns' % name)
+            return None
+
+        # Return the data as a 2D array
+        return values.reshape(-1, number_columns)
 
     ################################################################################################
     # @verify_morphology_structure
     ################################################################################################
     def verify_morphology_structure(self,
-                                    data):
+                                    data,
+                                    blocks):
         """Verifies the structure of the morphology file.
 
-        :param:
-            Loaded data list that contains all the elements of the morphology.
+        :param data:
+            The memory-mapped morphology file.
+        :param blocks:
+            A dictionary of the ranges of the data blocks in the file.
         """
 
         # Make sure that the data has all the mandatory fields
-        if '$PARAM_BEGIN' in data and '$PARAM_END' in data and \
-           '$VERT_LIST_BEGIN' in data and '$VERT_LIST_END' in data:
+        if 'PARAM' in blocks and 'VERT_LIST' in blocks:
             vmv.logger.info('Data set is valid')
         else:
             vmv.logger.info('Data set is NOT valid')
 
+        # Parse the parameters
+        parameters = dict()
+        for line in self.get_block_lines(data=data, blocks=blocks, name='PARAM'):
+            item = line.split()
+            if len(item) > 1 and item[0] not in parameters:
+                parameters[item[0]] = int(item[1])
+
         # Get the number of vertices
-        for item in data:
-            if 'NUM_VERTS' in item:
-                item = item.split(' ')
-                self.number_loaded_vertices = int(item[1])
-                break
+        self.number_loaded_vertices = parameters.get('NUM_VERTS', self.number_loaded_vertices)
 
         # Get the number of strands
-        for item in data:
-            if 'NUM_STRANDS' in item:
-                item = item.split(' ')
-                self.number_loaded_strands = int(item[1])
-                break
+        self.number_loaded_strands = parameters.get('NUM_STRANDS', self.number_loaded_strands)
 
         # Radius simulation time steps
-        for item in data:
-            if 'RADIUS_SIMULATION_TIME_STEPS' in item:
-                item = item.split(' ')
-                self.radius_simulation_steps = int(item[1])
-                break
+        self.radius_simulation_steps = parameters.get('RADIUS_SIMULATION_TIME_STEPS', 0)
 
         # Flow simulation time steps
-        for item in data:
-            if 'FLOW_SIMULATION_TIME_STEPS' in item:
-                item = item.split(' ')
-                self.flow_simulation_steps = int(item[1])
-                break
+        self.flow_simulation_steps = parameters.get('FLOW_SIMULATION_TIME_STEPS', 0)
 
         # Pressure simulation time steps
-        for item in data:
-            if 'PRESSURE_SIMULATION_TIME_STEPS' in item:
-                item = item.split(' ')
-                self.pressure_simulation_steps = int(item[1])
-                break
+        self.pressure_simulation_steps = parameters.get('PRESSURE_SIMULATION_TIME_STEPS', 0)
 
         # Log
         vmv.logger.info('Morphology contains [%d] vertices, [%d] strands' %
@@ -254,61 +351,32 @@ class VMVReader:
     # @parse_vertices
     ################################################################################################
     def parse_vertices(self,
-                       data):
+                       data,
+                       blocks):
         """Parses the vertices from the VMV file.
 
         :param data:
-            Input data table that contains all the data of the morphology, where we will extract
-            the vertex information.
+            The memory-mapped morphology file.
+        :param blocks:
+            A dictionary of the ranges of the data blocks in the file.
         """
 
-        # Read the vertices by getting the index of the $VERT_LIST_BEGIN tag
-        starting_vertex_index = 0
-
-        # Iterate over evert element in the data list
-        for item in data:
-
-            # If the '$VERT_LIST_BEGIN' is there, voila!
-            if '$VERT_LIST_BEGIN' in item:
+        # Parse the vertex list in bulk, each row is [INDEX X Y Z RADIUS ...]
+        vertices = self.parse_numeric_block(data=data, blocks=blocks, name='VERT_LIST')
+        if vertices is None or len(vertices) == 0:
+            vertices = numpy.zeros((0, 5))
 
-                # Further increment to jump directly to the actual starting index and break
-                starting_vertex_index += 1
-                break
+        # Only consider the vertices reported in the header
+        vertices = vertices[:self.number_loaded_vertices]
 
-            # Increment the vertex index
-            starting_vertex_index += 1
+        # The indices of the vertices
+        self.indices_list = vertices[:, 0].astype(int)
 
-        # End vertex index, by adding the total number of loaded vertices
-        end_vertex_index = starting_vertex_index + self.number_loaded_vertices
+        # The points of the vertices in a Cartesian format (X, Y, Z)
+        self.points_list = vertices[:, 1:4]
 
-        # Initialize the point list, originally None
-        self.points_list = list()
-
-        # Initialize the radii list, originally None
-        self.radii_list = list()
-
-        # Iterate on the data list only within the vertex indices
-        for i in range(starting_vertex_index, end_vertex_index):
-
-            # Split the entry
-            vertex_entry = data[i].split(' ')
-
-            # Vertex index
-            index = int(vertex_entry[0])
-
-            # Vertex coordinates
-            x = float(vertex_entry[1])
-            y = float(vertex_entry[2])
-            z = float(vertex_entry[3])
-
-            # Vertex radius
-            radius = float(vertex_entry[4])
-
-            # Add this point to the points list with the position and radius
-            self.points_list.append([x, y, z, index])
-
-            # Radii
-            self.radii_list.append(radius)
+        # The radii of the vertices
+        self.radii_list = vertices[:, 4]
 
         # Update the meta-data
         self.number_loaded_vertices = len(self.points_list)
@@ -317,65 +385,52 @@ class VMVReader:
     # @parse_strands
     ################################################################################################
     def parse_strands(self,
-                      data):
+                      data,
+                      blocks,
+                      center_at_origin=False):
         """Parses the strands or sections of the vascular morphology from the VMV file.
 
         :param data:
-            Input data table that contains all the data of the morphology, where we will extract
-            the sections information.
+            The memory-mapped morphology file.
+        :param blocks:
+            A dictionary of the ranges of the data blocks in the file.
+        :param center_at_origin:
+            Center the samples at the origin, requires the bounding box.
         """
 
-        # Read the strands by getting the index of the STRANDS_LIST_BEGIN tag
-        starting_strand_index = 0
+        # The points of the vertices, centered once rather than per sample
+        points = self.points_list
+        if center_at_origin:
+            points = points - numpy.array(self.bounding_box.center[:])
 
-        # Iterate over evert element in the data list
-        for item in data:
+        # Python lists are much faster to index per sample than numpy arrays. The samples of a
+        # vertex share a tuple of its coordinates, and create their Vector only when accessed
+        points = list(map(tuple, points.tolist()))
+        radii = self.radii_list.tolist()
+        indices = self.indices_list.tolist()
 
-            # If the '$STRANDS_LIST_BEGIN' is there, voila!
-            if '$STRANDS_LIST_BEGIN' in item:
-
-                # Further increment to jump directly to the actual starting index and break
-                starting_strand_index += 1
-                break
-
-            # Increment the vertex index
-            starting_strand_index += 1
-
-        # End strand index
-        end_strand_index = starting_strand_index + self.number_loaded_strands
-
-        # Iterate on the data list only within the strand indices
-        for i in range(starting_strand_index, end_strand_index):
-
-            #import random
-            #value = random.uniform(0, 1.0)
-            #if value > 0.10:
-            #    continue
+        # Iterate on the strands
+        strands = self.get_block_lines(data=data, blocks=blocks, name='STRANDS_LIST')
+        for line in strands[:self.number_loaded_strands]:
 
             # Split the entry
-            strand_entry = data[i].split(' ')
+            strand_entry = line.split()
 
             # Get the index
             strand_index = int(strand_entry[0])
 
-            # Remove the item at the first index that accounts for the strand index to end up
-            # with the list of points along the strand
-            strand_entry.remove(strand_entry[0])
-
-            # Construct the samples list along the strand
+            # Construct the samples list along the strand, the rest of the entry is the list of
+            # points along the strand
             samples_list = list()
-            for i_point in strand_entry:
-
-                # Get the point
-                point = self.points_list[int(i_point) - 1]
+            for i_point in strand_entry[1:]:
 
-                # Radius
-                radius = self.radii_list[int(i_point) - 1]
+                # Get the index of the point in the vertex list
+                i = int(i_point) - 1
 
                 # Construct a sample
-                sample = vmv.skeleton.Sample(point=Vector((point[0], point[1], point[2])),
-                                             radius=radius,
-                                             index=point[3])
+                sample = vmv.skeleton.Sample(point=points[i],
+                                             radius=radii[i],
+                                             index=indices[i])
 
                 # Add the sample to the samples list
                 samples_list.append(sample)
@@ -393,61 +448,101 @@ class VMVReader:
     # @parse_radius_simulation_data
     ################################################################################################
     def parse_radius_simulation_data(self,
-                                     data):
+                                     data,
+                                     blocks):
         """Note that the radius variation data will have N time frames and M data points, where M
         is the number of samples or vertices in the morphology.
         The simulation data is always stored on a per-sample or per-vertex basis.
+
+        :param data:
+            The memory-mapped morphology file.
+        :param blocks:
+            A dictionary of the ranges of the data blocks in the file.
         """
 
         # If the simulation time steps are greater than zero
         if self.radius_simulation_steps > 0:
 
-            # Read the simulation data by getting the index of the $RADIUS_SIMULATION_BEGIN tag
-            starting_index = 0
+            # The number of time steps is the number of columns of the first line in the block
+            number_steps = 0
+            if 'RADIUS_SIMULATION' in blocks:
+                begin, end = blocks['RADIUS_SIMULATION']
+                while number_steps == 0 and begin < end:
+                    end_of_line = data.find(b'\n', begin, end)
+                    if end_of_line == -1:
+                        end_of_line = end
+                    if b'#' not in data[begin:end_of_line]:
+                        number_steps = len(data[begin:end_of_line].split())
+                    begin = end_of_line + 1
+
+            # If there is no simulation data, set the number of simulation steps to zero
+            if number_steps == 0:
+                self.radius_simulation_steps = 0
+                return
 
-            # Iterate over evert element in the data list
-            for item in data:
+            # The data is only parsed when the time steps are accessed, only for the loaded vertices
+            self.radius_simulation_block = blocks['RADIUS_SIMULATION']
+            self.radius_simulation_data = vmv.skeleton.SimulationData(
+                number_vertices=self.number_loaded_vertices, number_steps=number_steps,
+                load_data=self.load_radius_simulation_data)
 
-                # If the '$RADIUS_SIMULATION_BEGIN' is there, voila!
-                if '$RADIUS_SIMULATION_BEGIN' in item:
+            bpy.context.scene.VMV_RadiusVariationsSteps = number_steps
 
-                    # Further increment to jump directly to the actual starting index and break
-                    starting_index += 1
-                    break
+    ################################################################################################
+    # @load_radius_simulation_data
+    ################################################################################################
+    def load_radius_simulation_data(self):
+        """Loads all the time steps of the radius simulation data from the file.
 
-                    # Increment the vertex index
-                starting_index += 1
+        NOTE: The block is parsed once, in batches of lines to keep the memory bounded, into a
+        step-major scratch memory-mapped file that is removed when the data are released, so any
+        range of time steps is then read from this file without parsing the block again.
 
-            # If the starting index is still zero, then there is no simulation data
-            if starting_index == 0:
+        :return:
+            A (step x vertex) float32 memory-mapped array of the radii of all the loaded vertices.
+        """
 
-                # Set the number of simulation steps to zero
-                self.radius_simulation_steps = 0
+        number_steps = self.radius_simulation_data.shape[1]
 
-                # Return
-                return
+        # The scratch file is unlinked once closed, the mapping keeps it alive until released
+        with tempfile.TemporaryFile(prefix='vmv-radius-simulation-') as scratch_file:
+            radii = numpy.memmap(scratch_file, dtype=numpy.float32, mode='w+',
+                                 shape=(number_steps, max(1, self.number_loaded_vertices)))
+        radii = radii[:, :self.number_loaded_vertices]
 
-            # End vertex index, by adding the total number of loaded vertices
-            end_index = starting_index + self.number_loaded_vertices
+        with open(self.morphology_file, 'rb') as file_handler:
+            data = mmap.mmap(file_handler.fileno(), 0, access=mmap.ACCESS_READ)
 
-            # Initialize the simulation data list, originally None
-            self.radius_simulation_data = list()
+            # Parse the block in batches that end at the end of a line
+            begin, block_end = self.radius_simulation_block
+            row = 0
+            while begin < block_end and row < self.number_loaded_vertices:
+                batch_end = data.find(b'\n', min(begin + (1 << 25), block_end), block_end)
+                batch_end = block_end if batch_end == -1 else batch_end + 1
+                content = data[begin:batch_end]
+                begin = batch_end
 
-            # Iterate on the data list only within the vertex indices
-            for i in range(starting_index, end_index):
+                # Remove the comments, if any
+                if b'#' in content:
+                    content = b'\n'.join(
+                        [line for line in content.splitlines() if b'#' not in line])
 
-                # Split the entry, at a specific vertex
-                vertex_entry = data[i].split(' ')
+                # The lines must have the same number of columns
+                values = numpy.fromstring(content, sep=' ')
+                if len(values) % number_steps != 0:
+                    data.close()
+                    raise ValueError('The radius simulation has rows with different number of '
+                                     'time steps')
 
-                # Convert the string list to a float
-                for j in range(len(vertex_entry)):
-                    value = float(vertex_entry[j])
-                    vertex_entry[j] = value
+                # Write the rows of the batch into the columns of the step-major array
+                values = values.reshape(-1, number_steps)[:self.number_loaded_vertices - row]
+                radii[:, row:row + len(values)] = values.T
+                row += len(values)
 
-                # Add the list to the simulation table
-                self.radius_simulation_data.append(vertex_entry)
+            data.close()
 
-            bpy.context.scene.VMV_RadiusVariationsSteps = len(self.radius_simulation_data[0])
+        # Return all the time steps, step-major
+        return radii
 
     ################################################################################################
     # @read_data_from_file
@@ -464,27 +559,27 @@ class VMVReader:
         # TODO: Propagate this error to the interface
         try:
 
-            # Load the data from the file
-            data = self.load_data_from_file()
+            # Locate the data blocks in the file
+            data, blocks = self.load_data_from_file()
 
             # Verify the morphology structure to avoid issues later during the visualization
-            self.verify_morphology_structure(data=data)
+            self.verify_morphology_structure(data=data, blocks=blocks)
 
             # Parse the vertices, or samples
-            self.parse_vertices(data=data)
+            self.parse_vertices(data=data, blocks=blocks)
+
+            # Compute the bounding box of the morphology
+            self.bounding_box = vmv.bbox.compute_bounding_box_for_array_of_points(
+                self.points_list)
 
-            # Parse the strands or the sections
-            self.parse_strands(data=data)
+            # Parse the strands or the sections, centered at the origin if required by the user
+            self.parse_strands(data=data, blocks=blocks, center_at_origin=center_at_origin)
 
             # Radius simulation data
-            self.parse_radius_simulation_data(data=data)
-
-            # Compute the bounding box of the morphology
-            self.bounding_box = vmv.bbox.compute_bounding_box_for_list_of_points(self.points_list)
+            self.parse_radius_simulation_data(data=data, blocks=blocks)
 
-            # Center the morphology at the origin if required by the user
-            if center_at_origin:
-                self.center_morphology_at_origin()
+            # Close the file
+            data.close()
 
         # Raise an exception if we cannot import the h5py module
         except ImportError:
@@ -492,20 +587,6 @@ class VMVReader:
             print('ERROR: Cannot read the file [%s]' % self.morphology_file)
             exit(0)
 
-    ################################################################################################
-    # @center_morphology_at_origin
-    ################################################################################################
-    def center_morphology_at_origin(self):
-        """Centers the morphology at the origin.
-        """
-
-        # Center each point in the points list
-        for section in self.sections_list:
-            for sample in section.samples:
-                sample.point[0] -= self.bounding_box.center[0]
-                sample.point[1] -= self.bounding_box.center[1]
-                sample.point[2] -= self.bounding_box.center[2]
-
     ################################################################################################
     # @load_morphology_file
     ################################################################################################
@@ -525,7 +606,12 @@ class VMVReader:
         self.read_data_from_file(center_at_origin=center_at_origin)
 
         # Build the graph from the parsed data
-        # self.build_graph_from_parsed_data()
+        timer = vmv.utilities.Timer()
+        timer.start()
+        self.build_graph_from_parsed_data()
+        timer.end()
+        vmv.logger.info('Graph of [%d] strands built in [%f] seconds' %
+                        (self.number_loaded_strands, timer.duration()))
 
         # Resample the morphology skeleton if required
         if resample_morphology:
@@ -565,6 +651,7 @@ class VMVReader:
             number_sections=self.number_loaded_strands,
             sections_list=self.sections_list,
             roots=self.roots,
+            section_connectivity_available=True,
             radius_simulation_data=self.radius_simulation_data)
 
         # Return the object
@@ -0,0 +1,260 @@
+####################################################################################################
+# Copyright (c) 2019 - 2023, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import struct
+import numpy
+
+# Blender imports
+import bpy
+
+# Internal imports
+import vmv
+import vmv.bbox
+import vmv.consts
+import vmv.file
+import vmv.skeleton
+
+
+####################################################################################################
+# @read_vmvb_arrays_table
+####################################################################################################
+def read_vmvb_arrays_table(vmvb_file):
+    """Reads the table of arrays of a VMVB file and memory-maps all the arrays.
+
+    NOTE: Mapping the arrays does not read them, the operating system only pages in the parts
+    of the arrays that are accessed later.
+
+    :param vmvb_file:
+        A given .vmvb file.
+    :return:
+        A dictionary mapping the name of every array in the file to a read-only numpy.memmap.
+    """
+
+    # Read the header and the table
+    with open(vmvb_file, 'rb') as file_handler:
+        header = file_handler.read(struct.calcsize(vmv.consts.VMVB.HEADER_FORMAT))
+        magic, version, number_arrays, _ = struct.unpack(vmv.consts.VMVB.HEADER_FORMAT, header)
+
+        # Verify the file
+        if magic != vmv.consts.VMVB.MAGIC or version > vmv.consts.VMVB.VERSION:
+            raise ValueError('[%s] is not a valid VMVB file' % vmvb_file)
+
+        entry_size = struct.calcsize(vmv.consts.VMVB.TABLE_ENTRY_FORMAT)
+        table = [struct.unpack(vmv.consts.VMVB.TABLE_ENTRY_FORMAT, file_handler.read(entry_size))
+                 for _ in range(number_arrays)]
+
+    # Map the arrays
+    arrays = dict()
+    for name, dtype, rows, columns, offset in table:
+        shape = (rows, columns) if columns > 0 else (rows,)
+        name = name.rstrip(b'\0').decode()
+        if rows == 0:
+            arrays[name] = numpy.zeros(shape, dtype=dtype.rstrip(b'\0').decode())
+        else:
+            arrays[name] = numpy.memmap(vmvb_file, dtype=dtype.rstrip(b'\0').decode(), mode='r',
+                                        offset=offset, shape=shape)
+
+    # Return the arrays
+    return arrays
+
+
+####################################################################################################
+# @read_simulation_statistics_from_vmvb_arrays
+####################################################################################################
+def read_simulation_statistics_from_vmvb_arrays(arrays):
+    """Reads the statistics of the radius, flow and pressure simulations from the arrays of a
+    VMVB file, if they are stored in the file.
+
+    :param arrays:
+        A dictionary mapping the name of every array in the file to a numpy array.
+    :return:
+        A list of the radius, flow and pressure @SimulationStatistics, where the statistics that
+        are not stored in the file are None.
+    """
+
+    return [vmv.skeleton.SimulationStatistics.from_array(arrays[name]) if name in arrays else None
+            for name in (vmv.consts.VMVB.STAT_RADIUS, vmv.consts.VMVB.STAT_FLOW,
+                         vmv.consts.VMVB.STAT_PRESSURE)]
+
+
+####################################################################################################
+# @VMVBReader
+####################################################################################################
+class VMVBReader:
+    """A reader for the binary .VMVB files, where all the arrays are memory-mapped.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 vmvb_file):
+        """Constructor
+
+        :param vmvb_file:
+            A given .vmvb morphology file.
+        """
+
+        # Set the path to the given vmvb file
+        self.morphology_file = vmvb_file
+
+        # Morphology bounding box, initially None, till being computed
+        self.bounding_box = None
+
+        # Graph roots
+        self.roots = list()
+
+        # The number of loaded vertices or samples
+        self.number_loaded_vertices = None
+
+        # The number of loaded strands or sections
+        self.number_loaded_strands = None
+
+        # A list of all the sections that were extracted from the loaded data, input to VMV
+        self.sections_list = list()
+
+        # The structure-of-arrays representation of the loaded morphology
+        self.morphology_arrays = None
+
+        # If the links between the strands are stored in the file
+        self.section_connectivity_available = False
+
+        # Radius simulation data, (vertex x step) view of the memory-mapped array, if existing
+        self.radius_simulation_data = None
+
+        # Flow simulation data, (vertex x step) view of the memory-mapped array, if existing
+        self.flow_simulation_data = None
+
+        # Pressure simulation data, (vertex x step) view of the memory-mapped array, if existing
+        self.pressure_simulation_data = None
+
+        # The statistics of the radius, flow and pressure simulations, if stored in the file
+        self.simulation_statistics = [None, None, None]
+
+    ################################################################################################
+    # @read_data_from_file
+    ################################################################################################
+    def read_data_from_file(self,
+                            center_at_origin=False):
+        """Loads the data from the given file in the constructor.
+
+        :param center_at_origin:
+            Center the morphology at the origin.
+        """
+
+        # Map the arrays
+        arrays = read_vmvb_arrays_table(self.morphology_file)
+
+        # The vertices, read into memory, since they are needed to construct the samples
+        vertices = numpy.array(arrays[vmv.consts.VMVB.VERTICES], dtype=numpy.float64)
+        points = vertices[:, 0:3]
+        self.number_loaded_vertices = len(vertices)
+
+        # Compute the bounding box of the morphology
+        self.bounding_box = vmv.bbox.compute_bounding_box_for_array_of_points(points)
+
+        # Center the morphology at the origin if required by the user
+        if center_at_origin:
+            points -= numpy.array(self.bounding_box.center)
+
+        # The samples of the strands, the index of the sample is that of the vertex (one-based)
+        strands_vertices = numpy.asarray(
+            arrays[vmv.consts.VMVB.STRANDS_VERTICES], dtype=numpy.int64)
+
+        # The links between the strands in the CSR format
+        links = numpy.zeros((0, 2), dtype=numpy.int64)
+        if vmv.consts.VMVB.LINKS in arrays:
+            links = numpy.asarray(arrays[vmv.consts.VMVB.LINKS], dtype=numpy.int64)
+            self.section_connectivity_available = True
+        number_strands = len(arrays[vmv.consts.VMVB.STRANDS_INDICES])
+        parents_offsets, parents = vmv.skeleton.construct_csr_adjacency(
+            links[:, ::-1], number_strands)
+        children_offsets, children = vmv.skeleton.construct_csr_adjacency(links, number_strands)
+
+        # Construct the arrays of the morphology, without creating any per-sample objects
+        self.morphology_arrays = vmv.skeleton.MorphologyArrays(
+            points=points[strands_vertices], radii=vertices[strands_vertices, 3],
+            section_offsets=arrays[vmv.consts.VMVB.STRANDS_OFFSETS],
+            section_indices=arrays[vmv.consts.VMVB.STRANDS_INDICES],
+            sample_indices=strands_vertices + 1,
+            parents_offsets=parents_offsets, parents=parents,
+            children_offsets=children_offsets, children=children)
+
+        # The sections and the roots are lazy views of the arrays
+        self.sections_list = self.morphology_arrays.get_sections_list()
+        self.roots = self.morphology_arrays.get_roots()
+        self.number_loaded_strands = len(self.sections_list)
+
+        # The simulation data remain mapped, the transposed views are indexed (vertex x step)
+        if vmv.consts.VMVB.SIM_RADIUS in arrays:
+            self.radius_simulation_data = arrays[vmv.consts.VMVB.SIM_RADIUS].T
+            bpy.context.scene.VMV_RadiusVariationsSteps = self.radius_simulation_data.shape[1]
+        if vmv.consts.VMVB.SIM_FLOW in arrays:
+            self.flow_simulation_data = arrays[vmv.consts.VMVB.SIM_FLOW].T
+        if vmv.consts.VMVB.SIM_PRESSURE in arrays:
+            self.pressure_simulation_data = arrays[vmv.consts.VMVB.SIM_PRESSURE].T
+        self.simulation_statistics = read_simulation_statistics_from_vmvb_arrays(arrays)
+
+    ################################################################################################
+    # @construct_morphology_object
+    ################################################################################################
+    def construct_morphology_object(self,
+                                    center_at_origin=False,
+                                    resample_morphology=False):
+        """Reconstructs the morphology object after loading it from file and centers it at
+        the origin if required.
+
+        :param center_at_origin:
+            A flag that indicates that the morphology will be centered at the origin.
+        :param resample_morphology:
+            Re-samples the morphology skeleton to reduce the number of samples along the section and
+            remove the redundant samples.
+        :return:
+            A reference to the morphology object.
+        """
+
+        # Load the morphology file
+        self.read_data_from_file(center_at_origin=center_at_origin)
+
+        # Resample the morphology skeleton if required
+        if resample_morphology:
+            for section in self.sections_list:
+                vmv.skeleton.resample_section_adaptively(section)
+
+        # Get the morphology name from the file
+        morphology_name = vmv.file.ops.get_file_name_from_path(self.morphology_file)
+
+        # Construct the morphology object following to reading the file
+        morphology_object = vmv.skeleton.Morphology(
+            name=morphology_name,
+            file_path=self.morphology_file,
+            number_samples=self.number_loaded_vertices,
+            number_sections=self.number_loaded_strands,
+            sections_list=self.sections_list,
+            roots=self.roots,
+            section_connectivity_available=self.section_connectivity_available,
+            radius_simulation_data=self.radius_simulation_data,
+            flow_simulation_data=self.flow_simulation_data,
+            pressure_simulation_data=self.pressure_simulation_data,
+            arrays=None if resample_morphology else self.morphology_arrays,
+            radius_simulation_statistics=self.simulation_statistics[0],
+            flow_simulation_statistics=self.simulation_statistics[1],
+            pressure_simulation_statistics=self.simulation_statistics[2])
+
+        # Return the object
+        return morphology_object
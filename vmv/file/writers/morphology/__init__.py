@@ -16,4 +16,5 @@
 ####################################################################################################
 
 from .swc_writer import *
+from .vmvb_writer import *
 
@@ -0,0 +1,206 @@
+####################################################################################################
+# Copyright (c) 2019 - 2023, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import struct
+import numpy
+
+# Internal imports
+import vmv
+import vmv.consts
+import vmv.skeleton
+
+
+####################################################################################################
+# @construct_simulation_statistics_vmvb_arrays
+####################################################################################################
+def construct_simulation_statistics_vmvb_arrays(morphology_object):
+    """Constructs the arrays of the statistics of the simulation data of a given morphology object,
+    which are stored in the VMVB files to avoid scanning the simulation data after loading.
+
+    :param morphology_object:
+        A given morphology object.
+    :return:
+        A dictionary mapping the name of every statistics array to a numpy array.
+    """
+
+    arrays = dict()
+    for name, statistics in [
+            (vmv.consts.VMVB.STAT_RADIUS, morphology_object.get_radius_simulation_statistics()),
+            (vmv.consts.VMVB.STAT_FLOW, morphology_object.get_flow_simulation_statistics()),
+            (vmv.consts.VMVB.STAT_PRESSURE,
+             morphology_object.get_pressure_simulation_statistics())]:
+        if statistics is not None:
+            arrays[name] = statistics.to_array().astype('<f4')
+    return arrays
+
+
+####################################################################################################
+# @construct_vmvb_arrays_from_morphology
+####################################################################################################
+def construct_vmvb_arrays_from_morphology(morphology_object):
+    """Constructs the arrays of a VMVB file from a given morphology object.
+
+    NOTE: If all the samples of the morphology have indices (as loaded from .vmv files), the
+    vertices are shared between the strands and the simulation data are written as well.
+    Otherwise, every sample is written as an independent vertex without the simulation data.
+
+    :param morphology_object:
+        A given morphology object.
+    :return:
+        A dictionary mapping the name of every array to a numpy array.
+    """
+
+    # All the samples are indexed, and therefore they can be shared between the strands
+    indexed = all(sample.index is not None
+                  for section in morphology_object.sections_list for sample in section.samples)
+
+    # Assign an index to every sample
+    if indexed:
+        strands_vertices = [sample.index - 1
+                            for section in morphology_object.sections_list
+                            for sample in section.samples]
+        number_vertices = max(strands_vertices) + 1 if len(strands_vertices) > 0 else 0
+    else:
+        strands_vertices = list(range(sum(len(section.samples)
+                                          for section in morphology_object.sections_list)))
+        number_vertices = len(strands_vertices)
+
+    # The vertices
+    vertices = numpy.zeros((number_vertices, 4), dtype='<f4')
+    samples = [sample for section in morphology_object.sections_list
+               for sample in section.samples]
+    if len(samples) > 0:
+        vertices[strands_vertices, 0:3] = [sample.get_coordinates() for sample in samples]
+        vertices[strands_vertices, 3] = [sample.radius for sample in samples]
+
+    # The strands
+    strands_offsets = numpy.zeros(len(morphology_object.sections_list) + 1, dtype='<i8')
+    strands_offsets[1:] = numpy.cumsum(
+        [len(section.samples) for section in morphology_object.sections_list])
+    strands_indices = [section.index if section.index is not None else i
+                       for i, section in enumerate(morphology_object.sections_list)]
+
+    # The links between the strands, using the positions of the sections in the list
+    positions = {id(section): i for i, section in enumerate(morphology_object.sections_list)}
+    links = [[i, positions[id(child)]]
+             for i, section in enumerate(morphology_object.sections_list)
+             for child in section.children]
+
+    arrays = {
+        vmv.consts.VMVB.VERTICES: vertices,
+        vmv.consts.VMVB.STRANDS_INDICES: numpy.array(strands_indices, dtype='<i4'),
+        vmv.consts.VMVB.STRANDS_OFFSETS: strands_offsets,
+        vmv.consts.VMVB.STRANDS_VERTICES: numpy.array(strands_vertices, dtype='<i4'),
+        vmv.consts.VMVB.LINKS: numpy.array(links, dtype='<i4').reshape(-1, 2)}
+
+    # The simulation data, stored step-major. The lazily-loaded data are already step-major, and
+    # the others are transposed views that are written in chunks without a full copy
+    for name, data in [(vmv.consts.VMVB.SIM_RADIUS, morphology_object.radius_simulation_data),
+                       (vmv.consts.VMVB.SIM_FLOW, morphology_object.flow_simulation_data),
+                       (vmv.consts.VMVB.SIM_PRESSURE, morphology_object.pressure_simulation_data)]:
+        if data is None or len(data) == 0:
+            continue
+        if not indexed or len(data) != number_vertices:
+            vmv.logger.info('The simulation data [%s] do not match the vertices, ignored' % name)
+            continue
+        if isinstance(data, vmv.skeleton.SimulationData):
+            arrays[name] = data.get_data()
+        else:
+            arrays[name] = numpy.asarray(data, dtype='<f4').T
+
+    # The statistics of the written simulation data
+    arrays.update({name: statistics for name, statistics in
+                   construct_simulation_statistics_vmvb_arrays(morphology_object).items()
+                   if name.replace('STAT_', 'SIM_') in arrays})
+
+    # Return the arrays
+    return arrays
+
+
+####################################################################################################
+# @write_vmvb_arrays_to_file
+####################################################################################################
+def write_vmvb_arrays_to_file(arrays,
+                              file_path):
+    """Writes a given dictionary of arrays to a VMVB file.
+
+    NOTE: Every array is converted to little-endian and written in chunks of rows, therefore large
+    arrays, such as transposed views of the simulation data, are never copied as a whole.
+
+    :param arrays:
+        A dictionary mapping the name of every array to a numpy array.
+    :param file_path:
+        The path of the output file.
+    """
+
+    # The size of the header and the table
+    header_size = struct.calcsize(vmv.consts.VMVB.HEADER_FORMAT) + \
+        len(arrays) * struct.calcsize(vmv.consts.VMVB.TABLE_ENTRY_FORMAT)
+
+    # Compute the table, where every array is aligned in the file
+    alignment = vmv.consts.VMVB.ALIGNMENT
+    offset = header_size
+    table = list()
+    for name, array in arrays.items():
+        offset = (offset + alignment - 1) // alignment * alignment
+        rows = array.shape[0]
+        columns = array.shape[1] if array.ndim > 1 else 0
+        dtype = array.dtype.newbyteorder('<')
+        table.append((name, array, dtype, rows, columns, offset))
+        offset += array.nbytes
+
+    with open(file_path, 'wb') as file_handler:
+
+        # The header
+        file_handler.write(struct.pack(vmv.consts.VMVB.HEADER_FORMAT, vmv.consts.VMVB.MAGIC,
+                                       vmv.consts.VMVB.VERSION, len(arrays), 0))
+
+        # The table
+        for name, array, dtype, rows, columns, offset in table:
+            file_handler.write(struct.pack(
+                vmv.consts.VMVB.TABLE_ENTRY_FORMAT, name.encode(), dtype.str.encode(),
+                rows, columns, offset))
+
+        # The arrays, flat in little-endian and row-major order, a chunk of rows at a time
+        for name, array, dtype, rows, columns, offset in table:
+            file_handler.write(b'\0' * (offset - file_handler.tell()))
+            row_size = max(1, array.nbytes // max(1, rows))
+            chunk_rows = max(1, vmv.consts.VMVB.WRITE_CHUNK_SIZE // row_size)
+            for start in range(0, rows, chunk_rows):
+                chunk = numpy.ascontiguousarray(array[start:start + chunk_rows])
+                chunk.astype(dtype, copy=False).tofile(file_handler)
+
+
+####################################################################################################
+# @write_morphology_to_vmvb_file
+####################################################################################################
+def write_morphology_to_vmvb_file(morphology_object,
+                                  file_path):
+    """Writes the morphology skeleton, and its simulation data if any, to a VMVB file.
+
+    :param morphology_object:
+        A given morphology object to be written to a VMVB file.
+    :param file_path:
+        The path where to write the file to.
+    """
+
+    # Construct the arrays
+    arrays = construct_vmvb_arrays_from_morphology(morphology_object)
+
+    # Write the file
+    write_vmvb_arrays_to_file(arrays=arrays, file_path=file_path)
@@ -25,6 +25,7 @@ import vmv.scene
 import vmv.mesh
 import vmv.geometry
 import vmv.skeleton
+import vmv.utilities
 
 
 ####################################################################################################
@@ -337,6 +338,78 @@ def append_poly_line_to_poly_lines_object(poly_lines_object,
         poly_line_object.points[i].radius = poly_line_sample[1]
 
 
+####################################################################################################
+# @append_poly_lines_arrays_to_poly_lines_object
+####################################################################################################
+def append_poly_lines_arrays_to_poly_lines_object(poly_lines_object,
+                                                  poly_lines_arrays,
+                                                  poly_line_type='POLY'):
+    """Creates the poly-lines stored in flat arrays and appends them to the aggregate
+    poly-lines-object that is created before.
+
+    NOTE: The coordinates, radii and material indices of all the poly-lines are set in bulk with
+    foreach_set, instead of setting every property of every point.
+
+    :param poly_lines_object:
+        A previously created poly-lines object where we going to append the new poly-line objects.
+    :param poly_lines_arrays:
+        A @PolyLinesArrays object of the poly-lines.
+    :param poly_line_type:
+        The type of the poly-line: ['POLY', 'BEZIER', 'BSPLINE', 'CARDINAL', 'NURBS']
+    """
+
+    import numpy
+
+    # The first spline appended to the object
+    first_spline = len(poly_lines_object.splines)
+
+    # Create the splines with their points
+    # NOTE: Use n-1 points because once the poly-line is created it has already one point added
+    offsets = poly_lines_arrays.offsets.tolist()
+    for start, end in zip(offsets[:-1], offsets[1:]):
+        poly_lines_object.splines.new(poly_line_type).points.add(end - start - 1)
+
+    # Set the points of every spline from the slices of the arrays
+    coordinates = poly_lines_arrays.points.reshape(-1)
+    radii = poly_lines_arrays.radii
+    for i, (start, end) in enumerate(zip(offsets[:-1], offsets[1:])):
+        points = poly_lines_object.splines[first_spline + i].points
+        points.foreach_set('co', coordinates[4 * start:4 * end])
+        points.foreach_set('radius', radii[start:end])
+
+    # Set the material indices of all the splines at once, the out-of-range indices are clamped
+    material_indices = numpy.zeros(len(poly_lines_object.splines), dtype=numpy.int32)
+    poly_lines_object.splines.foreach_get('material_index', material_indices)
+    material_indices[first_spline:] = numpy.maximum(poly_lines_arrays.color_indices, 0)
+    poly_lines_object.splines.foreach_set('material_index', material_indices)
+
+
+####################################################################################################
+# @append_poly_lines_to_poly_lines_object
+####################################################################################################
+def append_poly_lines_to_poly_lines_object(poly_lines_object,
+                                           poly_lines_data,
+                                           poly_line_type='POLY'):
+    """Creates a list of poly-line objects and appends them to the aggregate poly-lines-object that
+    is created before.
+
+    NOTE: The poly-lines are packed into flat arrays to be created in bulk.
+
+    :param poly_lines_object:
+        A previously created poly-lines object where we going to append the new poly-line objects
+        constructed from the given poly_lines_data.
+    :param poly_lines_data:
+        A list of the poly-lines data that will be used to create the new poly-line objects.
+    :param poly_line_type:
+        The type of the poly-line: ['POLY', 'BEZIER', 'BSPLINE', 'CARDINAL', 'NURBS']
+    """
+
+    append_poly_lines_arrays_to_poly_lines_object(
+        poly_lines_object=poly_lines_object,
+        poly_lines_arrays=vmv.skeleton.construct_poly_lines_arrays_from_poly_lines(poly_lines_data),
+        poly_line_type=poly_line_type)
+
+
 ####################################################################################################
 # @create_poly_lines_object_from_poly_lines_data
 ####################################################################################################
@@ -356,7 +429,8 @@ def create_poly_lines_object_from_poly_lines_data(poly_lines_data,
 
     :param poly_lines_data:
         The poly-lines data that will be used to create each new poly-line object that will be
-        appended to the created poly_lines_object.
+        appended to the created poly_lines_object, either a list of poly-lines or a
+        @PolyLinesArrays object.
     :param material:
         Material type, see enums:shading_enums:Shading.
     :param color_map:
@@ -395,11 +469,20 @@ def create_poly_lines_object_from_poly_lines_data(poly_lines_data,
         for material in materials_list:
             poly_lines_object.materials.append(material)
 
-    # For each poly-line in the poly-lines list, create an object and append it to the aggregate one
-    for poly_line_data in poly_lines_data:
-        append_poly_line_to_poly_lines_object(
-            poly_lines_object=poly_lines_object, poly_line_data=poly_line_data,
+    # Create all the poly-lines in the poly-lines list and append them to the aggregate object
+    timer = vmv.utilities.Timer()
+    timer.start()
+    if isinstance(poly_lines_data, vmv.skeleton.PolyLinesArrays):
+        append_poly_lines_arrays_to_poly_lines_object(
+            poly_lines_object=poly_lines_object, poly_lines_arrays=poly_lines_data,
+            poly_line_type=poly_line_type)
+    else:
+        append_poly_lines_to_poly_lines_object(
+            poly_lines_object=poly_lines_object, poly_lines_data=poly_lines_data,
             poly_line_type=poly_line_type)
+    timer.end()
+    vmv.logger.info('[%d] poly-lines created in [%f] seconds' %
+                    (len(poly_lines_data), timer.duration()))
 
     # Create the aggregate object to be linked to the scene later
     aggregate_poly_lines_object = bpy.data.objects.new(str(name), poly_lines_object)
@@ -186,6 +186,15 @@ def parse_command_line_arguments():
         action='store', type=int, default=16,
         help=arg_help)
 
+    # Instance a single sphere on the samples (only for the samples builder)
+    arg_help = 'Draw the samples as instances of a single sphere on a point cloud, instead of \n' \
+               'creating a sphere mesh for every sample. Valid only for the samples builder, \n' \
+               'with Blender 3.0 or later.'
+    skeletonization_args.add_argument(
+        Args.INSTANCE_SAMPLES,
+        action='store_true', default=False,
+        help=arg_help)
+
 
     ################################################################################################
     # Materials and colors arguments
@@ -235,7 +244,7 @@ def parse_command_line_arguments():
         help=arg_help)
 
     # Meshing algorithm
-    arg_options = ['(piecewise-watertight)', 'skinning', 'meta-balls']
+    arg_options = ['(piecewise-watertight)', 'skinning', 'meta-balls', 'signed-distance']
     arg_help = 'Meshing algorithm. \n' \
                'Options: %s' % arg_options
     meshing_args.add_argument(
@@ -287,6 +296,60 @@ def parse_command_line_arguments():
         action='store', type=float, default=2.0,
         help=arg_help)
 
+    # MetaBalls brick size
+    arg_help = 'The size of the bricks that the MetaBalls object is polygonized in, to bound \n' \
+               'the memory of large networks.\n' \
+               'Default 0.0, the MetaBalls object is polygonized at once.'
+    meshing_args.add_argument(
+        Args.META_BALLS_BRICK_SIZE,
+        action='store', type=float, default=0.0,
+        help=arg_help)
+
+    # Voxelization brick size
+    arg_help = 'The size of the bricks that the voxelization proxy mesh is re-meshed in, to \n' \
+               'bound the memory of the voxel grid of large networks.\n' \
+               'Default 0.0, the proxy mesh is re-meshed at once.'
+    meshing_args.add_argument(
+        Args.VOXELIZATION_BRICK_SIZE,
+        action='store', type=float, default=0.0,
+        help=arg_help)
+
+    # Voxelization radius bands
+    arg_help = 'The number of radius bands of the sections, where every band is re-meshed at a \n' \
+               'resolution proportional to its radius and the bands are fused at the \n' \
+               'branching regions. Only used with the voxelization meshing algorithm.\n' \
+               'Default 1, the proxy mesh is re-meshed at the resolution of the smallest radius.'
+    meshing_args.add_argument(
+        Args.VOXELIZATION_RADIUS_BANDS,
+        action='store', type=int, default=1,
+        help=arg_help)
+
+    # Signed distance field voxel size
+    arg_help = 'The voxel size of the signed distance field, in microns.\n' \
+               'Default 0.0, half the radius of the smallest sample in the morphology.'
+    meshing_args.add_argument(
+        Args.SIGNED_DISTANCE_VOXEL_SIZE,
+        action='store', type=float, default=0.0,
+        help=arg_help)
+
+    # Signed distance field worker processes
+    arg_help = 'The number of worker processes that polygonize the blocks of the signed \n' \
+               'distance field in parallel.\n' \
+               'Default 1, the blocks are polygonized in the main process.'
+    meshing_args.add_argument(
+        Args.SIGNED_DISTANCE_WORKERS,
+        action='store', type=int, default=1,
+        help=arg_help)
+
+    # Skinning worker processes
+    arg_help = 'The number of background Blender processes that skin the partitions of the \n' \
+               'graph in parallel.\n' \
+               'Default 1, the partitions are skinned one by one in the scene.'
+    meshing_args.add_argument(
+        Args.SKINNING_WORKERS,
+        action='store', type=int, default=1,
+        help=arg_help)
+
     ################################################################################################
     # Geometry export arguments
     ################################################################################################
@@ -309,6 +372,13 @@ def parse_command_line_arguments():
         action='store_true', default=False,
         help=arg_help)
 
+    # Export the morphology, with its simulation data, in the binary .VMVB format
+    arg_help = 'Exports the morphology and its simulation data to a binary (.VMVB) file.'
+    export_args.add_argument(
+        Args.EXPORT_VMVB_MORPHOLOGY,
+        action='store_true', default=False,
+        help=arg_help)
+
     # Export the morphology as a Blender file in .BLEND format
     arg_help = 'Exports the morphology as a Blender file (.BLEND).'
     export_args.add_argument(
@@ -612,6 +682,7 @@ def create_shell_commands(arguments,
        arguments.render_vascular_morphology_360 or            \
        arguments.export_morphology_vmv or                   \
        arguments.export_morphology_h5 or                    \
+       arguments.export_morphology_vmvb or                  \
        arguments.export_morphology_blend:
 
         # Add this command to the list
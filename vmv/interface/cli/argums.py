@@ -86,6 +86,9 @@ class Args:
     # Morphology bevel object sides
     MORPHOLOGY_BEVEL_SIDES = '--bevel-sides'
 
+    # Instance a single sphere on the samples
+    INSTANCE_SAMPLES = '--instance-samples'
+
     ################################################################################################
     # Materials and colors arguments
     ################################################################################################
@@ -123,6 +126,24 @@ class Args:
     # MetaBalls resolution value
     META_BALLS_RESOLUTION = '--meta-balls-resolution'
 
+    # MetaBalls brick size
+    META_BALLS_BRICK_SIZE = '--meta-balls-brick-size'
+
+    # Voxelization brick size
+    VOXELIZATION_BRICK_SIZE = '--voxelization-brick-size'
+
+    # Voxelization radius bands
+    VOXELIZATION_RADIUS_BANDS = '--voxelization-radius-bands'
+
+    # Signed distance field voxel size
+    SIGNED_DISTANCE_VOXEL_SIZE = '--signed-distance-voxel-size'
+
+    # Signed distance field worker processes
+    SIGNED_DISTANCE_WORKERS = '--signed-distance-workers'
+
+    # Skinning worker processes
+    SKINNING_WORKERS = '--skinning-workers'
+
     ################################################################################################
     # Geometry export arguments
     ################################################################################################
@@ -132,6 +153,9 @@ class Args:
     # Export .H5 morphology
     EXPORT_H5_MORPHOLOGY = '--export-morphology-h5'
 
+    # Export .VMVB morphology
+    EXPORT_VMVB_MORPHOLOGY = '--export-morphology-vmvb'
+
     # Export .BLEND morphology
     EXPORT_BLEND_MORPHOLOGY = '--export-morphology-blend'
 
@@ -71,6 +71,18 @@ def reconstruct_vascular_mesh(cli_morphology,
         builder.build_mesh()
         return True
 
+    # Skinning builder
+    elif cli_options.mesh.meshing_technique == vmv.enums.Meshing.Technique.SKIN_MODIFIER:
+        builder = vmv.builders.SkinningBuilder(cli_morphology, cli_options)
+        builder.build_mesh()
+        return True
+
+    # Signed distance field builder
+    elif cli_options.mesh.meshing_technique == vmv.enums.Meshing.Technique.SIGNED_DISTANCE:
+        builder = vmv.builders.SignedDistanceBuilder(cli_morphology, cli_options)
+        builder.build_mesh()
+        return True
+
     else:
 
         # Invalid meshing algorithm
@@ -113,6 +113,14 @@ def reconstruct_vascular_morphology(cli_morphology,
         System options parsed from the command line interface (CLI).
     """
 
+    # Export to .VMVB file
+    if cli_options.morphology.export_vmvb:
+        vmv.file.ops.create_directory(cli_options.io.morphologies_directory)
+        vmvb_file = '%s/%s.vmvb' % (cli_options.io.morphologies_directory, cli_morphology.label)
+        vmv.logger.info('Exporting the morphology to [%s]' % vmvb_file)
+        vmv.file.write_morphology_to_vmvb_file(
+            morphology_object=cli_morphology, file_path=vmvb_file)
+
     # Clear the scene
     vmv.scene.ops.clear_scene()
 
@@ -0,0 +1,49 @@
+####################################################################################################
+# Copyright (c) 2019 - 2023, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import sys
+import os
+
+# Append the internal modules into the system paths to avoid Blender importing conflicts
+import_paths = ['vmv']
+for import_path in import_paths:
+    sys.path.append(('%s/../../..' % (os.path.dirname(os.path.realpath(__file__)))))
+
+# Internal imports
+import vmv
+import vmv.mesh
+import vmv.skeleton
+
+
+####################################################################################################
+# @ Run the main function if invoked from the command line.
+####################################################################################################
+if __name__ == "__main__":
+
+    # Skins the graph partitions of a .npz file and writes the resulting meshes to another .npz
+    # file, where the arguments are given after '--' as: input file, output file, subdivision level
+    args = sys.argv
+    input_file, output_file, subdivision_level = args[args.index("--") + 1:][:3]
+
+    # Skin the partitions one by one
+    meshes = [vmv.mesh.skin_graph(points=points, radii=radii, edges=edges,
+                                  subdivision_level=int(subdivision_level))
+              for points, radii, edges in vmv.skeleton.load_partitions_arrays(input_file)]
+
+    # Write the meshes
+    vmv.skeleton.save_partitions_arrays(output_file, meshes)
@@ -36,6 +36,9 @@ SimulationLoaded = False
 # A flag that captures the state of the simulation, whether it is running or not
 SimulationRunning = False
 
+# A reference to the morphology builder that applies the simulation data in the frame handler
+SimulationPlaybackBuilder = None
+
 # Current visualization type, to update the UI once the visualization type is changed
 CurrentVisualizationType = None
 
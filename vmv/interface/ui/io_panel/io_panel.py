@@ -113,13 +113,12 @@ class VMV_LoadMorphology(bpy.types.Operator):
             # VMV is initialized
             vmv.interface.SystemInitialized = True
 
-        # Create a morphology reader object
-        morphology_reader = vmv.file.create_morphology_reader(vmv.interface.Options.io.file_path)
-
-        # Construct a morphology object to be used later by the entire application
+        # Construct a morphology object to be used later by the entire application, from the
+        # cache of the parsed morphologies if it was loaded before
         loading_start = time.time()
 
-        vmv.interface.MorphologyObject = morphology_reader.construct_morphology_object(
+        vmv.interface.MorphologyObject = vmv.file.read_morphology_with_cache(
+            file_path=vmv.interface.Options.io.file_path,
             center_at_origin=vmv.interface.Options.io.center_morphology_at_origin,
             resample_morphology=vmv.interface.Options.io.resample_morphology)
 
@@ -175,6 +174,7 @@ class VMV_LoadMorphology(bpy.types.Operator):
 
         # Resetting the simulation loaded flag
         vmv.interface.SimulationLoaded = False
+        vmv.interface.unregister_simulation_frame_change_handler()
 
         # Done
         return {'FINISHED'}
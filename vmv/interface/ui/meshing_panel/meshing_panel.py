@@ -122,6 +122,83 @@ class VMV_MeshingPanel(bpy.types.Panel):
                     '0.01, it might take very long time to mesh the skeleton. It also depends on '
                     'the number of vertices or samples in the morphology.')
 
+    # Polygonize the meta balls in bricks
+    bpy.types.Scene.VMV_MetaBallBricks = bpy.props.BoolProperty(
+        name='Bricks',
+        description='Polygonize the meta balls object in overlapping bricks, one brick at a time, '
+                    'and merge the resulting meshes. This bounds the memory required to mesh '
+                    'large networks by the size of the brick.',
+        default=False)
+
+    # The size of the bricks of the meta balls
+    bpy.types.Scene.VMV_MetaBallBrickSize = bpy.props.FloatProperty(
+        name='Size',
+        default=vmv.consts.Meshing.BRICK_SIZE,
+        min=vmv.consts.Meshing.MIN_BRICK_SIZE,
+        max=vmv.consts.Meshing.MAX_BRICK_SIZE,
+        description='The size of every brick in microns.')
+
+    # Re-mesh the voxelization proxy mesh in bricks
+    bpy.types.Scene.VMV_VoxelizationBricks = bpy.props.BoolProperty(
+        name='Bricks',
+        description='Re-mesh the proxy mesh in overlapping bricks, one brick at a time, and merge '
+                    'the resulting meshes. This bounds the memory of the voxel grid by the size '
+                    'of the brick.',
+        default=False)
+
+    # The size of the bricks of the voxelization
+    bpy.types.Scene.VMV_VoxelizationBrickSize = bpy.props.FloatProperty(
+        name='Size',
+        default=vmv.consts.Meshing.BRICK_SIZE,
+        min=vmv.consts.Meshing.MIN_BRICK_SIZE,
+        max=vmv.consts.Meshing.MAX_BRICK_SIZE,
+        description='The size of every brick in microns.')
+
+    # The number of radius bands of the voxelization
+    bpy.types.Scene.VMV_VoxelizationRadiusBands = bpy.props.IntProperty(
+        name='Radius Bands',
+        default=1,
+        min=1,
+        max=vmv.consts.Meshing.MAX_VOXEL_RADIUS_BANDS,
+        description='Group the sections into bands of similar radii and re-mesh every band at a '
+                    'resolution proportional to the radii of its sections, then fuse the bands at '
+                    'the branching regions. Use 1 to re-mesh the whole proxy mesh at the resolution '
+                    'of the smallest radius in the morphology.')
+
+    # Auto-detected signed distance field resolution
+    bpy.types.Scene.VMV_SignedDistanceAutoResolution = bpy.props.BoolProperty(
+        name='Auto',
+        description='Use half the radius of the smallest sample in the morphology as the voxel '
+                    'size of the signed distance field. You can disable this option and set a '
+                    'user-specific voxel size.',
+        default=True)
+
+    # The voxel size of the signed distance field
+    bpy.types.Scene.VMV_SignedDistanceVoxelSize = bpy.props.FloatProperty(
+        name='',
+        default=vmv.consts.Meshing.SDF_VOXEL_SIZE,
+        min=vmv.consts.Meshing.MIN_SDF_VOXEL_SIZE,
+        max=vmv.consts.Meshing.MAX_SDF_VOXEL_SIZE,
+        description='The voxel size of the signed distance field in microns.')
+
+    # The number of worker processes of the signed distance field
+    bpy.types.Scene.VMV_SignedDistanceWorkers = bpy.props.IntProperty(
+        name='Workers',
+        default=1,
+        min=1,
+        max=vmv.consts.Meshing.MAX_SDF_WORKERS,
+        description='The number of worker processes that polygonize the blocks of the signed '
+                    'distance field in parallel.')
+
+    # The number of worker processes of the skinning
+    bpy.types.Scene.VMV_SkinningWorkers = bpy.props.IntProperty(
+        name='Workers',
+        default=1,
+        min=1,
+        max=vmv.consts.Meshing.MAX_SKINNING_WORKERS,
+        description='The number of background Blender processes that skin the partitions of the '
+                    'graph in parallel. Use 1 to skin the partitions one by one in the scene.')
+
     # Mesh tessellation flag
     bpy.types.Scene.VMV_TessellateMesh = bpy.props.BoolProperty(
         name='Tessellation',
@@ -227,6 +304,10 @@ class VMV_ReconstructMesh(bpy.types.Operator):
             builder = vmv.builders.VoxelizationBuilder(
                 morphology=vmv.interface.MorphologyObject, options=vmv.interface.Options)
 
+        elif context.scene.VMV_MeshingTechnique == vmv.enums.Meshing.Technique.SIGNED_DISTANCE:
+            builder = vmv.builders.SignedDistanceBuilder(
+                morphology=vmv.interface.MorphologyObject, options=vmv.interface.Options)
+
         # Using the piece-wise
         else:
             builder = vmv.builders.PolylineBuilder(
@@ -61,6 +61,65 @@ def add_meshing_options(layout,
         else:
             resolution_row.enabled = True
 
+        # Meta-ball bricks
+        row = layout.row()
+        row.prop(scene, 'VMV_MetaBallBricks')
+        brick_size_row = row.row()
+        brick_size_row.prop(scene, 'VMV_MetaBallBrickSize')
+        brick_size_row.enabled = scene.VMV_MetaBallBricks
+        if scene.VMV_MetaBallBricks:
+            options.mesh.meta_brick_size = scene.VMV_MetaBallBrickSize
+        else:
+            options.mesh.meta_brick_size = 0.0
+
+    # Voxelization-specific algorithm options
+    if scene.VMV_MeshingTechnique == vmv.enums.Meshing.Technique.VOXELIZATION:
+
+        # Voxelization bricks
+        row = layout.row()
+        row.prop(scene, 'VMV_VoxelizationBricks')
+        brick_size_row = row.row()
+        brick_size_row.prop(scene, 'VMV_VoxelizationBrickSize')
+        brick_size_row.enabled = scene.VMV_VoxelizationBricks
+        if scene.VMV_VoxelizationBricks:
+            options.mesh.voxel_brick_size = scene.VMV_VoxelizationBrickSize
+        else:
+            options.mesh.voxel_brick_size = 0.0
+
+        # Voxelization radius bands
+        row = layout.row()
+        row.prop(scene, 'VMV_VoxelizationRadiusBands')
+        options.mesh.voxel_radius_bands = scene.VMV_VoxelizationRadiusBands
+
+    # Skinning-specific algorithm options
+    if scene.VMV_MeshingTechnique == vmv.enums.Meshing.Technique.SKIN_MODIFIER:
+
+        # Worker processes
+        row = layout.row()
+        row.prop(scene, 'VMV_SkinningWorkers')
+        options.mesh.skinning_workers = scene.VMV_SkinningWorkers
+
+    # Signed-distance-specific algorithm options
+    if scene.VMV_MeshingTechnique == vmv.enums.Meshing.Technique.SIGNED_DISTANCE:
+
+        row = layout.row()
+        row.label(text='Voxel Size')
+
+        # Auto voxel size
+        row.prop(scene, 'VMV_SignedDistanceAutoResolution', icon='OUTLINER_OB_EMPTY')
+        voxel_size_row = row.row()
+        voxel_size_row.prop(scene, 'VMV_SignedDistanceVoxelSize')
+        voxel_size_row.enabled = not scene.VMV_SignedDistanceAutoResolution
+        if scene.VMV_SignedDistanceAutoResolution:
+            options.mesh.sdf_voxel_size = 0.0
+        else:
+            options.mesh.sdf_voxel_size = scene.VMV_SignedDistanceVoxelSize
+
+        # Worker processes
+        row = layout.row()
+        row.prop(scene, 'VMV_SignedDistanceWorkers')
+        options.mesh.sdf_workers = scene.VMV_SignedDistanceWorkers
+
     # Mesh tessellation
     row = layout.row()
     row.prop(scene, 'VMV_TessellateMesh')
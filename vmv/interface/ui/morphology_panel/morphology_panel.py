@@ -580,6 +580,7 @@ def unregister_panel():
     bpy.utils.unregister_class(vmv.interface.VMV_SimulationNextFrame)
     bpy.utils.unregister_class(vmv.interface.VMV_SimulationFirstFrame)
     bpy.utils.unregister_class(vmv.interface.VMV_SimulationLastFrame)
+    vmv.interface.unregister_simulation_frame_change_handler()
 
     # Morphology rendering buttons
     bpy.utils.unregister_class(vmv.interface.VMV_RenderMorphologyImage)
@@ -470,9 +470,13 @@ def add_static_morphology_visualization_options(layout,
     # Radii options are common
     add_radii_options(layout=layout, scene=scene, options=options)
 
-    # The samples builder does not have any specific options for the moment
+    # The samples builder can instance a single sphere on the samples, with Blender 3.0 or later
     if options.morphology.builder == vmv.enums.Morphology.Builder.SAMPLES:
-        pass
+        if vmv.utilities.is_blender_3():
+            layout.row().prop(scene, 'VMV_InstanceSampleSpheres')
+            options.morphology.instance_samples = scene.VMV_InstanceSampleSpheres
+        else:
+            options.morphology.instance_samples = False
     else:
         # Tube quality only for the sections and segments, to improve the performance
         add_tube_quality_options(layout=layout, scene=scene, options=options)
@@ -564,6 +568,9 @@ def add_simulation_visualization_options(layout,
     # Title
     layout.row().label(text='Simulation Visualization', icon='PARTICLE_POINT')
 
+    # Simulation playback engine
+    layout.row().prop(scene, 'VMV_FrameHandlerSimulationPlayback')
+
     # Adding the simulation loading button, if the simulation is not loaded
     layout.row().operator('load.simulation', icon='FORCE_TURBULENCE')
 
@@ -93,6 +93,14 @@ bpy.types.Scene.VMV_MinimumRadiusValue = bpy.props.FloatProperty(
     description='The minimum value of the radius of the sample',
     default=0.1, min=0.001, max=5.0)
 
+# Draw the samples as instances of a single shared sphere
+bpy.types.Scene.VMV_InstanceSampleSpheres = bpy.props.BoolProperty(
+    name='Instance Spheres',
+    description='Draw the samples as instances of a single shared sphere on a point cloud that '
+                'has a radius per sample, instead of creating a mesh sphere for every sample. '
+                'This keeps the memory proportional to the number of samples.',
+    default=False)
+
 # Shading parameters ###############################################################################
 # Segments color-coding
 bpy.types.Scene.VMV_PerSegmentColorCodingBasis = bpy.props.EnumProperty(
@@ -173,6 +181,14 @@ bpy.types.Scene.VMV_LastSimulationFrame = bpy.props.IntProperty(
                 'This is the typical last time-step with which the simulation will end at.',
     default=0, min=0, max=1000000)
 
+# Play the simulation with a frame-change handler instead of the pre-baked keyframes
+bpy.types.Scene.VMV_FrameHandlerSimulationPlayback = bpy.props.BoolProperty(
+    name='Frame Handler Playback',
+    description='Apply the simulation data of the current frame directly on the skeleton when '
+                'the frame changes, instead of baking keyframes for every time step. This '
+                'keeps the memory constant regardless of the number of time steps.',
+    default=False)
+
 # Simulation progress bar
 bpy.types.Scene.VMV_SimulationProgressBar = bpy.props.IntProperty(
     name='',
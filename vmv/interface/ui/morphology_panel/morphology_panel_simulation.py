@@ -28,93 +28,98 @@ import vmv.interface
 
 
 ####################################################################################################
-# @VMV_LoadSimulation
+# @simulation_frame_change_handler
 ####################################################################################################
-class VMV_LoadSimulation(bpy.types.Operator):
-    """Loads the simulation data and apply them on the morphology skeleton"""
+def simulation_frame_change_handler(scene,
+                                    depsgraph=None):
+    """Applies the simulation data of the current frame on the morphology skeleton once the frame
+    is changed, without any keyframes.
 
-    # Operator parameters
-    bl_idname = 'load.simulation'
-    bl_label = 'Load Simulation'
+    :param scene:
+        Blender scene.
+    :param depsgraph:
+        Blender dependency graph.
+    """
 
-    # Timer parameters
-    event_timer = None
-    frame = 0
+    builder = vmv.interface.SimulationPlaybackBuilder
+    if builder is None:
+        return
 
-    # The simulation cannot be displayed without re-building the morphology polyline object
-    morphology_builder = None
+    # Clamp the frame to the simulation range
+    time_step = min(max(scene.frame_current, 0), scene.VMV_LastSimulationFrame)
 
-    # The reconstructed morphology polyline object that will be used to display the simulation data
-    morphology_object_polyline = None
+    try:
+        builder.apply_radius_simulation_at_step(time_step)
 
-    ################################################################################################
-    # @modal
-    ################################################################################################
-    def modal(self,
-              context,
-              event):
-        """Threading and non-blocking handling.
+    # The skeleton has been removed from the scene, i.e. the morphology has been re-built
+    except ReferenceError:
+        unregister_simulation_frame_change_handler()
 
-        :param context:
-            Panel context.
-        :param event:
-            A given event for the panel.
-        """
 
-        # Cancelling event, if using right click or exceeding the time limit of the simulation
-        if event.type in {'ESC'} or self.frame > context.scene.VMV_LastSimulationFrame:
+####################################################################################################
+# @register_simulation_frame_change_handler
+####################################################################################################
+def register_simulation_frame_change_handler(morphology_builder):
+    """Registers the frame change handler that plays the simulation using a given builder.
 
-            # Reset the frame to the first one
-            self.frame = 0
+    :param morphology_builder:
+        The morphology builder that reconstructed the skeleton where the simulation is applied.
+    """
 
-            # Update the time line frame to the first one
-            bpy.context.scene.frame_set(0)
+    unregister_simulation_frame_change_handler()
+    vmv.interface.SimulationPlaybackBuilder = morphology_builder
+    bpy.app.handlers.frame_change_pre.append(simulation_frame_change_handler)
 
-            # Update the current simulation frame to the first one
-            context.scene.VMV_CurrentSimulationFrame = 0
 
-            # Interpolations
-            scale = float(context.scene.VMV_MaximumValue) - float(context.scene.VMV_MinimumValue)
-            delta = scale / float(vmv.consts.Color.COLORMAP_RESOLUTION)
+####################################################################################################
+# @unregister_simulation_frame_change_handler
+####################################################################################################
+def unregister_simulation_frame_change_handler():
+    """Un-registers the simulation frame change handler, if registered."""
 
-            # Fill the list of colors
-            for color_index in range(vmv.consts.Color.COLORMAP_RESOLUTION):
-                r0_value = float(context.scene.VMV_MinimumValue) + (color_index * delta)
-                r1_value = float(context.scene.VMV_MinimumValue) + ((color_index + 1) * delta)
-                print(r0_value, r1_value)
-                setattr(context.scene, 'VMV_R0_Value%d' % color_index, r0_value)
-                setattr(context.scene, 'VMV_R1_Value%d' % color_index, r1_value)
+    vmv.interface.SimulationPlaybackBuilder = None
+    while simulation_frame_change_handler in bpy.app.handlers.frame_change_pre:
+        bpy.app.handlers.frame_change_pre.remove(simulation_frame_change_handler)
 
-            # Refresh the panel context
-            self.cancel(context)
 
-            # Update the SimulationLoaded flag to update the UI
-            vmv.interface.SimulationLoaded = True
+####################################################################################################
+# @update_simulation_colormap_ranges
+####################################################################################################
+def update_simulation_colormap_ranges(context):
+    """Updates the value ranges of the colors of the colormap in the UI after loading the
+    simulation.
 
-            # Done
-            return {'FINISHED'}
+    :param context:
+        Blender context.
+    """
 
-        # Timer event, where the function is executed here on a per-frame basis
-        if event.type == 'TIMER':
+    # Interpolations
+    scale = float(context.scene.VMV_MaximumValue) - float(context.scene.VMV_MinimumValue)
+    delta = scale / float(vmv.consts.Color.COLORMAP_RESOLUTION)
 
-            # Update the frame in the time line
-            bpy.context.scene.frame_current = self.frame
+    # Fill the list of colors
+    for color_index in range(vmv.consts.Color.COLORMAP_RESOLUTION):
+        r0_value = float(context.scene.VMV_MinimumValue) + (color_index * delta)
+        r1_value = float(context.scene.VMV_MinimumValue) + ((color_index + 1) * delta)
+        setattr(context.scene, 'VMV_R0_Value%d' % color_index, r0_value)
+        setattr(context.scene, 'VMV_R1_Value%d' % color_index, r1_value)
 
-            # Load the simulation data on a per-frame basis
-            self.morphology_builder.load_radius_simulation_data_at_step(self.frame, context=context)
 
-            # Update the progress bar
-            context.scene.VMV_SimulationProgressBar = \
-                math.ceil(int(100.0 * self.frame / context.scene.VMV_LastSimulationFrame))
+####################################################################################################
+# @VMV_LoadSimulation
+####################################################################################################
+class VMV_LoadSimulation(bpy.types.Operator):
+    """Loads the simulation data and apply them on the morphology skeleton"""
 
-            # Update the current simulation frame
-            context.scene.VMV_CurrentSimulationFrame = self.frame
+    # Operator parameters
+    bl_idname = 'load.simulation'
+    bl_label = 'Load Simulation'
 
-            # Upgrade the time step
-            self.frame += 1
+    # The simulation cannot be displayed without re-building the morphology polyline object
+    morphology_builder = None
 
-        # Next frame
-        return {'PASS_THROUGH'}
+    # The reconstructed morphology polyline object that will be used to display the simulation data
+    morphology_object_polyline = None
 
     ################################################################################################
     # @execute
@@ -172,40 +177,47 @@ class VMV_LoadSimulation(bpy.types.Operator):
         # TODO: Depending on the simulation type
         if vmv.interface.MorphologyObject.has_radius_simulation:
             context.scene.VMV_LastSimulationFrame = \
-                len(vmv.interface.MorphologyObject.radius_simulation_data[0]) - 1
+                vmv.interface.MorphologyObject.get_number_radius_simulation_steps() - 1
 
         # NOTE: Make sure you pass the current polyline object to the global reference to be able
         # to control it while updating certain UI elements
         vmv.interface.MorphologyPolylineObject = self.morphology_object_polyline
 
-        # Use the event timer to update the UI during the soma building
-        wm = context.window_manager
-        self.event_timer = wm.event_timer_add(time_step=0.001, window=context.window)
-        wm.modal_handler_add(self)
+        # Play the simulation with the frame change handler, without baking any keyframes
+        if context.scene.VMV_FrameHandlerSimulationPlayback:
+            register_simulation_frame_change_handler(self.morphology_builder)
 
-        # Done
-        return {'RUNNING_MODAL'}
+            # Apply the first frame
+            context.scene.VMV_CurrentSimulationFrame = 0
+            bpy.context.scene.frame_set(0)
 
-    ################################################################################################
-    # @cancel
-    ################################################################################################
-    def cancel(self,
-               context):
-        """
-        Cancel the panel processing and return to the interaction mode.
+            # Update the ranges of the colormap
+            update_simulation_colormap_ranges(context)
 
-        :param context:
-            Panel context.
-        """
+            # Update the SimulationLoaded flag to update the UI
+            vmv.interface.SimulationLoaded = True
+            self.report({'INFO'}, 'Simulation Loading Done')
+            return {'FINISHED'}
 
-        # Multi-threading
-        wm = context.window_manager
-        wm.event_timer_remove(self.event_timer)
+        # The keyframes will be baked, then the handler is not needed
+        unregister_simulation_frame_change_handler()
+
+        # Bake the keyframes of all the time steps at once
+        self.morphology_builder.load_radius_simulation_data()
+        context.scene.VMV_SimulationProgressBar = 100
+
+        # Apply the first frame
+        context.scene.VMV_CurrentSimulationFrame = 0
+        bpy.context.scene.frame_set(0)
+
+        # Update the ranges of the colormap
+        update_simulation_colormap_ranges(context)
 
-        # Report the process termination in the UI
+        # Update the SimulationLoaded flag to update the UI
+        vmv.interface.SimulationLoaded = True
         self.report({'INFO'}, 'Simulation Loading Done')
 
-        # Confirm operation done
+        # Done
         return {'FINISHED'}
 
 
@@ -289,7 +301,11 @@ class VMV_PlaySimulation(bpy.types.Operator):
                 return {'FINISHED'}
 
             # Update the current frame
-            bpy.context.scene.frame_current = context.scene.VMV_CurrentSimulationFrame
+            # NOTE: The frame change handler is only called when the frame is set
+            if vmv.interface.SimulationPlaybackBuilder is not None:
+                bpy.context.scene.frame_set(context.scene.VMV_CurrentSimulationFrame)
+            else:
+                bpy.context.scene.frame_current = context.scene.VMV_CurrentSimulationFrame
 
             # Update the progress bar
             context.scene.VMV_SimulationProgressBar = \
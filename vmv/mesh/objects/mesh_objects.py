@@ -17,12 +17,15 @@
 
 # Blender modules
 import math
+import numpy
 
 import bpy
 
 # Internal modules
 import vmv
+import vmv.bmeshi
 import vmv.scene
+import vmv.utilities
 
 
 ####################################################################################################
@@ -345,3 +348,239 @@ def get_remeshed_icosphere_data(radius=1,
 
     # Return the data (vertices and faces)
     return [vertices, faces]
+
+
+####################################################################################################
+# @create_point_cloud
+####################################################################################################
+def create_point_cloud(points,
+                       radii,
+                       name='Point Cloud',
+                       radius_attribute='radius'):
+    """Create a mesh object that has only vertices, one per point, with a radius attribute per
+    vertex, link it to the scene and return a reference to it.
+
+    The vertices and the radii are set in bulk with foreach_set.
+
+    NOTE: The generic mesh attributes require Blender 2.91 or later.
+
+    :param points:
+        An (N x 3) array of the XYZ-coordinates of the points.
+    :param radii:
+        An array of the N radii of the points.
+    :param name:
+        The name of the point cloud, by default 'Point Cloud'.
+    :param radius_attribute:
+        The name of the float attribute that stores the radii, by default 'radius'.
+    :return:
+        A reference to the created point cloud.
+    """
+
+    points = numpy.ascontiguousarray(points, dtype=numpy.float32).reshape(-1, 3)
+    radii = numpy.ascontiguousarray(radii, dtype=numpy.float32).reshape(-1)
+
+    # Create the mesh and add the vertices
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(points))
+    mesh.vertices.foreach_set('co', points.ravel())
+
+    # Add the radius attribute
+    attribute = mesh.attributes.new(name=radius_attribute, type='FLOAT', domain='POINT')
+    attribute.data.foreach_set('value', radii)
+    mesh.update()
+
+    # Create the object and link it to the scene
+    point_cloud = bpy.data.objects.new(name, mesh)
+    vmv.scene.link_object_to_scene(input_object=point_cloud)
+
+    # Return a reference to it
+    return point_cloud
+
+
+####################################################################################################
+# @create_graph_mesh
+####################################################################################################
+def create_graph_mesh(points,
+                      radii,
+                      edges,
+                      name='Graph',
+                      radius_attribute='radius'):
+    """Create a mesh object that has only vertices and edges, with a radius attribute per vertex,
+    link it to the scene and return a reference to it.
+
+    The vertices, the edges and the radii are set in bulk with foreach_set. The radius attribute
+    is carried with the vertices when the mesh is separated into partitions.
+
+    NOTE: The generic mesh attributes only exist from Blender 2.91, the radius attribute is not
+    added with older versions.
+
+    :param points:
+        An (N x 3) array of the XYZ-coordinates of the vertices.
+    :param radii:
+        An array of the N radii of the vertices.
+    :param edges:
+        An (M x 2) array of the indices of the vertices of the edges.
+    :param name:
+        The name of the graph, by default 'Graph'.
+    :param radius_attribute:
+        The name of the float attribute that stores the radii, by default 'radius'.
+    :return:
+        A reference to the created graph.
+    """
+
+    points = numpy.ascontiguousarray(points, dtype=numpy.float32).reshape(-1, 3)
+    radii = numpy.ascontiguousarray(radii, dtype=numpy.float32).reshape(-1)
+    edges = numpy.ascontiguousarray(edges, dtype=numpy.int32).reshape(-1)
+
+    # Create the mesh and add the vertices and the edges
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(points))
+    mesh.vertices.foreach_set('co', points.ravel())
+    mesh.edges.add(len(edges) // 2)
+    mesh.edges.foreach_set('vertices', edges)
+
+    # Add the radius attribute, if supported
+    if vmv.utilities.is_blender_291():
+        attribute = mesh.attributes.new(name=radius_attribute, type='FLOAT', domain='POINT')
+        attribute.data.foreach_set('value', radii)
+    mesh.update()
+
+    # Create the object and link it to the scene
+    graph = bpy.data.objects.new(name, mesh)
+    vmv.scene.link_object_to_scene(input_object=graph)
+
+    # Return a reference to it
+    return graph
+
+
+####################################################################################################
+# @create_mesh_from_polygons
+####################################################################################################
+def create_mesh_from_polygons(vertices,
+                              polygons_vertices,
+                              polygons_offsets,
+                              name='Mesh'):
+    """Create a mesh object from arrays of vertices and polygons, link it to the scene and return
+    a reference to it.
+
+    The data are written to the mesh in one shot with foreach_set.
+
+    :param vertices:
+        An (N x 3) array of the XYZ-coordinates of the vertices.
+    :param polygons_vertices:
+        An array of the indices of the vertices of all the polygons, one polygon after the other.
+    :param polygons_offsets:
+        An array of the (M + 1) offsets of the vertices of the M polygons in polygons_vertices.
+    :param name:
+        The name of the mesh object, by default 'Mesh'.
+    :return:
+        A reference to the created mesh object.
+    """
+
+    vertices = numpy.ascontiguousarray(vertices, dtype=numpy.float32).reshape(-1, 3)
+    polygons_vertices = numpy.ascontiguousarray(polygons_vertices, dtype=numpy.int32).reshape(-1)
+    polygons_offsets = numpy.asarray(polygons_offsets, dtype=numpy.int32)
+    number_polygons = len(polygons_offsets) - 1
+
+    # Create the mesh and write the data
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(vertices))
+    mesh.vertices.foreach_set('co', vertices.ravel())
+    mesh.loops.add(len(polygons_vertices))
+    mesh.loops.foreach_set('vertex_index', polygons_vertices)
+    mesh.polygons.add(number_polygons)
+    mesh.polygons.foreach_set('loop_start', numpy.ascontiguousarray(polygons_offsets[:-1]))
+
+    # The number of loops per polygon is computed automatically in the recent versions
+    if not mesh.polygons.bl_rna.properties['loop_total'].is_readonly:
+        mesh.polygons.foreach_set('loop_total', numpy.diff(polygons_offsets).astype(numpy.int32))
+    mesh.update(calc_edges=True)
+
+    # Create the object and link it to the scene
+    mesh_object = bpy.data.objects.new(name, mesh)
+    vmv.scene.link_object_to_scene(input_object=mesh_object)
+
+    # Return a reference to it
+    return mesh_object
+
+
+####################################################################################################
+# @create_mesh_from_triangles
+####################################################################################################
+def create_mesh_from_triangles(vertices,
+                               triangles,
+                               name='Mesh'):
+    """Create a mesh object from arrays of vertices and triangles, link it to the scene and return
+    a reference to it.
+
+    The data are written to the mesh in one shot with foreach_set.
+
+    :param vertices:
+        An (N x 3) array of the XYZ-coordinates of the vertices.
+    :param triangles:
+        An (M x 3) array of the indices of the vertices of the triangles.
+    :param name:
+        The name of the mesh object, by default 'Mesh'.
+    :return:
+        A reference to the created mesh object.
+    """
+
+    triangles = numpy.asarray(triangles).reshape(-1, 3)
+    return create_mesh_from_polygons(
+        vertices=vertices, polygons_vertices=triangles,
+        polygons_offsets=numpy.arange(0, 3 * len(triangles) + 1, 3), name=name)
+
+
+####################################################################################################
+# @create_icospheres_mesh
+####################################################################################################
+def create_icospheres_mesh(centers,
+                           radii,
+                           subdivisions=1,
+                           icosphere_template=None,
+                           name='Icospheres'):
+    """Create a single mesh object of a list of ico-spheres, link it to the scene and return a
+    reference to it.
+
+    The vertices and faces of all the spheres are computed at once by scaling and translating a
+    unit ico-sphere template, and are written to the mesh in one shot with foreach_set, without
+    creating a bmesh per sphere.
+
+    :param centers:
+        An (N x 3) array of the XYZ-coordinates of the centers of the spheres.
+    :param radii:
+        An array of the N radii of the spheres.
+    :param subdivisions:
+        Number of subdivisions of the ico-sphere template, by default 1.
+    :param icosphere_template:
+        An optional [vertices, faces] template of a unit ico-sphere at the origin with triangular
+        faces, by default created with vmv.bmeshi.create_icosphere_template.
+    :param name:
+        The name of the mesh object, by default 'Icospheres'.
+    :return:
+        A reference to the created mesh object.
+    """
+
+    # The template of the sphere
+    if icosphere_template is None:
+        icosphere_template = vmv.bmeshi.create_icosphere_template(subdivisions=subdivisions)
+    template_vertices = numpy.array([v[:] for v in icosphere_template[0]], dtype=numpy.float32)
+    template_faces = numpy.array(icosphere_template[1], dtype=numpy.int32).reshape(-1, 3)
+
+    centers = numpy.asarray(centers, dtype=numpy.float32).reshape(-1, 3)
+    radii = numpy.asarray(radii, dtype=numpy.float32).reshape(-1)
+    number_spheres = len(centers)
+
+    # The vertices of all the spheres
+    vertices = numpy.empty((number_spheres, len(template_vertices), 3), dtype=numpy.float32)
+    numpy.multiply(radii[:, None, None], template_vertices[None, :, :], out=vertices)
+    vertices += centers[:, None, :]
+
+    # The faces of all the spheres, with the vertex indices offset by the sphere
+    faces = numpy.empty((number_spheres, len(template_faces), 3), dtype=numpy.int32)
+    offsets = numpy.arange(number_spheres, dtype=numpy.int32) * len(template_vertices)
+    numpy.add(template_faces[None, :, :], offsets[:, None, None], out=faces)
+
+    # Create the mesh object
+    return create_mesh_from_triangles(
+        vertices=vertices.reshape(-1, 3), triangles=faces.reshape(-1, 3), name=name)
@@ -17,4 +17,6 @@
 
 from .mesh_face_ops import *
 from .mesh_object_ops import *
+from .mesh_sdf_ops import *
+from .mesh_skin_ops import *
 from .mesh_vertex_ops import *
\ No newline at end of file
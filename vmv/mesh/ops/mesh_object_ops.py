@@ -17,11 +17,13 @@
 
 # System imports
 import copy
+import numpy
 
 # Blender imports
 import bpy, bmesh
 
 # Internal imports
+import vmv.bmeshi
 import vmv.bops
 import vmv.consts
 import vmv.scene
@@ -477,7 +479,10 @@ def union_mesh_objects(mesh_object_1,
     bpy.context.object.modifiers["Boolean"].operation = 'UNION'
 
     # apply the union operator
-    bpy.ops.object.modifier_apply(apply_as='DATA', modifier="Boolean")
+    if vmv.utilities.is_blender_290():
+        bpy.ops.object.modifier_apply(modifier="Boolean")
+    else:
+        bpy.ops.object.modifier_apply(apply_as='DATA', modifier="Boolean")
 
     # return the final mesh object, 'a reference to mesh_object1'
     return mesh_object_1
@@ -617,6 +622,120 @@ def join_mesh_objects(mesh_list,
     return result_mesh
 
 
+####################################################################################################
+# @get_mesh_object_triangles
+####################################################################################################
+def get_mesh_object_triangles(mesh_object):
+    """Gets the vertices and the triangles of the faces of a given mesh object as arrays, without
+    modifying the mesh.
+
+    :param mesh_object:
+        A given mesh object.
+    :return:
+        An (N x 3) array of the vertices and an (M x 3) array of the triangles.
+    """
+
+    mesh = mesh_object.data
+
+    # The vertices
+    vertices = numpy.zeros(3 * len(mesh.vertices), dtype=numpy.float32)
+    mesh.vertices.foreach_get('co', vertices)
+
+    # The triangles
+    mesh.calc_loop_triangles()
+    triangles = numpy.zeros(3 * len(mesh.loop_triangles), dtype=numpy.int32)
+    mesh.loop_triangles.foreach_get('vertices', triangles)
+
+    # Return the arrays
+    return vertices.reshape(-1, 3), triangles.reshape(-1, 3)
+
+
+####################################################################################################
+# @clip_mesh_object_to_box
+####################################################################################################
+def clip_mesh_object_to_box(mesh_object,
+                            minimum,
+                            maximum):
+    """Removes the faces of a mesh object whose centers are outside a box, for example to make the
+    meshes of adjacent bricks not overlap.
+
+    :param mesh_object:
+        A given mesh object.
+    :param minimum:
+        The minimum corner of the box, inclusive.
+    :param maximum:
+        The maximum corner of the box, exclusive.
+    """
+
+    # The centers of the faces
+    polygons = mesh_object.data.polygons
+    face_centers = numpy.zeros(3 * len(polygons), dtype=numpy.float32)
+    polygons.foreach_get('center', face_centers)
+    face_centers = face_centers.reshape(-1, 3)
+
+    # The faces outside the box
+    outside = numpy.flatnonzero(
+        ((face_centers < minimum) | (face_centers >= maximum)).any(axis=1))
+    if len(outside) == 0:
+        return
+
+    # Delete them
+    bmesh_object = vmv.bmeshi.create_bmesh_object_from_mesh_object(mesh_object)
+    bmesh_object.faces.ensure_lookup_table()
+    vmv.bmeshi.delete_faces(bmesh_object=bmesh_object,
+                            faces=[bmesh_object.faces[i] for i in outside.tolist()])
+    bmesh_object.to_mesh(mesh_object.data)
+    bmesh_object.free()
+
+
+####################################################################################################
+# @cut_mesh_object_to_box
+####################################################################################################
+def cut_mesh_object_to_box(mesh_object,
+                           minimum,
+                           maximum):
+    """Cuts a closed mesh object with the planes of a box and caps the cuts, so that the mesh
+    remains closed, for example to voxelize only the part of a mesh that is within a brick.
+
+    :param mesh_object:
+        A given closed mesh object.
+    :param minimum:
+        The minimum corner of the box.
+    :param maximum:
+        The maximum corner of the box.
+    """
+
+    bmesh_object = vmv.bmeshi.create_bmesh_object_from_mesh_object(mesh_object)
+    for axis in range(3):
+        for corner, sign in [(minimum, -1.0), (maximum, 1.0)]:
+
+            # Skip the plane if the mesh does not cross it
+            if not any(sign * (vertex.co[axis] - corner[axis]) > 0
+                       for vertex in bmesh_object.verts):
+                continue
+
+            # Remove the geometry on the outer side of the plane
+            plane_normal = [0.0, 0.0, 0.0]
+            plane_normal[axis] = sign
+            plane_point = [0.0, 0.0, 0.0]
+            plane_point[axis] = float(corner[axis])
+            cut = bmesh.ops.bisect_plane(
+                bmesh_object, geom=bmesh_object.verts[:] + bmesh_object.edges[:] +
+                bmesh_object.faces[:], plane_co=plane_point, plane_no=plane_normal,
+                clear_outer=True)
+
+            # Cap the open loops along the cut
+            edges = [element for element in cut['geom_cut']
+                     if isinstance(element, bmesh.types.BMEdge) and element.is_valid and
+                     element.is_boundary]
+            if len(edges) > 0:
+                caps = bmesh.ops.holes_fill(bmesh_object, edges=edges, sides=0)['faces']
+                bmesh.ops.triangulate(bmesh_object, faces=caps)
+
+    bmesh_object.to_mesh(mesh_object.data)
+    bmesh_object.free()
+
+
 ####################################################################################################
 # @remesh_using_voxelization
 ####################################################################################################
@@ -694,3 +813,105 @@ def remove_doubles(mesh_object,
 
     # Switch back to the object mode
     vmv.bops.switch_to_object_mode()
+
+
+####################################################################################################
+# @get_enabled_socket
+####################################################################################################
+def get_enabled_socket(sockets,
+                       name):
+    """Returns the enabled socket with a given name, where some nodes have a socket per data type
+    with the same name and only the one of the current data type is enabled.
+
+    :param sockets:
+        The inputs or outputs of a node.
+    :param name:
+        The name of the socket.
+    :return:
+        A reference to the socket.
+    """
+
+    for socket in sockets:
+        if socket.name == name and socket.enabled:
+            return socket
+    return sockets[name]
+
+
+####################################################################################################
+# @instance_ico_sphere_on_vertices
+####################################################################################################
+def instance_ico_sphere_on_vertices(mesh_object,
+                                    subdivisions=1,
+                                    material=None,
+                                    radius_attribute='radius'):
+    """Instances a single shared ico-sphere on every vertex of a given mesh object using a geometry
+    nodes modifier, where every instance is scaled by the radius attribute of its vertex.
+
+    The instances are not realized, so the memory of the object is proportional to the number of
+    its vertices and not to the number of vertices of all the spheres.
+
+    NOTE: The Instance on Points node requires Blender 3.0 or later.
+
+    :param mesh_object:
+        A given mesh object, typically a point cloud created by create_point_cloud.
+    :param subdivisions:
+        Number of subdivisions of the ico-sphere, by default 1.
+    :param material:
+        The material of the spheres, if any.
+    :param radius_attribute:
+        The name of the float vertex attribute that stores the radii, by default 'radius'.
+    :return:
+        A reference to the geometry nodes modifier.
+    """
+
+    # Create the node tree and its geometry input and output
+    node_tree = bpy.data.node_groups.new('%s_spheres' % mesh_object.name, 'GeometryNodeTree')
+    if hasattr(node_tree, 'interface'):
+        node_tree.interface.new_socket(
+            name='Geometry', in_out='INPUT', socket_type='NodeSocketGeometry')
+        node_tree.interface.new_socket(
+            name='Geometry', in_out='OUTPUT', socket_type='NodeSocketGeometry')
+    else:
+        node_tree.inputs.new('NodeSocketGeometry', 'Geometry')
+        node_tree.outputs.new('NodeSocketGeometry', 'Geometry')
+
+    nodes = node_tree.nodes
+    links = node_tree.links
+    group_input = nodes.new('NodeGroupInput')
+    group_output = nodes.new('NodeGroupOutput')
+
+    # The shared ico-sphere, with a unit radius to be scaled by the radius of every vertex
+    ico_sphere = nodes.new('GeometryNodeMeshIcoSphere')
+    ico_sphere.inputs['Radius'].default_value = 1.0
+    ico_sphere.inputs['Subdivisions'].default_value = subdivisions
+
+    # Smooth shading
+    shade_smooth = nodes.new('GeometryNodeSetShadeSmooth')
+    links.new(get_enabled_socket(ico_sphere.outputs, 'Mesh'), shade_smooth.inputs['Geometry'])
+    sphere_output = shade_smooth.outputs['Geometry']
+
+    # The material of the spheres
+    if material is not None:
+        set_material = nodes.new('GeometryNodeSetMaterial')
+        set_material.inputs['Material'].default_value = material
+        links.new(sphere_output, set_material.inputs['Geometry'])
+        sphere_output = set_material.outputs['Geometry']
+
+    # The radius of every vertex
+    radius = nodes.new('GeometryNodeInputNamedAttribute')
+    radius.data_type = 'FLOAT'
+    radius.inputs['Name'].default_value = radius_attribute
+
+    # Instance the sphere on the vertices
+    instance_on_points = nodes.new('GeometryNodeInstanceOnPoints')
+    links.new(group_input.outputs['Geometry'], instance_on_points.inputs['Points'])
+    links.new(sphere_output, instance_on_points.inputs['Instance'])
+    links.new(get_enabled_socket(radius.outputs, 'Attribute'), instance_on_points.inputs['Scale'])
+    links.new(instance_on_points.outputs['Instances'], group_output.inputs['Geometry'])
+
+    # Add the modifier
+    modifier = mesh_object.modifiers.new(name='Spheres', type='NODES')
+    modifier.node_group = node_tree
+
+    # Return a reference to the modifier
+    return modifier
@@ -0,0 +1,315 @@
+####################################################################################################
+# Copyright (c) 2019 - 2023, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# NOTE: The functions of this module only use numpy and do not access the Blender scene, so they
+# can be executed in worker processes.
+
+# System imports
+import numpy
+
+
+####################################################################################################
+# @build_tetrahedra_triangles_table
+####################################################################################################
+def build_tetrahedra_triangles_table(corners,
+                                     tetrahedra):
+    """Builds the look-up table of the marching tetrahedra, that gives the triangles of the iso-
+    surface in every tetrahedron of a cube for every configuration of the inside corners.
+
+    The triangles are oriented such that their normals point towards the outside corners.
+
+    :param corners:
+        An (8 x 3) array of the offsets of the corners of the cube.
+    :param tetrahedra:
+        An (T x 4) array of the corners of the tetrahedra of the cube.
+    :return:
+        An array of the number of triangles of the 16 configurations, and a (T x 16 x 2 x 3 x 2)
+        array of the triangles of every configuration of every tetrahedron, where every vertex of
+        a triangle is given by the inside and outside corners of the edge it lies on.
+    """
+
+    counts = numpy.zeros(16, dtype=numpy.int64)
+    table = numpy.zeros((len(tetrahedra), 16, 2, 3, 2), dtype=numpy.int64)
+    for i_tetrahedron, tetrahedron in enumerate(tetrahedra):
+        points = corners[tetrahedron].astype(numpy.float64)
+        for code in range(16):
+            inside = [k for k in range(4) if (code >> k) & 1]
+            outside = [k for k in range(4) if not (code >> k) & 1]
+
+            # A single inside (or outside) corner cuts a triangle, otherwise a quad
+            if len(inside) == 1:
+                triangles = [[(inside[0], k) for k in outside]]
+            elif len(inside) == 3:
+                triangles = [[(k, outside[0]) for k in inside]]
+            elif len(inside) == 2:
+                a, b = inside
+                c, d = outside
+                triangles = [[(a, c), (a, d), (b, d)], [(a, c), (b, d), (b, c)]]
+            else:
+                triangles = list()
+
+            # Orient the triangles towards the outside corners
+            direction = points[outside].mean(axis=0) - points[inside].mean(axis=0) \
+                if inside and outside else None
+            for i_triangle, triangle in enumerate(triangles):
+                vertices = [0.5 * (points[i] + points[o]) for i, o in triangle]
+                normal = numpy.cross(vertices[1] - vertices[0], vertices[2] - vertices[0])
+                if numpy.dot(normal, direction) < 0:
+                    triangle = triangle[::-1]
+                table[i_tetrahedron, code, i_triangle] = [
+                    (tetrahedron[i], tetrahedron[o]) for i, o in triangle]
+            counts[code] = len(triangles)
+    return counts, table
+
+
+# The corners of a cube, where the corner i is at the offset (i & 1, (i >> 1) & 1, (i >> 2) & 1)
+CUBE_CORNERS = numpy.array([[i & 1, (i >> 1) & 1, (i >> 2) & 1] for i in range(8)])
+
+# The six tetrahedra of a cube around its main diagonal, that are shared by the neighbouring cubes
+CUBE_TETRAHEDRA = numpy.array([[0, 7, 1, 3], [0, 7, 3, 2], [0, 7, 2, 6],
+                               [0, 7, 6, 4], [0, 7, 4, 5], [0, 7, 5, 1]])
+
+# The look-up table of the marching tetrahedra
+TETRAHEDRA_TRIANGLES_COUNTS, TETRAHEDRA_TRIANGLES = build_tetrahedra_triangles_table(
+    CUBE_CORNERS, CUBE_TETRAHEDRA)
+
+
+####################################################################################################
+# @compute_capsules_signed_distance
+####################################################################################################
+def compute_capsules_signed_distance(points,
+                                     starts,
+                                     ends,
+                                     starts_radii,
+                                     ends_radii,
+                                     chunk_size=1 << 21):
+    """Computes the signed distance from a list of points to the union of a list of capsules,
+    where the radius of every capsule is interpolated linearly between its two ends.
+
+    The distances are computed element-wise, such that the distance of a point is identical
+    regardless of the other points and capsules that are evaluated with it.
+
+    :param points:
+        An (N x 3) array of points.
+    :param starts:
+        An (M x 3) array of the first ends of the capsules.
+    :param ends:
+        An (M x 3) array of the second ends of the capsules.
+    :param starts_radii:
+        An array of the M radii of the capsules at their first ends.
+    :param ends_radii:
+        An array of the M radii of the capsules at their second ends.
+    :param chunk_size:
+        The maximum number of point-capsule pairs that are evaluated at once.
+    :return:
+        An array of the N signed distances, negative inside the union of the capsules.
+    """
+
+    distances = numpy.full(len(points), numpy.inf)
+    if len(points) == 0:
+        return distances
+
+    # The axes of the capsules
+    axes = ends - starts
+    lengths = axes[:, 0] * axes[:, 0] + axes[:, 1] * axes[:, 1] + axes[:, 2] * axes[:, 2]
+    inverse_lengths = numpy.divide(1.0, lengths, out=numpy.zeros_like(lengths), where=lengths > 0)
+    slopes = ends_radii - starts_radii
+
+    # Process the capsules in chunks to bound the memory of the point-capsule pairs
+    step = max(1, chunk_size // len(points))
+    for first in range(0, len(starts), step):
+        chunk = slice(first, first + step)
+        x = points[:, 0, None] - starts[None, chunk, 0]
+        y = points[:, 1, None] - starts[None, chunk, 1]
+        z = points[:, 2, None] - starts[None, chunk, 2]
+
+        # The projection of the points on the axes
+        t = (x * axes[None, chunk, 0] + y * axes[None, chunk, 1] + z * axes[None, chunk, 2]) * \
+            inverse_lengths[None, chunk]
+        numpy.clip(t, 0.0, 1.0, out=t)
+        x -= t * axes[None, chunk, 0]
+        y -= t * axes[None, chunk, 1]
+        z -= t * axes[None, chunk, 2]
+
+        # The distance to the surface of every capsule
+        chunk_distances = numpy.sqrt(x * x + y * y + z * z) - \
+            (starts_radii[None, chunk] + t * slopes[None, chunk])
+        numpy.minimum(distances, chunk_distances.min(axis=1), out=distances)
+    return distances
+
+
+####################################################################################################
+# @polygonize_signed_distance_field
+####################################################################################################
+def polygonize_signed_distance_field(field,
+                                     origin,
+                                     voxel_size,
+                                     offset=(0, 0, 0),
+                                     grid_samples=None):
+    """Extracts the zero iso-surface of a signed distance field that is sampled on a regular grid
+    with the marching tetrahedra, where every cube of the grid is split into six tetrahedra.
+
+    The field can be a block of a larger grid. Every vertex is identified by a key of the edge of
+    the grid that it lies on, such that the meshes of neighbouring blocks can be welded together
+    with @weld_polygonized_blocks.
+
+    :param field:
+        An (X x Y x Z) array of the samples of the field.
+    :param origin:
+        The position of the first sample of the grid.
+    :param voxel_size:
+        The distance between the samples of the grid.
+    :param offset:
+        The index of the first sample of the block in the grid.
+    :param grid_samples:
+        The number of samples of the grid along every axis, by default the shape of the field.
+    :return:
+        An array of the keys of the vertices, an (N x 3) array of the vertices and an (M x 3) array
+        of the triangles of the surface.
+    """
+
+    shape = numpy.array(field.shape, dtype=numpy.int64)
+    grid_samples = shape if grid_samples is None else numpy.asarray(grid_samples, dtype=numpy.int64)
+    values = field.ravel()
+    inside = field < 0
+
+    # The cubes that have inside and outside corners
+    counts = numpy.zeros(shape - 1, dtype=numpy.int64)
+    for dx, dy, dz in CUBE_CORNERS:
+        counts += inside[dx:shape[0] - 1 + dx, dy:shape[1] - 1 + dy, dz:shape[2] - 1 + dz]
+    cubes = numpy.flatnonzero((counts > 0) & (counts < 8))
+    if len(cubes) == 0:
+        return (numpy.zeros(0, dtype=numpy.int64), numpy.zeros((0, 3)),
+                numpy.zeros((0, 3), dtype=numpy.int64))
+
+    # The samples of the corners of the cubes
+    cubes = numpy.ravel_multi_index(numpy.unravel_index(cubes, shape - 1), shape)
+    corners = cubes[:, None] + (CUBE_CORNERS @ numpy.array([shape[1] * shape[2], shape[2], 1]))
+    corners_inside = values[corners] < 0
+
+    # The edges of the triangles of every tetrahedron, as pairs of inside and outside samples
+    edges = list()
+    rows = numpy.arange(len(cubes))[:, None, None]
+    for i_tetrahedron, tetrahedron in enumerate(CUBE_TETRAHEDRA):
+        codes = numpy.zeros(len(cubes), dtype=numpy.int64)
+        for k, corner in enumerate(tetrahedron):
+            codes |= corners_inside[:, corner].astype(numpy.int64) << k
+        for i_triangle in range(2):
+            selected = numpy.flatnonzero(TETRAHEDRA_TRIANGLES_COUNTS[codes] > i_triangle)
+            triangles = TETRAHEDRA_TRIANGLES[i_tetrahedron, codes[selected], i_triangle]
+            edges.append(corners[rows[selected], triangles])
+    edges = numpy.concatenate(edges).reshape(-1, 2)
+
+    # The keys of the edges in the grid. Every edge of a tetrahedron joins a sample to one of its
+    # seven neighbours at a positive offset, so an edge is keyed by its first sample and the code
+    # of this offset, which avoids the overflow of keying it by its two samples in large grids
+    offset = numpy.reshape(offset, (3, 1))
+    samples = numpy.unravel_index(edges.ravel(), shape) + offset
+    global_edges = numpy.ravel_multi_index(samples, grid_samples).reshape(-1, 2)
+    directions = numpy.abs(samples[:, 1::2] - samples[:, 0::2])
+    keys = global_edges.min(axis=1) * 7 + (directions.T @ numpy.array([1, 2, 4]) - 1)
+    keys, first, triangles = numpy.unique(keys, return_index=True, return_inverse=True)
+
+    # Interpolate the vertices along the edges, from the indices of their samples in the grid
+    edges = edges[first]
+    inside_values = values[edges[:, 0]]
+    t = inside_values / (inside_values - values[edges[:, 1]])
+    inside_samples = numpy.transpose(numpy.unravel_index(edges[:, 0], shape) + offset)
+    outside_samples = numpy.transpose(numpy.unravel_index(edges[:, 1], shape) + offset)
+    vertices = numpy.asarray(origin, dtype=numpy.float64) + voxel_size * (
+        inside_samples + t[:, None] * (outside_samples - inside_samples))
+    return keys, vertices, triangles.reshape(-1, 3)
+
+
+####################################################################################################
+# @polygonize_capsules_in_block
+####################################################################################################
+def polygonize_capsules_in_block(starts,
+                                 ends,
+                                 starts_radii,
+                                 ends_radii,
+                                 origin,
+                                 voxel_size,
+                                 offset,
+                                 block_cells,
+                                 grid_samples):
+    """Samples the signed distance field of a list of capsules on a block of a regular grid and
+    extracts its zero iso-surface.
+
+    :param starts:
+        An (M x 3) array of the first ends of the capsules.
+    :param ends:
+        An (M x 3) array of the second ends of the capsules.
+    :param starts_radii:
+        An array of the M radii of the capsules at their first ends.
+    :param ends_radii:
+        An array of the M radii of the capsules at their second ends.
+    :param origin:
+        The position of the first sample of the grid.
+    :param voxel_size:
+        The distance between the samples of the grid.
+    :param offset:
+        The index of the first sample of the block in the grid.
+    :param block_cells:
+        The number of cells of the block along every axis.
+    :param grid_samples:
+        The number of samples of the grid along every axis.
+    :return:
+        An array of the keys of the vertices, an (N x 3) array of the vertices and an (M x 3) array
+        of the triangles of the surface within the block.
+    """
+
+    # The samples of the block, computed from their indices in the grid
+    indices = numpy.arange(block_cells + 1)
+    samples = numpy.stack(numpy.meshgrid(indices, indices, indices, indexing='ij'), axis=-1)
+    points = numpy.asarray(origin, dtype=numpy.float64) + voxel_size * (
+        samples.reshape(-1, 3) + numpy.asarray(offset))
+
+    # Sample the field and extract the surface
+    field = compute_capsules_signed_distance(
+        points, starts, ends, starts_radii, ends_radii).reshape((block_cells + 1,) * 3)
+    return polygonize_signed_distance_field(
+        field=field, origin=origin, voxel_size=voxel_size, offset=offset,
+        grid_samples=grid_samples)
+
+
+####################################################################################################
+# @weld_polygonized_blocks
+####################################################################################################
+def weld_polygonized_blocks(blocks):
+    """Welds the surfaces of the blocks of a grid into a single mesh, where the vertices that lie
+    on the same edge of the grid are merged.
+
+    :param blocks:
+        A list of the keys, vertices and triangles of the surfaces of the blocks.
+    :return:
+        An (N x 3) array of the vertices and an (M x 3) array of the triangles of the mesh.
+    """
+
+    if len(blocks) == 0:
+        return numpy.zeros((0, 3)), numpy.zeros((0, 3), dtype=numpy.int64)
+
+    # Offset the triangles of every block to index the concatenated vertices
+    offsets = numpy.cumsum([0] + [len(keys) for keys, _, _ in blocks])
+    keys = numpy.concatenate([keys for keys, _, _ in blocks])
+    vertices = numpy.concatenate([vertices for _, vertices, _ in blocks])
+    triangles = numpy.concatenate(
+        [triangles + offset for (_, _, triangles), offset in zip(blocks, offsets)])
+
+    # Merge the vertices with the same keys
+    _, first, inverse = numpy.unique(keys, return_index=True, return_inverse=True)
+    return vertices[first], inverse.reshape(-1)[triangles]
@@ -0,0 +1,253 @@
+####################################################################################################
+# Copyright (c) 2019 - 2023, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import concurrent.futures
+import os
+import shutil
+import subprocess
+import tempfile
+import numpy
+
+# Blender imports
+import bpy
+
+# Internal modules
+import vmv.bops
+import vmv.consts
+import vmv.mesh
+import vmv.skeleton
+import vmv.utilities
+
+
+####################################################################################################
+# @set_skin_radii_from_attribute
+####################################################################################################
+def set_skin_radii_from_attribute(mesh_object,
+                                  radius_attribute='radius',
+                                  points=None,
+                                  radii=None):
+    """Sets the radii of the skin vertices of a mesh object, that has a skin modifier, from the
+    float radius attribute of its vertices.
+
+    The radii are read with a single foreach_get and written with a single foreach_set.
+
+    NOTE: The generic mesh attributes only exist from Blender 2.91. With older versions, the radii
+    of the vertices are found by looking up their positions in the given points of the graph,
+    which must be unique, as they are after welding.
+
+    :param mesh_object:
+        A given mesh object with a skin modifier.
+    :param radius_attribute:
+        The name of the float attribute that stores the radii, by default 'radius'.
+    :param points:
+        An (N x 3) array of the positions of the vertices of the graph, used before Blender 2.91.
+    :param radii:
+        An array of the N radii of the vertices of the graph, used before Blender 2.91.
+    """
+
+    mesh = mesh_object.data
+    if vmv.utilities.is_blender_291():
+        vertices_radii = numpy.zeros(len(mesh.vertices), dtype=numpy.float32)
+        mesh.attributes[radius_attribute].data.foreach_get('value', vertices_radii)
+    else:
+
+        # The vertices keep the float32 positions of the points they were created from
+        keys = numpy.ascontiguousarray(points, dtype=numpy.float32).reshape(-1, 3)
+        keys = keys.view('V12').reshape(-1)
+        order = numpy.argsort(keys)
+        vertices = numpy.zeros(3 * len(mesh.vertices), dtype=numpy.float32)
+        mesh.vertices.foreach_get('co', vertices)
+        vertices_radii = numpy.asarray(radii, dtype=numpy.float32)[order[numpy.searchsorted(
+            keys[order], vertices.reshape(-1, 3).view('V12').reshape(-1))]]
+
+    # Every skin vertex has two radii
+    mesh.skin_vertices[0].data.foreach_set('radius', numpy.repeat(vertices_radii, 2))
+
+
+####################################################################################################
+# @skin_graph
+####################################################################################################
+def skin_graph(points,
+               radii,
+               edges,
+               subdivision_level=2,
+               name='Graph'):
+    """Skins a graph with the skin modifier followed by a surface subdivision, and returns the
+    arrays of the resulting mesh.
+
+    The modifiers are evaluated with the dependency graph instead of being applied with operators,
+    so the graph is never selected or activated, and it is removed from the scene afterwards.
+
+    :param points:
+        An (N x 3) array of the positions of the vertices of the graph.
+    :param radii:
+        An array of the N radii of the vertices.
+    :param edges:
+        An (M x 2) array of the edges of the graph.
+    :param subdivision_level:
+        The level of the surface subdivision, by default 2.
+    :param name:
+        The name of the temporary graph object.
+    :return:
+        An (N x 3) array of the vertices of the skinned mesh, an array of the indices of the
+        vertices of all its polygons and an array of the offsets of the polygons in this array.
+    """
+
+    # Create the graph, with the radii of the vertices, and add the skin modifier
+    mesh_object = vmv.mesh.create_graph_mesh(points=points, radii=radii, edges=edges, name=name)
+    mesh = mesh_object.data
+    vmv.bops.create_skin_modifier(mesh_object=mesh_object)
+    set_skin_radii_from_attribute(mesh_object=mesh_object, points=points, radii=radii)
+
+    # Add the subdivision modifier
+    subdivision = mesh_object.modifiers.new(name='Subdivision', type='SUBSURF')
+    subdivision.levels = subdivision_level
+    subdivision.render_levels = subdivision_level
+
+    # Evaluate the modifiers and read the resulting mesh
+    evaluated_object = mesh_object.evaluated_get(bpy.context.evaluated_depsgraph_get())
+    skinned_mesh = evaluated_object.to_mesh()
+    vertices = numpy.zeros(3 * len(skinned_mesh.vertices), dtype=numpy.float32)
+    skinned_mesh.vertices.foreach_get('co', vertices)
+    polygons_vertices = numpy.zeros(len(skinned_mesh.loops), dtype=numpy.int32)
+    skinned_mesh.loops.foreach_get('vertex_index', polygons_vertices)
+    polygons_offsets = numpy.zeros(len(skinned_mesh.polygons) + 1, dtype=numpy.int32)
+    skinned_mesh.polygons.foreach_get('loop_start', polygons_offsets[:-1])
+    polygons_offsets[-1] = len(polygons_vertices)
+    evaluated_object.to_mesh_clear()
+
+    # Remove the graph
+    bpy.data.objects.remove(mesh_object)
+    bpy.data.meshes.remove(mesh)
+    return vertices.reshape(-1, 3), polygons_vertices, polygons_offsets
+
+
+####################################################################################################
+# @skin_graph_partitions_in_batch
+####################################################################################################
+def skin_graph_partitions_in_batch(partitions,
+                                   subdivision_level,
+                                   directory,
+                                   batch_index):
+    """Skins a batch of graph partitions in a background Blender process, where the partitions
+    and the resulting meshes are exchanged as compact arrays in .npz files.
+
+    :param partitions:
+        A list of the positions, radii and edges of the partitions.
+    :param subdivision_level:
+        The level of the surface subdivision.
+    :param directory:
+        A temporary directory to write the .npz files to.
+    :param batch_index:
+        The index of the batch, used to name the .npz files.
+    :return:
+        A list of the vertices, polygons vertices and polygons offsets of the skinned meshes, or
+        None if the process failed.
+    """
+
+    input_file = os.path.join(directory, 'partitions_%d.npz' % batch_index)
+    output_file = os.path.join(directory, 'meshes_%d.npz' % batch_index)
+    vmv.skeleton.save_partitions_arrays(input_file, partitions)
+
+    # Run the worker script in the background
+    worker_script = os.path.join(
+        os.path.dirname(os.path.realpath(__file__)), '../../interface/cli/skinning_worker.py')
+    shell_command = [bpy.app.binary_path, '--background', '--factory-startup',
+                     '--python', worker_script, '--',
+                     input_file, output_file, str(subdivision_level)]
+    process = subprocess.run(shell_command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if process.returncode != 0 or not os.path.exists(output_file):
+        vmv.logger.log('ERROR: The skinning worker of batch [%d] failed: %s' % (
+            batch_index, process.stderr.decode(errors='ignore')[-1000:]))
+        return None
+    return vmv.skeleton.load_partitions_arrays(output_file)
+
+
+####################################################################################################
+# @skin_graph_partitions_in_workers
+####################################################################################################
+def skin_graph_partitions_in_workers(partitions,
+                                     workers,
+                                     subdivision_level=2):
+    """Skins a list of graph partitions in a pool of background Blender processes.
+
+    The partitions are distributed, from the largest to the smallest one, over a few batches per
+    worker to balance the load. The batches of the failed processes, if any, are skinned in the
+    current process.
+
+    :param partitions:
+        A list of the positions, radii and edges of the partitions.
+    :param workers:
+        The number of worker processes.
+    :param subdivision_level:
+        The level of the surface subdivision, by default 2.
+    :return:
+        A list of the vertices, polygons vertices and polygons offsets of the skinned meshes of the
+        partitions, in the same order.
+    """
+
+    if len(partitions) == 0:
+        return list()
+
+    # Distribute the partitions over the batches
+    number_batches = min(len(partitions), workers * vmv.consts.Meshing.SKINNING_BATCHES_PER_WORKER)
+    order = numpy.argsort([-len(edges) for _, _, edges in partitions], kind='stable')
+    batches = [order[i::number_batches].tolist() for i in range(number_batches)]
+
+    # Skin the batches in the worker processes, the threads only wait for the processes
+    directory = tempfile.mkdtemp(prefix='vmv-skinning-')
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(skin_graph_partitions_in_batch,
+                                       [partitions[i] for i in batch], subdivision_level,
+                                       directory, batch_index)
+                       for batch_index, batch in enumerate(batches)]
+            results = [future.result() for future in futures]
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    # Collect the meshes in the order of the partitions
+    meshes = [None] * len(partitions)
+    for batch, result in zip(batches, results):
+        for j, i in enumerate(batch):
+            meshes[i] = result[j] if result is not None else skin_graph(
+                *partitions[i], subdivision_level=subdivision_level)
+    return meshes
+
+
+####################################################################################################
+# @concatenate_polygons_meshes
+####################################################################################################
+def concatenate_polygons_meshes(meshes):
+    """Concatenates the arrays of a list of meshes into the arrays of a single mesh.
+
+    :param meshes:
+        A list of the vertices, polygons vertices and polygons offsets of the meshes.
+    :return:
+        The vertices, polygons vertices and polygons offsets of the concatenated mesh.
+    """
+
+    vertices_offsets = numpy.cumsum([0] + [len(vertices) for vertices, _, _ in meshes])
+    loops_offsets = numpy.cumsum([0] + [len(polygons) for _, polygons, _ in meshes])
+    vertices = numpy.concatenate(
+        [numpy.zeros((0, 3))] + [vertices for vertices, _, _ in meshes])
+    polygons_vertices = numpy.concatenate([numpy.zeros(0, dtype=numpy.int64)] + [
+        polygons + offset for (_, polygons, _), offset in zip(meshes, vertices_offsets)])
+    polygons_offsets = numpy.concatenate([numpy.zeros(1, dtype=numpy.int64)] + [
+        offsets[1:] + offset for (_, _, offsets), offset in zip(meshes, loops_offsets)])
+    return vertices, polygons_vertices, polygons_offsets
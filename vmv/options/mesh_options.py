@@ -55,6 +55,24 @@ class MeshOptions:
         # Automatically detect the resolution of the meta ball object
         self.meta_auto_resolution = True
 
+        # The size of the bricks that the meta ball object is polygonized in, 0 for a single object
+        self.meta_brick_size = 0.0
+
+        # The size of the bricks that the voxelization proxy mesh is re-meshed in, 0 for all at once
+        self.voxel_brick_size = 0.0
+
+        # The number of radius bands that are voxelized at different resolutions, 1 for a single one
+        self.voxel_radius_bands = 1
+
+        # The voxel size of the signed distance field, 0 for half the smallest radius
+        self.sdf_voxel_size = 0.0
+
+        # The number of worker processes that polygonize the blocks of the signed distance field
+        self.sdf_workers = 1
+
+        # The number of background processes that skin the graph partitions, 1 to skin in the scene
+        self.skinning_workers = 1
+
         # Export in circuit coordinates, by default no unless there is a circuit file given
         self.global_coordinates = False
 
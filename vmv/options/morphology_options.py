@@ -79,6 +79,9 @@ class MorphologyOptions:
         # This parameter controls the quality of the reconstructed morphology
         self.bevel_object_sides = vmv.consts.Bevel.BEVEL_OBJECT_SIDES
 
+        # Draw the samples as instances of a single sphere, only for the samples builder
+        self.instance_samples = False
+
         # Morphology material
         self.material = vmv.enums.Shader.LAMBERT_WARD
 
@@ -147,5 +150,8 @@ class MorphologyOptions:
         # Export the morphology to .H5 file
         self.export_h5 = False
 
+        # Export the morphology and its simulation data to a binary .VMVB file
+        self.export_vmvb = False
+
         # Export the morphology skeleton to .BLEND file for rendering using tubes
         self.export_blend = False
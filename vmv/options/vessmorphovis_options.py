@@ -117,6 +117,9 @@ class VessMorphoVisOptions:
         # Bevel object sides used for the branches reconstruction
         self.morphology.bevel_object_sides = arguments.bevel_sides
 
+        # Instance a single sphere on the samples
+        self.morphology.instance_samples = arguments.instance_samples
+
         # Sections radii
         self.morphology.radii = vmv.enums.Morphology.Radii.get_enum(arguments.sections_radii)
 
@@ -158,6 +161,9 @@ class VessMorphoVisOptions:
         # Export the morphology to .vmv file
         self.morphology.export_vmv = arguments.export_morphology_vmv
 
+        # Export the morphology to .vmvb file
+        self.morphology.export_vmvb = arguments.export_morphology_vmvb
+
         # Export the morphology skeleton to .blend file for rendering using tubes
         self.morphology.export_blend = arguments.export_morphology_blend
 
@@ -192,6 +198,24 @@ class VessMorphoVisOptions:
             # Set the value of the MetaBalls resolution as per given by the user
             self.mesh.meta_resolution = float(arguments.meta_balls_resolution)
 
+        # MetaBalls brick size
+        self.mesh.meta_brick_size = arguments.meta_balls_brick_size
+
+        # Voxelization brick size
+        self.mesh.voxel_brick_size = arguments.voxelization_brick_size
+
+        # Voxelization radius bands
+        self.mesh.voxel_radius_bands = max(1, arguments.voxelization_radius_bands)
+
+        # Signed distance field voxel size
+        self.mesh.sdf_voxel_size = arguments.signed_distance_voxel_size
+
+        # Signed distance field worker processes
+        self.mesh.sdf_workers = max(1, arguments.signed_distance_workers)
+
+        # Skinning worker processes
+        self.mesh.skinning_workers = max(1, arguments.skinning_workers)
+
         # Edges of the meshes, either hard or smooth
         self.mesh.edges = vmv.enums.Meshing.Edges.get_enum(arguments.edges)
 
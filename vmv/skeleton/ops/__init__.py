@@ -21,6 +21,8 @@ from .sections_construction_ops import *
 from .skeleton_drawing_ops import *
 from .skeleton_coloring_ops import *
 from .skeleton_geometry_ops import *
+from .skeleton_graph_ops import *
+from .skeleton_metrics_ops import *
 from .skeleton_reconstruction_ops import *
 from .skeleton_resampling_ops import *
 from .skeleton_topology_ops import *
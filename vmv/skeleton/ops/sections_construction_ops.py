@@ -259,3 +259,92 @@ def get_color_coded_sections_poly_lines_based_on_section_index(
 
     # Return the constructed poly-lines
     return vmv.skeleton.PolyLine(samples=samples, color_index=color_index)
+
+
+####################################################################################################
+# @construct_sections_poly_lines_arrays
+####################################################################################################
+def construct_sections_poly_lines_arrays(arrays,
+                                         color_coding,
+                                         color_map_resolution=vmv.consts.Color.COLORMAP_RESOLUTION,
+                                         duplicate_terminal_samples=False):
+    """Constructs the color-coded poly-lines of all the sections of a morphology at once, directly
+    in flat arrays, without creating a @PolyLine per section.
+
+    The color indices are those of the get_color_coded_section_poly_line_* functions for the same
+    color-coding scheme, clamped to the colormap as Blender does for the material indices, but the
+    metrics of all the sections are computed in a single vectorized pass. Since the radii of the
+    arrays are float32, a value at the boundary between two colors can get the adjacent color.
+
+    :param arrays:
+        The @MorphologyArrays of the morphology.
+    :param color_coding:
+        The color-coding scheme of the sections, see enums:color_coding:ColorCoding.
+    :param color_map_resolution:
+        The resolution of the colormap.
+    :param duplicate_terminal_samples:
+        Duplicate the terminal samples to compensate for the nurbs interpolation.
+    :return:
+        A tuple of the @PolyLinesArrays of the sections and the (minimum, maximum) range of the
+        values of the color-coding scheme, or None if the scheme has no range.
+    """
+
+    import numpy
+
+    counts = numpy.diff(arrays.section_offsets).astype(numpy.int64)
+    number_sections = len(counts)
+
+    # The values of the sections and their range for the colormap
+    values = None
+    value_range = None
+    if color_coding == vmv.enums.ColorCoding.ALTERNATING_COLORS:
+        color_indices = arrays.section_indices % 2
+    elif color_coding == vmv.enums.ColorCoding.SHORT_SECTIONS:
+        lengths = arrays.compute_sections_lengths()
+        first_radii = arrays.radii[numpy.minimum(arrays.section_offsets[:-1],
+                                                 max(len(arrays.radii) - 1, 0))]
+        last_radii = arrays.radii[numpy.maximum(arrays.section_offsets[1:] - 1, 0)]
+        color_indices = ((counts > 1) & (lengths < (first_radii + last_radii) * 2)).astype(int)
+    elif color_coding == vmv.enums.ColorCoding.BY_SECTION_INDEX:
+        values = arrays.section_indices
+        value_range = (0, number_sections)
+    elif color_coding in (vmv.enums.ColorCoding.BY_RADIUS,
+                          vmv.enums.ColorCoding.BY_LENGTH,
+                          vmv.enums.ColorCoding.BY_SURFACE_AREA,
+                          vmv.enums.ColorCoding.BY_VOLUME,
+                          vmv.enums.ColorCoding.BY_NUMBER_SAMPLES):
+        values = vmv.skeleton.compute_sections_metrics(arrays)[color_coding]
+        if number_sections > 0:
+            value_range = (values.min().item(), values.max().item())
+        else:
+            value_range = (0, 0)
+    else:
+        color_indices = numpy.zeros(number_sections, dtype=numpy.int32)
+
+    # Map the values to the colormap, where the indices are clamped to the colormap as Blender
+    # does when the index is set to the material index of a spline
+    if values is not None:
+        color_indices = numpy.clip(vmv.utilities.get_indices(
+            values=values, minimum_value=value_range[0], maximum_value=value_range[1],
+            number_steps=color_map_resolution), 0, color_map_resolution - 1)
+
+    # The samples of the poly-lines, where the terminal samples could be duplicated
+    if duplicate_terminal_samples:
+        poly_lines_counts = counts + 2 * (counts > 0)
+        offsets = numpy.zeros(number_sections + 1, dtype=numpy.int64)
+        numpy.cumsum(poly_lines_counts, out=offsets[1:])
+        sections = numpy.repeat(numpy.arange(number_sections), poly_lines_counts)
+        positions = numpy.arange(offsets[-1]) - offsets[sections]
+        samples = arrays.section_offsets[sections] + numpy.clip(
+            positions - 1, 0, counts[sections] - 1)
+    else:
+        offsets = arrays.section_offsets
+        samples = numpy.arange(arrays.get_number_samples())
+
+    points = numpy.ones((len(samples), 4), dtype=numpy.float32)
+    points[:, 0:3] = arrays.points[samples]
+
+    # Return the poly-lines and the range of the values
+    return vmv.skeleton.PolyLinesArrays(
+        points=points, radii=arrays.radii[samples], offsets=offsets,
+        color_indices=color_indices), value_range
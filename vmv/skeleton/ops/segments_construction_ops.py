@@ -452,3 +452,109 @@ def get_color_coded_segments_poly_lines_based_on_alignment(section):
 
     # Return the list of polylines
     return poly_lines
+
+
+####################################################################################################
+# @construct_segments_poly_lines_arrays
+####################################################################################################
+def construct_segments_poly_lines_arrays(arrays,
+                                         color_coding,
+                                         color_map_resolution=vmv.consts.Color.COLORMAP_RESOLUTION):
+    """Constructs the color-coded poly-lines of all the segments of a morphology at once, directly
+    in flat arrays, without creating a @PolyLine per segment.
+
+    The color indices are those of the get_color_coded_segments_poly_lines_* functions for the
+    same color-coding scheme, clamped to the colormap as Blender does for the material indices,
+    but the metrics of all the segments are computed in a single vectorized pass. Since the radii
+    of the arrays are float32, a value at the boundary between two colors can get the adjacent
+    color.
+
+    :param arrays:
+        The @MorphologyArrays of the morphology.
+    :param color_coding:
+        The color-coding scheme of the segments, see enums:color_coding:ColorCoding.
+    :param color_map_resolution:
+        The resolution of the colormap.
+    :return:
+        A tuple of the @PolyLinesArrays of the segments and the (minimum, maximum) range of the
+        values of the color-coding scheme, or None if the scheme has no range.
+    """
+
+    import numpy
+
+    first_samples = vmv.skeleton.get_segments_first_samples(arrays)
+    number_segments = len(first_samples)
+
+    # The section of every sample and the position of the segments along their sections
+    counts = numpy.diff(arrays.section_offsets).astype(numpy.int64)
+    samples_sections = numpy.repeat(numpy.arange(len(counts)), counts)
+    segments_sections = samples_sections[first_samples]
+    segments_positions = first_samples - arrays.section_offsets[segments_sections]
+
+    # The values of the segments and their range for the colormap
+    values = None
+    value_range = None
+    if color_coding == vmv.enums.ColorCoding.ALTERNATING_COLORS:
+        color_indices = segments_positions % 2
+    elif color_coding == vmv.enums.ColorCoding.BY_SEGMENT_INDEX:
+
+        # The first segment index of a section is the number of samples of the preceding ones
+        preceding_samples = numpy.zeros(len(counts) + 1, dtype=numpy.int64)
+        numpy.cumsum(counts, out=preceding_samples[1:])
+        values = preceding_samples[numpy.minimum(
+            arrays.section_indices[segments_sections], len(counts))] + segments_positions
+        value_range = (0, arrays.get_number_samples())
+    elif color_coding == vmv.enums.ColorCoding.BY_SEGMENT_ALIGNMENT:
+
+        # The absolute components of the directions of the segments, in four levels per axis
+        directions = (arrays.points[first_samples + 1] -
+                      arrays.points[first_samples]).astype(numpy.float64)
+        lengths = numpy.linalg.norm(directions, axis=1).reshape(-1, 1)
+        directions = numpy.divide(directions, lengths, out=numpy.zeros_like(directions),
+                                  where=lengths > 0)
+        levels = numpy.minimum((numpy.abs(directions) * 4).astype(int), 3)
+        color_indices = levels[:, 2] + 5 * (levels[:, 1] + 5 * levels[:, 0])
+    elif color_coding in (vmv.enums.ColorCoding.BY_RADIUS,
+                          vmv.enums.ColorCoding.BY_LENGTH,
+                          vmv.enums.ColorCoding.BY_SURFACE_AREA,
+                          vmv.enums.ColorCoding.BY_VOLUME):
+        metrics = vmv.skeleton.compute_segments_metrics(arrays, first_samples)
+        values = metrics[color_coding]
+        range_values = values
+
+        # The range of the radii is that of all the samples
+        if color_coding == vmv.enums.ColorCoding.BY_RADIUS:
+            range_values = arrays.radii
+
+        # NOTE: As in get_color_coded_segments_poly_lines_based_on_surface_area, the range is
+        # that of the surface areas of the segments, while the colors are based on their lateral
+        # areas, without the areas of the caps
+        elif color_coding == vmv.enums.ColorCoding.BY_SURFACE_AREA:
+            r0 = arrays.radii[first_samples].astype(numpy.float64)
+            r1 = arrays.radii[first_samples + 1].astype(numpy.float64)
+            values = values - math.pi * (r0 * r0 + r1 * r1)
+
+        if len(range_values) > 0:
+            value_range = (range_values.min().item(), range_values.max().item())
+        else:
+            value_range = (0, 0)
+    else:
+        color_indices = numpy.zeros(number_segments, dtype=numpy.int32)
+
+    # Map the values to the colormap, where the indices are clamped to the colormap as Blender
+    # does when the index is set to the material index of a spline
+    if values is not None:
+        color_indices = numpy.clip(vmv.utilities.get_indices(
+            values=values, minimum_value=value_range[0], maximum_value=value_range[1],
+            number_steps=color_map_resolution), 0, color_map_resolution - 1)
+
+    # Every segment is a poly-line of two samples
+    samples = numpy.stack((first_samples, first_samples + 1), axis=1).reshape(-1)
+    points = numpy.ones((len(samples), 4), dtype=numpy.float32)
+    points[:, 0:3] = arrays.points[samples]
+
+    # Return the poly-lines and the range of the values
+    return vmv.skeleton.PolyLinesArrays(
+        points=points, radii=arrays.radii[samples],
+        offsets=numpy.arange(0, 2 * number_segments + 1, 2), color_indices=color_indices), \
+        value_range
@@ -534,6 +534,28 @@ def update_poly_lines_radii(poly_lines,
             update_poly_line_radii(poly_line=poly_line, options=options)
 
 
+####################################################################################################
+# @update_poly_lines_arrays_radii
+####################################################################################################
+def update_poly_lines_arrays_radii(poly_lines_arrays,
+                                   options):
+    """Updates the radii of all the poly-lines stored in flat arrays at once.
+
+    :param poly_lines_arrays:
+        A @PolyLinesArrays object of the poly-lines.
+    :param options:
+        Morphology options as set by the user.
+    """
+
+    if options.morphology.radii == vmv.enums.Morphology.Radii.FIXED:
+        poly_lines_arrays.radii[:] = options.morphology.sections_fixed_radii_value
+
+    elif options.morphology.radii == vmv.enums.Morphology.Radii.SCALED:
+        poly_lines_arrays.radii *= options.morphology.sections_radii_scale
+    else:
+        pass
+
+
 
 
 
@@ -0,0 +1,268 @@
+####################################################################################################
+# Copyright (c) 2019 - 2023, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+# Internal imports
+import vmv.skeleton
+
+
+####################################################################################################
+# @build_morphology_graph_arrays
+####################################################################################################
+def build_morphology_graph_arrays(arrays):
+    """Builds the graph of the centerline of a morphology, where every sample is a vertex and every
+    segment is an edge, from the sections that have at least two samples.
+
+    :param arrays:
+        The @MorphologyArrays of the morphology.
+    :return:
+        An (N x 3) array of the positions of the vertices, an array of their N radii and an
+        (M x 2) array of the edges.
+    """
+
+    # The samples of the sections that have at least two samples
+    counts = numpy.diff(arrays.section_offsets)
+    samples = numpy.flatnonzero(numpy.repeat(counts > 1, counts))
+
+    # The edges between the consecutive samples of every section
+    first_samples = vmv.skeleton.get_segments_first_samples(arrays)
+
+    # Index the vertices from the selected samples only
+    vertices = numpy.full(arrays.get_number_samples(), -1, dtype=numpy.int64)
+    vertices[samples] = numpy.arange(len(samples))
+    edges = numpy.stack((vertices[first_samples], vertices[first_samples + 1]), axis=1)
+    return (arrays.points[samples].astype(numpy.float64),
+            arrays.radii[samples].astype(numpy.float64), edges)
+
+
+####################################################################################################
+# @weld_graph_vertices
+####################################################################################################
+def weld_graph_vertices(points,
+                        radii,
+                        edges,
+                        distance):
+    """Merges the vertices of a graph that are closer than a given distance, i.e. the duplicate
+    samples at the ends of the connected sections, and removes the edges that collapse or get
+    duplicated.
+
+    NOTE: The vertices are binned in a grid with the given cell size, and every vertex is only
+    compared to the vertices of its cell and of the neighbouring cells. Like the remove doubles
+    operator, two vertices closer than the distance are merged even if they are on either side of
+    a cell boundary, and the vertices are merged transitively.
+
+    :param points:
+        An (N x 3) array of the positions of the vertices.
+    :param radii:
+        An array of the N radii of the vertices.
+    :param edges:
+        An (M x 2) array of the edges.
+    :param distance:
+        The merge distance.
+    :return:
+        The positions, radii and edges of the welded graph, where every merged vertex keeps the
+        position and radius of the first of its vertices.
+    """
+
+    if len(points) == 0:
+        return points, radii, numpy.zeros((0, 2), dtype=numpy.int64)
+
+    # The cells of the vertices, indexed in a grid around the vertices with a margin of one cell
+    cells = numpy.floor(points / distance).astype(numpy.int64)
+    cells -= cells.min(axis=0) - 1
+    dimensions = cells.max(axis=0) + 2
+    keys = numpy.ravel_multi_index(cells.T, dimensions)
+
+    # The vertices sorted by cell, and the range of the vertices of every occupied cell
+    order = numpy.argsort(keys, kind='stable')
+    unique_keys, starts, counts = numpy.unique(keys[order], return_index=True, return_counts=True)
+    unique_cells = numpy.stack(numpy.unravel_index(unique_keys, dimensions), axis=1)
+
+    # The pairs of vertices in every cell and each of its neighbours that are close enough,
+    # every pair of cells is visited from both sides
+    pairs = [numpy.zeros((0, 2), dtype=numpy.int64)]
+    for offset in numpy.stack(numpy.meshgrid(*[[-1, 0, 1]] * 3, indexing='ij'), -1).reshape(-1, 3):
+        neighbours = numpy.ravel_multi_index((unique_cells + offset).T, dimensions)
+        positions = numpy.minimum(numpy.searchsorted(unique_keys, neighbours), len(unique_keys) - 1)
+        found = numpy.flatnonzero(unique_keys[positions] == neighbours)
+        neighbours = positions[found]
+
+        # All the pairs of the vertices of the cells and of their neighbours
+        pair_counts = counts[found] * counts[neighbours]
+        pair_offsets = numpy.repeat(numpy.cumsum(pair_counts) - pair_counts, pair_counts)
+        local = numpy.arange(pair_counts.sum()) - pair_offsets
+        repeated_counts = numpy.repeat(counts[neighbours], pair_counts)
+        first = order[numpy.repeat(starts[found], pair_counts) + local // repeated_counts]
+        second = order[numpy.repeat(starts[neighbours], pair_counts) + local % repeated_counts]
+
+        close = (first < second) & (numpy.sum(
+            (points[first] - points[second]) ** 2, axis=1) <= distance * distance)
+        pairs.append(numpy.stack((first[close], second[close]), axis=1))
+
+    # Merge the vertices that are connected through the close pairs
+    labels = compute_graph_partitions(len(points), numpy.concatenate(pairs))
+    _, first = numpy.unique(labels, return_index=True)
+    edges = labels[edges]
+
+    # Remove the collapsed and the duplicate edges
+    edges = numpy.sort(edges[edges[:, 0] != edges[:, 1]], axis=1)
+    edges = numpy.unique(edges, axis=0)
+    return points[first], radii[first], edges
+
+
+####################################################################################################
+# @compute_graph_partitions
+####################################################################################################
+def compute_graph_partitions(number_vertices,
+                             edges):
+    """Labels the connected components of a graph by propagating the smallest vertex index along
+    the edges until convergence.
+
+    :param number_vertices:
+        The number of vertices of the graph.
+    :param edges:
+        An (M x 2) array of the edges.
+    :return:
+        An array of the labels of the N vertices, from 0 to the number of partitions - 1.
+    """
+
+    labels = numpy.arange(number_vertices)
+    while True:
+        minimum = numpy.minimum(labels[edges[:, 0]], labels[edges[:, 1]])
+        updated = labels.copy()
+        numpy.minimum.at(updated, edges[:, 0], minimum)
+        numpy.minimum.at(updated, edges[:, 1], minimum)
+
+        # Jump to the labels of the labels
+        updated = updated[updated]
+        if numpy.array_equal(updated, labels):
+            break
+        labels = updated
+    return numpy.unique(labels, return_inverse=True)[1].reshape(-1)
+
+
+####################################################################################################
+# @split_graph_partitions
+####################################################################################################
+def split_graph_partitions(points,
+                           radii,
+                           edges,
+                           labels):
+    """Splits a graph into its partitions, every one with its own vertices and edges.
+
+    :param points:
+        An (N x 3) array of the positions of the vertices.
+    :param radii:
+        An array of the N radii of the vertices.
+    :param edges:
+        An (M x 2) array of the edges.
+    :param labels:
+        An array of the partition labels of the N vertices.
+    :return:
+        A list of the positions, radii and edges of the partitions that have at least an edge.
+    """
+
+    # Sort the vertices and the edges by partition
+    vertices_order = numpy.argsort(labels, kind='stable')
+    local = numpy.empty(len(labels), dtype=numpy.int64)
+    vertices_offsets = numpy.searchsorted(labels[vertices_order], numpy.arange(labels.max() + 2))
+    edges_labels = labels[edges[:, 0]]
+    edges_order = numpy.argsort(edges_labels, kind='stable')
+    edges_offsets = numpy.searchsorted(edges_labels[edges_order], numpy.arange(labels.max() + 2))
+
+    # Index the vertices within their partitions
+    local[vertices_order] = numpy.arange(len(labels)) - numpy.repeat(
+        vertices_offsets[:-1], numpy.diff(vertices_offsets))
+    edges = local[edges[edges_order]]
+
+    partitions = list()
+    for i in range(len(vertices_offsets) - 1):
+        if edges_offsets[i + 1] == edges_offsets[i]:
+            continue
+        vertices = vertices_order[vertices_offsets[i]:vertices_offsets[i + 1]]
+        partitions.append((points[vertices], radii[vertices],
+                           edges[edges_offsets[i]:edges_offsets[i + 1]]))
+    return partitions
+
+
+####################################################################################################
+# @adjust_graph_branching_radii
+####################################################################################################
+def adjust_graph_branching_radii(radii,
+                                 edges):
+    """Sets the radius of every branching vertex of a graph, with more than two edges, to the
+    largest radius of its neighbours, like @adjust_branching_points_radii.
+
+    :param radii:
+        An array of the radii of the vertices.
+    :param edges:
+        An (M x 2) array of the edges.
+    :return:
+        An array of the adjusted radii.
+    """
+
+    degrees = numpy.bincount(edges.ravel(), minlength=len(radii))
+    largest = numpy.zeros(len(radii))
+    numpy.maximum.at(largest, edges[:, 0], radii[edges[:, 1]])
+    numpy.maximum.at(largest, edges[:, 1], radii[edges[:, 0]])
+    return numpy.where(degrees > 2, largest, radii)
+
+
+####################################################################################################
+# @save_partitions_arrays
+####################################################################################################
+def save_partitions_arrays(file_path,
+                           partitions):
+    """Saves a list of partitions, where every partition is a tuple of arrays, to a compact .npz
+    file, where the arrays of every field are concatenated with their offsets.
+
+    :param file_path:
+        The path of the .npz file.
+    :param partitions:
+        A list of tuples of arrays with the same number of fields.
+    """
+
+    fields = dict()
+    for i in range(len(partitions[0]) if partitions else 0):
+        arrays = [numpy.asarray(partition[i]) for partition in partitions]
+        fields['field_%d' % i] = numpy.concatenate(arrays)
+        fields['offsets_%d' % i] = numpy.cumsum([0] + [len(array) for array in arrays])
+    numpy.savez(file_path, **fields)
+
+
+####################################################################################################
+# @load_partitions_arrays
+####################################################################################################
+def load_partitions_arrays(file_path):
+    """Loads a list of partitions saved with @save_partitions_arrays.
+
+    :param file_path:
+        The path of the .npz file.
+    :return:
+        A list of tuples of arrays.
+    """
+
+    with numpy.load(file_path) as data:
+        number_fields = len(data.files) // 2
+        fields = [data['field_%d' % i] for i in range(number_fields)]
+        offsets = [data['offsets_%d' % i] for i in range(number_fields)]
+    if number_fields == 0:
+        return list()
+    return [tuple(field[offset[j]:offset[j + 1]] for field, offset in zip(fields, offsets))
+            for j in range(len(offsets[0]) - 1)]
@@ -0,0 +1,118 @@
+####################################################################################################
+# Copyright (c) 2019 - 2023, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import math
+import numpy
+
+# Internal imports
+import vmv.enums
+
+
+####################################################################################################
+# @get_segments_first_samples
+####################################################################################################
+def get_segments_first_samples(arrays):
+    """Gets the positions of the first samples of all the segments of a morphology, where every
+    segment connects two consecutive samples along a section.
+
+    :param arrays:
+        The @MorphologyArrays of the morphology.
+    :return:
+        An array of the positions of the first samples of the segments in the arrays.
+    """
+
+    # All the samples except the last ones of the sections
+    counts = numpy.diff(arrays.section_offsets)
+    mask = numpy.ones(arrays.get_number_samples(), dtype=bool)
+    mask[arrays.section_offsets[1:][counts > 0] - 1] = False
+    return numpy.flatnonzero(mask)
+
+
+####################################################################################################
+# @compute_segments_metrics
+####################################################################################################
+def compute_segments_metrics(arrays,
+                             first_samples=None):
+    """Computes the average radii, lengths, surface areas and volumes of all the segments of a
+    morphology at once.
+
+    The metrics are computed with the same formulas as compute_segments_surface_areas_in_section
+    and compute_segments_volumes_in_section.
+
+    :param arrays:
+        The @MorphologyArrays of the morphology.
+    :param first_samples:
+        The positions of the first samples of the segments, if already computed.
+    :return:
+        A dictionary mapping the color-coding schemes BY_RADIUS, BY_LENGTH, BY_SURFACE_AREA and
+        BY_VOLUME to the arrays of the corresponding metrics of the segments.
+    """
+
+    if first_samples is None:
+        first_samples = get_segments_first_samples(arrays)
+
+    # The samples of the segments
+    r0 = arrays.radii[first_samples].astype(numpy.float64)
+    r1 = arrays.radii[first_samples + 1].astype(numpy.float64)
+
+    # The lengths, with the same arithmetic as mathutils.Vector, where the differences and their
+    # squares are computed in float32 and the squares are summed in float64
+    differences = (arrays.points[first_samples + 1] -
+                   arrays.points[first_samples]).astype(numpy.float32)
+    lengths = numpy.sqrt((differences * differences).astype(numpy.float64).sum(axis=1))
+
+    # The metrics
+    lateral_areas = math.pi * (r0 + r1) * numpy.sqrt((r0 - r1) * (r0 - r1) + lengths)
+    return {
+        vmv.enums.ColorCoding.BY_RADIUS: 0.5 * (r0 + r1),
+        vmv.enums.ColorCoding.BY_LENGTH: lengths,
+        vmv.enums.ColorCoding.BY_SURFACE_AREA: lateral_areas + math.pi * (r0 * r0 + r1 * r1),
+        vmv.enums.ColorCoding.BY_VOLUME: (1.0 / 3.0) * math.pi * lengths * (
+            r0 * r0 + r0 * r1 + r1 * r1)}
+
+
+####################################################################################################
+# @compute_sections_metrics
+####################################################################################################
+def compute_sections_metrics(arrays):
+    """Computes the average radii, lengths, surface areas, volumes and number of samples of all the
+    sections of a morphology at once, from the metrics of their segments.
+
+    :param arrays:
+        The @MorphologyArrays of the morphology.
+    :return:
+        A dictionary mapping the color-coding schemes BY_RADIUS, BY_LENGTH, BY_SURFACE_AREA,
+        BY_VOLUME and BY_NUMBER_SAMPLES to the arrays of the corresponding metrics of the sections.
+    """
+
+    counts = numpy.diff(arrays.section_offsets)
+    number_sections = len(counts)
+
+    # The section of every segment
+    segments_sections = numpy.repeat(numpy.arange(number_sections), numpy.maximum(counts - 1, 0))
+    segments_metrics = compute_segments_metrics(arrays)
+
+    # The sums of the metrics of the segments of every section
+    metrics = {coding: numpy.bincount(segments_sections, weights=segments_metrics[coding],
+                                      minlength=number_sections)
+               for coding in (vmv.enums.ColorCoding.BY_LENGTH,
+                              vmv.enums.ColorCoding.BY_SURFACE_AREA,
+                              vmv.enums.ColorCoding.BY_VOLUME)}
+    metrics[vmv.enums.ColorCoding.BY_RADIUS] = arrays.compute_sections_average_radii()
+    metrics[vmv.enums.ColorCoding.BY_NUMBER_SAMPLES] = counts
+    return metrics
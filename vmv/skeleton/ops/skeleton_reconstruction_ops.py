@@ -65,6 +65,46 @@ def update_section_parenting(section,
             section.parent_index = i_section.index
 
 
+####################################################################################################
+# @update_sections_parenting
+####################################################################################################
+def update_sections_parenting(sections_list):
+    """Updates the parents' and children references of all the sections in a given list.
+
+    NOTE: This function is equivalent to calling @update_section_parenting for every section in
+    the list, but the sections are looked up by the indices of their terminal samples, and
+    therefore it runs in linear time.
+
+    :param sections_list:
+        A list of all the sections in the morphology.
+    """
+
+    # The sections of the list, keyed by the indices of their first and last samples
+    sections_by_first_sample = dict()
+    sections_by_last_sample = dict()
+    for section in sections_list:
+        sections_by_first_sample.setdefault(section.samples[0].index, list()).append(section)
+        sections_by_last_sample.setdefault(section.samples[-1].index, list()).append(section)
+
+    for section in sections_list:
+
+        # Detect if the section has no parent, then set it as a root
+        if str(section.samples[0].parent_index) == str(-1):
+            section.parent = None
+            section.parent_index = None
+
+        # The sections starting at the last sample of the section are its children
+        for i_section in sections_by_first_sample.get(section.samples[-1].index, list()):
+            if i_section.index != section.index:
+                section.children.append(i_section)
+
+        # The last section ending at the first sample of the section is its parent
+        for i_section in sections_by_last_sample.get(section.samples[0].index, list()):
+            if i_section.index != section.index:
+                section.parent = i_section
+                section.parent_index = i_section.index
+
+
 ####################################################################################################
 # @build_arbors_from_sections
 ####################################################################################################
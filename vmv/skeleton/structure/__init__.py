@@ -17,7 +17,11 @@
 
 # Internal imports
 from .morphology import *
+from .morphology_arrays import *
 from .polyline import * 
+from .poly_lines_arrays import *
 from .sample import *
 from .section import *
+from .simulation_data import *
+from .simulation_statistics import *
 from .edge_section import *
@@ -23,6 +23,7 @@ import vmv.bbox
 import vmv.bmeshi
 import vmv.consts
 import vmv.mesh
+import vmv.skeleton
 import vmv.utilities
 
 
@@ -47,7 +48,11 @@ class Morphology:
                  bounding_box=None,
                  radius_simulation_data=None,
                  flow_simulation_data=None,
-                 pressure_simulation_data=None):
+                 pressure_simulation_data=None,
+                 arrays=None,
+                 radius_simulation_statistics=None,
+                 flow_simulation_statistics=None,
+                 pressure_simulation_statistics=None):
         """Constructor
 
         :param name:
@@ -72,6 +77,16 @@ class Morphology:
             Flow simulation data.
         :param pressure_simulation_data:
             Pressure simulation data.
+        :param arrays:
+            An optional @MorphologyArrays object. If given without a sections list, the sections
+            list and the roots are the lazy views of the arrays.
+        :param radius_simulation_statistics:
+            The @SimulationStatistics of the radius simulation data, if already known, for example
+            from the metadata of the file. Otherwise, they are computed once on demand.
+        :param flow_simulation_statistics:
+            The @SimulationStatistics of the flow simulation data, if already known.
+        :param pressure_simulation_statistics:
+            The @SimulationStatistics of the pressure simulation data, if already known.
         """
 
         # Morphology name
@@ -86,6 +101,15 @@ class Morphology:
         # Morphology file path
         self.file_path = file_path
 
+        # The structure-of-arrays representation of the morphology, if any
+        self.arrays = arrays
+
+        # Use the lazy views of the arrays if no sections are given
+        if arrays is not None and sections_list is None:
+            sections_list = arrays.get_sections_list()
+            if roots is None:
+                roots = arrays.get_roots()
+
         # A list of all the sections that were extracted from the loaded data
         self.sections_list = sections_list
 
@@ -131,6 +155,11 @@ class Morphology:
 
         # self.has_pressure_simulation = True
 
+        # The statistics of the simulation data, shared by all the builders and the panels
+        self.radius_simulation_statistics = radius_simulation_statistics
+        self.flow_simulation_statistics = flow_simulation_statistics
+        self.pressure_simulation_statistics = pressure_simulation_statistics
+
     ################################################################################################
     # @has_simulation_data
     ################################################################################################
@@ -156,6 +185,135 @@ class Morphology:
         # Otherwise false
         return False
 
+    ################################################################################################
+    # @get_simulation_data_at_step
+    ################################################################################################
+    @staticmethod
+    def get_simulation_data_at_step(simulation_data,
+                                    time_step):
+        """Returns the values of all the vertices at a given time step of some simulation data.
+
+        NOTE: For lazily-loaded or memory-mapped data, only the requested time step is loaded.
+
+        :param simulation_data:
+            The (vertex x step) simulation data.
+        :param time_step:
+            The time step.
+        :return:
+            An array of the values of all the vertices at the time step.
+        """
+
+        import numpy
+
+        # Arrays and lazily-loaded simulation data
+        if hasattr(simulation_data, 'shape'):
+            return numpy.asarray(simulation_data[:, time_step])
+
+        # A list of the values of every vertex
+        return numpy.array([values[time_step] for values in simulation_data])
+
+    ################################################################################################
+    # @get_simulation_data_number_steps
+    ################################################################################################
+    @staticmethod
+    def get_simulation_data_number_steps(simulation_data):
+        """Returns the number of time steps of some simulation data.
+
+        :param simulation_data:
+            The (vertex x step) simulation data.
+        :return:
+            The number of time steps, or zero if there are no simulation data.
+        """
+
+        if simulation_data is None or len(simulation_data) == 0:
+            return 0
+        if hasattr(simulation_data, 'shape'):
+            return simulation_data.shape[1]
+        return len(simulation_data[0])
+
+    ################################################################################################
+    # @get_radius_simulation_data_at_step
+    ################################################################################################
+    def get_radius_simulation_data_at_step(self,
+                                           time_step):
+        """Returns the radii of all the vertices at a given time step of the radius simulation.
+
+        :param time_step:
+            The time step.
+        :return:
+            An array of the radii of all the vertices, indexed by (sample.index - 1).
+        """
+
+        return self.get_simulation_data_at_step(self.radius_simulation_data, time_step)
+
+    ################################################################################################
+    # @get_number_radius_simulation_steps
+    ################################################################################################
+    def get_number_radius_simulation_steps(self):
+        """Returns the number of time steps of the radius simulation.
+
+        :return:
+            The number of time steps, or zero if the morphology has no radius simulation.
+        """
+
+        if not self.has_radius_simulation:
+            return 0
+        return self.get_simulation_data_number_steps(self.radius_simulation_data)
+
+    ################################################################################################
+    # @get_radius_simulation_statistics
+    ################################################################################################
+    def get_radius_simulation_statistics(self):
+        """Returns the statistics of the radius simulation data, computed once on demand.
+
+        :return:
+            The @SimulationStatistics of the radius simulation data, or None if the morphology has
+            no radius simulation.
+        """
+
+        if not self.has_radius_simulation:
+            return None
+        if self.radius_simulation_statistics is None:
+            self.radius_simulation_statistics = vmv.skeleton.compute_simulation_statistics(
+                self.radius_simulation_data)
+        return self.radius_simulation_statistics
+
+    ################################################################################################
+    # @get_flow_simulation_statistics
+    ################################################################################################
+    def get_flow_simulation_statistics(self):
+        """Returns the statistics of the flow simulation data, computed once on demand.
+
+        :return:
+            The @SimulationStatistics of the flow simulation data, or None if the morphology has
+            no flow simulation.
+        """
+
+        if not self.has_flow_simulation:
+            return None
+        if self.flow_simulation_statistics is None:
+            self.flow_simulation_statistics = vmv.skeleton.compute_simulation_statistics(
+                self.flow_simulation_data)
+        return self.flow_simulation_statistics
+
+    ################################################################################################
+    # @get_pressure_simulation_statistics
+    ################################################################################################
+    def get_pressure_simulation_statistics(self):
+        """Returns the statistics of the pressure simulation data, computed once on demand.
+
+        :return:
+            The @SimulationStatistics of the pressure simulation data, or None if the morphology
+            has no pressure simulation.
+        """
+
+        if not self.has_pressure_simulation:
+            return None
+        if self.pressure_simulation_statistics is None:
+            self.pressure_simulation_statistics = vmv.skeleton.compute_simulation_statistics(
+                self.pressure_simulation_data)
+        return self.pressure_simulation_statistics
+
     ################################################################################################
     # @get_center
     ################################################################################################
@@ -177,6 +335,11 @@ class Morphology:
         if self.bounding_box is not None:
             return self.bounding_box
 
+        # Use the arrays if available
+        if self.arrays is not None:
+            self.bounding_box = self.arrays.compute_bounding_box()
+            return self.bounding_box
+
         # Otherwise, compute it
         # Initialize the min and max points
         infinity = vmv.consts.Math.INFINITY
@@ -189,10 +352,8 @@ class Morphology:
             # Make sure you cover all the samples of the section
             for sample in section.samples:
 
-                # Coordinates
-                x = sample.point[0]
-                y = sample.point[1]
-                z = sample.point[2]
+                # Coordinates, without creating the Vector of the sample
+                x, y, z = sample.get_coordinates()
 
                 # PMinimum
                 if x < p_min[0]:
@@ -216,6 +377,25 @@ class Morphology:
         # Return the bounding box
         return self.bounding_box
 
+    ################################################################################################
+    # @get_arrays
+    ################################################################################################
+    def get_arrays(self):
+        """Returns the structure-of-arrays representation of the morphology, and constructs it from
+        the sections list if it does not exist.
+
+        NOTE: The arrays are a snapshot of the sections list, and must be constructed after any
+        operation that adds or removes samples, such as the resampling.
+
+        :return:
+            A reference to the @MorphologyArrays object of the morphology.
+        """
+
+        if self.arrays is None:
+            self.arrays = vmv.skeleton.construct_morphology_arrays_from_sections(
+                self.sections_list)
+        return self.arrays
+
     ################################################################################################
     # @reset_traversal_states
     ################################################################################################
@@ -368,19 +548,44 @@ class Morphology:
         if self.section_connectivity_available:
             return
 
+        # No two terminal samples can be closer than a non-positive threshold
+        if threshold <= 0 or len(self.sections_list) == 0:
+            return
+
+        import numpy
+
+        # A list of the terminal samples of all the sections, the first and last samples of the
+        # i-th section are stored at 2i and 2i + 1 respectively
+        terminal_points = numpy.array(
+            [sample.get_coordinates() for section in self.sections_list
+             for sample in (section.samples[0], section.samples[-1])], dtype=numpy.float64)
+
+        # Find the close terminal samples with a spatial grid and convert them into section pairs
+        points_i, points_j = vmv.utilities.get_close_points_pairs(terminal_points, threshold)
+        pairs = numpy.unique((points_i // 2) * len(self.sections_list) + (points_j // 2))
+
+        # A list of the candidate sections of every section, in the order of the sections list to
+        # keep the order of the parents and children similar to that of an exhaustive comparison
+        candidates = [list() for _ in range(len(self.sections_list))]
+        for i, j in zip((pairs // len(self.sections_list)).tolist(),
+                        (pairs % len(self.sections_list)).tolist()):
+            candidates[i].append(j)
+
         # Verify the installation of the tqdm module in the system
+        _loop = range(len(self.sections_list))
         tqdm = vmv.utilities.import_module('tqdm')
         if tqdm:
-            _loop = tqdm.tqdm(self.sections_list, desc='\t* Establishing Connectivity')
-        else:
-            _loop = self.sections_list
+            _loop = tqdm.tqdm(_loop, desc='\t* Establishing Connectivity')
 
-        # Do it on a per-section-basis
-        for i_section in _loop:
+        # Do it on a per-section-basis, only for the candidate sections
+        for i in _loop:
+            i_section = self.sections_list[i]
             i_first_sample = i_section.samples[0]
             i_last_sample = i_section.samples[-1]
 
-            for j_section in self.sections_list:
+            for j in candidates[i]:
+                j_section = self.sections_list[j]
+
                 if i_section.index == j_section.index:
 
                     # This is the same section, continue
@@ -0,0 +1,462 @@
+####################################################################################################
+# Copyright (c) 2019 - 2023, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+# Blender imports
+from mathutils import Vector
+
+# Internal imports
+import vmv.bbox
+from .section import Section
+
+
+####################################################################################################
+# MorphologyArrays
+####################################################################################################
+class MorphologyArrays:
+    """A structure-of-arrays representation of the morphology skeleton.
+
+    NOTE: The samples of all the sections are stored contiguously, where the samples of the i-th
+    section are those in the range [section_offsets[i], section_offsets[i + 1]). The connectivity
+    between the sections is stored in the compressed sparse row (CSR) format, where the parents of
+    the i-th section are parents[parents_offsets[i]:parents_offsets[i + 1]], and similarly for
+    the children. The existing callers use the lazy @SectionView and @SampleView objects that are
+    only created on demand and read from (and write to) the arrays.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 points,
+                 radii,
+                 section_offsets,
+                 section_indices=None,
+                 sample_indices=None,
+                 parents_offsets=None,
+                 parents=None,
+                 children_offsets=None,
+                 children=None):
+        """Constructor
+
+        :param points:
+            An array of (N x 3) points of all the samples.
+        :param radii:
+            An array of N radii of all the samples.
+        :param section_offsets:
+            An array of (S + 1) offsets of the samples of the sections.
+        :param section_indices:
+            An array of S indices of the sections, if None, the sections are indexed in order.
+        :param sample_indices:
+            An array of N indices of the samples, if None, the samples have no indices.
+        :param parents_offsets:
+            An array of (S + 1) offsets of the parents of the sections in the CSR format.
+        :param parents:
+            An array of the parents of the sections in the CSR format.
+        :param children_offsets:
+            An array of (S + 1) offsets of the children of the sections in the CSR format.
+        :param children:
+            An array of the children of the sections in the CSR format.
+        """
+
+        # The points of all the samples, contiguous float32
+        self.points = numpy.ascontiguousarray(points, dtype=numpy.float32).reshape(-1, 3)
+
+        # The radii of all the samples, contiguous float32
+        self.radii = numpy.ascontiguousarray(radii, dtype=numpy.float32).reshape(-1)
+
+        # The offsets of the samples of the sections
+        self.section_offsets = numpy.ascontiguousarray(section_offsets, dtype=numpy.int32)
+
+        # The number of sections
+        number_sections = len(self.section_offsets) - 1
+
+        # The indices of the sections
+        if section_indices is None:
+            section_indices = numpy.arange(number_sections)
+        self.section_indices = numpy.ascontiguousarray(section_indices, dtype=numpy.int32)
+
+        # The indices of the samples, if any
+        self.sample_indices = None
+        if sample_indices is not None:
+            self.sample_indices = numpy.ascontiguousarray(sample_indices, dtype=numpy.int32)
+
+        # The connectivity, by default the sections are disconnected
+        empty_offsets = numpy.zeros(number_sections + 1, dtype=numpy.int32)
+        empty_links = numpy.zeros(0, dtype=numpy.int32)
+        self.parents_offsets = numpy.ascontiguousarray(
+            parents_offsets if parents_offsets is not None else empty_offsets, dtype=numpy.int32)
+        self.parents = numpy.ascontiguousarray(
+            parents if parents is not None else empty_links, dtype=numpy.int32)
+        self.children_offsets = numpy.ascontiguousarray(
+            children_offsets if children_offsets is not None else empty_offsets, dtype=numpy.int32)
+        self.children = numpy.ascontiguousarray(
+            children if children is not None else empty_links, dtype=numpy.int32)
+
+        # The section views, created on demand
+        self.section_views = [None] * number_sections
+
+    ################################################################################################
+    # @get_number_samples
+    ################################################################################################
+    def get_number_samples(self):
+        """Returns the total number of samples in the morphology.
+
+        :return:
+            The total number of samples in the morphology.
+        """
+
+        return len(self.radii)
+
+    ################################################################################################
+    # @get_number_sections
+    ################################################################################################
+    def get_number_sections(self):
+        """Returns the number of sections in the morphology.
+
+        :return:
+            The number of sections in the morphology.
+        """
+
+        return len(self.section_offsets) - 1
+
+    ################################################################################################
+    # @get_section
+    ################################################################################################
+    def get_section(self,
+                    i):
+        """Returns the view of the i-th section.
+
+        NOTE: The view is created once and cached to keep its identity and traversal state.
+
+        :param i:
+            The position of the section in the arrays.
+        :return:
+            A reference to the @SectionView of the section.
+        """
+
+        if self.section_views[i] is None:
+            self.section_views[i] = SectionView(arrays=self, position=i)
+        return self.section_views[i]
+
+    ################################################################################################
+    # @get_sections_list
+    ################################################################################################
+    def get_sections_list(self):
+        """Returns a list of the views of all the sections.
+
+        :return:
+            A list of the @SectionView objects of all the sections.
+        """
+
+        return [self.get_section(i) for i in range(self.get_number_sections())]
+
+    ################################################################################################
+    # @get_roots
+    ################################################################################################
+    def get_roots(self):
+        """Returns a list of the views of the root sections, i.e. those without parents.
+
+        :return:
+            A list of the @SectionView objects of the root sections.
+        """
+
+        return [self.get_section(i) for i in
+                numpy.flatnonzero(numpy.diff(self.parents_offsets) == 0).tolist()]
+
+    ################################################################################################
+    # @compute_bounding_box
+    ################################################################################################
+    def compute_bounding_box(self):
+        """Computes the bounding box of all the samples.
+
+        :return:
+            The bounding box of the morphology.
+        """
+
+        return vmv.bbox.compute_bounding_box_for_array_of_points(self.points)
+
+    ################################################################################################
+    # @compute_segments_lengths
+    ################################################################################################
+    def compute_segments_lengths(self):
+        """Computes the lengths of the segments between every two consecutive samples.
+
+        NOTE: The segment connecting the last sample of a section to the first sample of the next
+        one does not exist, and its length is set to zero.
+
+        :return:
+            An array of N lengths, where the i-th one is that of the segment (i, i + 1).
+        """
+
+        lengths = numpy.zeros(self.get_number_samples(), dtype=numpy.float32)
+        lengths[:-1] = numpy.linalg.norm(numpy.diff(self.points, axis=0), axis=1)
+        lengths[self.section_offsets[1:] - 1] = 0.0
+        return lengths
+
+    ################################################################################################
+    # @compute_sections_lengths
+    ################################################################################################
+    def compute_sections_lengths(self):
+        """Computes the lengths of all the sections.
+
+        :return:
+            An array of S lengths of the sections.
+        """
+
+        cumulative = numpy.zeros(self.get_number_samples() + 1, dtype=numpy.float64)
+        numpy.cumsum(self.compute_segments_lengths(), out=cumulative[1:])
+        return cumulative[self.section_offsets[1:]] - cumulative[self.section_offsets[:-1]]
+
+    ################################################################################################
+    # @compute_sections_average_radii
+    ################################################################################################
+    def compute_sections_average_radii(self):
+        """Computes the average radii of all the sections.
+
+        :return:
+            An array of S average radii of the sections, zero for the empty ones.
+        """
+
+        cumulative = numpy.zeros(self.get_number_samples() + 1, dtype=numpy.float64)
+        numpy.cumsum(self.radii, out=cumulative[1:])
+        counts = numpy.diff(self.section_offsets)
+        sums = cumulative[self.section_offsets[1:]] - cumulative[self.section_offsets[:-1]]
+        return numpy.divide(sums, counts, out=numpy.zeros(len(counts)), where=counts > 0)
+
+
+####################################################################################################
+# SampleView
+####################################################################################################
+class SampleView:
+    """A lazy view of a sample stored in a @MorphologyArrays object.
+
+    NOTE: The point is returned as a new Vector, so it must be assigned to be updated.
+    """
+
+    # A view has no dictionary, only a reference to the arrays and its position
+    __slots__ = ('arrays', 'position')
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 arrays,
+                 position):
+        """Constructor
+
+        :param arrays:
+            A reference to the @MorphologyArrays object.
+        :param position:
+            The position of the sample in the arrays.
+        """
+
+        self.arrays = arrays
+        self.position = position
+
+    @property
+    def point(self):
+        return Vector(self.arrays.points[self.position].tolist())
+
+    @point.setter
+    def point(self, point):
+        self.arrays.points[self.position] = (point[0], point[1], point[2])
+
+    def get_coordinates(self):
+        return self.arrays.points[self.position]
+
+    @property
+    def radius(self):
+        return float(self.arrays.radii[self.position])
+
+    @radius.setter
+    def radius(self, radius):
+        self.arrays.radii[self.position] = radius
+
+    @property
+    def index(self):
+        if self.arrays.sample_indices is None:
+            return None
+        return int(self.arrays.sample_indices[self.position])
+
+    @property
+    def parent_index(self):
+        return None
+
+
+####################################################################################################
+# SectionView
+####################################################################################################
+class SectionView(Section):
+    """A lazy view of a section stored in a @MorphologyArrays object.
+
+    NOTE: The samples, parents and children lists are only created when they are accessed for the
+    first time. The lists can be modified afterwards, but the changes are not reflected back to
+    the arrays, except the points and radii of the samples.
+    """
+
+    # The attributes of the view, in addition to those of the section
+    __slots__ = ('arrays', 'position', '_samples', '_parents', '_children')
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 arrays,
+                 position):
+        """Constructor
+
+        :param arrays:
+            A reference to the @MorphologyArrays object.
+        :param position:
+            The position of the section in the arrays.
+        """
+
+        # A reference to the arrays
+        self.arrays = arrays
+
+        # The position of the section in the arrays
+        self.position = position
+
+        # Section index
+        self.index = int(arrays.section_indices[position])
+
+        # The samples, parents and children lists, created on demand
+        self._samples = None
+        self._parents = None
+        self._children = None
+
+        # Traversal flag
+        self.traversed = False
+
+        # The average radius of the first sample w.r.t to pre-connected-sections
+        self.first_sample_average_radius = 0
+
+        # The average radius of the last sample w.r.t post-connected sections
+        self.last_sample_average_radius = 0
+
+        # The parent section and its index, and the type are unused with the arrays
+        self.parent = None
+        self.parent_index = None
+        self.type = None
+
+    @property
+    def samples(self):
+        if self._samples is None:
+            self._samples = [SampleView(self.arrays, i) for i in range(
+                int(self.arrays.section_offsets[self.position]),
+                int(self.arrays.section_offsets[self.position + 1]))]
+        return self._samples
+
+    @samples.setter
+    def samples(self, samples):
+        self._samples = samples
+
+    @property
+    def parents(self):
+        if self._parents is None:
+            self._parents = [self.arrays.get_section(i) for i in self.arrays.parents[
+                self.arrays.parents_offsets[self.position]:
+                self.arrays.parents_offsets[self.position + 1]].tolist()]
+        return self._parents
+
+    @parents.setter
+    def parents(self, parents):
+        self._parents = parents
+
+    @property
+    def children(self):
+        if self._children is None:
+            self._children = [self.arrays.get_section(i) for i in self.arrays.children[
+                self.arrays.children_offsets[self.position]:
+                self.arrays.children_offsets[self.position + 1]].tolist()]
+        return self._children
+
+    @children.setter
+    def children(self, children):
+        self._children = children
+
+
+####################################################################################################
+# @construct_csr_adjacency
+####################################################################################################
+def construct_csr_adjacency(links,
+                            number_sections):
+    """Constructs a CSR adjacency from a list of links.
+
+    :param links:
+        An array of (L x 2) links, where every link is (source, target).
+    :param number_sections:
+        The number of sections.
+    :return:
+        A tuple (offsets, targets), where the targets of the i-th section are
+        targets[offsets[i]:offsets[i + 1]] in the same order of the links.
+    """
+
+    links = numpy.asarray(links, dtype=numpy.int64).reshape(-1, 2)
+    order = numpy.argsort(links[:, 0], kind='stable')
+    offsets = numpy.zeros(number_sections + 1, dtype=numpy.int32)
+    numpy.cumsum(numpy.bincount(links[:, 0], minlength=number_sections), out=offsets[1:])
+    return offsets, links[order, 1].astype(numpy.int32)
+
+
+####################################################################################################
+# @construct_morphology_arrays_from_sections
+####################################################################################################
+def construct_morphology_arrays_from_sections(sections_list):
+    """Constructs a @MorphologyArrays object from a list of sections.
+
+    :param sections_list:
+        A list of sections.
+    :return:
+        A reference to the @MorphologyArrays object.
+    """
+
+    # The offsets of the samples
+    section_offsets = numpy.zeros(len(sections_list) + 1, dtype=numpy.int32)
+    numpy.cumsum([len(section.samples) for section in sections_list], out=section_offsets[1:])
+
+    # The samples
+    samples = [sample for section in sections_list for sample in section.samples]
+    points = numpy.array([sample.get_coordinates() for sample in samples],
+                         dtype=numpy.float32).reshape(-1, 3)
+    radii = numpy.array([sample.radius for sample in samples], dtype=numpy.float32)
+    sample_indices = None
+    if len(samples) > 0 and all(sample.index is not None for sample in samples):
+        sample_indices = numpy.array([sample.index for sample in samples], dtype=numpy.int32)
+
+    # The indices of the sections
+    section_indices = [section.index if section.index is not None else i
+                       for i, section in enumerate(sections_list)]
+
+    # The connectivity, using the positions of the sections in the list
+    positions = {id(section): i for i, section in enumerate(sections_list)}
+    parents_offsets, parents = construct_csr_adjacency(
+        [[i, positions[id(parent)]] for i, section in enumerate(sections_list)
+         for parent in section.parents], len(sections_list))
+    children_offsets, children = construct_csr_adjacency(
+        [[i, positions[id(child)]] for i, section in enumerate(sections_list)
+         for child in section.children], len(sections_list))
+
+    # Construct the arrays
+    return MorphologyArrays(
+        points=points, radii=radii, section_offsets=section_offsets,
+        section_indices=section_indices, sample_indices=sample_indices,
+        parents_offsets=parents_offsets, parents=parents,
+        children_offsets=children_offsets, children=children)
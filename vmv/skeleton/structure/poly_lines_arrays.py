@@ -0,0 +1,116 @@
+####################################################################################################
+# Copyright (c) 2019 - 2023, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+# Internal imports
+from .polyline import PolyLine
+
+
+####################################################################################################
+# PolyLinesArrays
+####################################################################################################
+class PolyLinesArrays:
+    """A list of poly-lines stored in flat arrays, in the layout that is set directly to the splines
+    of a Blender curve with foreach_set, without creating a @PolyLine per section or segment.
+    """
+
+    # No dictionary, only the arrays
+    __slots__ = ('points', 'radii', 'offsets', 'color_indices')
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 points,
+                 radii,
+                 offsets,
+                 color_indices):
+        """Constructor
+
+        :param points:
+            An array of (N x 4) points [X, Y, Z, 1] of all the samples of the poly-lines.
+        :param radii:
+            An array of N radii of all the samples of the poly-lines.
+        :param offsets:
+            An array of (M + 1) offsets of the samples of the poly-lines.
+        :param color_indices:
+            An array of M color (or material) indices of the poly-lines.
+        """
+
+        # The points of all the samples, contiguous float32
+        self.points = numpy.ascontiguousarray(points, dtype=numpy.float32).reshape(-1, 4)
+
+        # The radii of all the samples, contiguous float32
+        self.radii = numpy.ascontiguousarray(radii, dtype=numpy.float32).reshape(-1)
+
+        # The offsets of the samples of the poly-lines
+        self.offsets = numpy.ascontiguousarray(offsets, dtype=numpy.int64)
+
+        # The color indices of the poly-lines
+        self.color_indices = numpy.ascontiguousarray(color_indices, dtype=numpy.int32)
+
+    ################################################################################################
+    # @__len__
+    ################################################################################################
+    def __len__(self):
+        """Returns the number of poly-lines.
+
+        :return:
+            The number of poly-lines.
+        """
+
+        return len(self.offsets) - 1
+
+    ################################################################################################
+    # @get_poly_lines
+    ################################################################################################
+    def get_poly_lines(self):
+        """Returns a list of @PolyLine objects of the poly-lines.
+
+        :return:
+            A list of poly-lines.
+        """
+
+        samples = [[tuple(point), radius]
+                   for point, radius in zip(self.points.tolist(), self.radii.tolist())]
+        return [PolyLine(samples=samples[start:end], color_index=color_index)
+                for start, end, color_index in zip(self.offsets[:-1].tolist(),
+                                                   self.offsets[1:].tolist(),
+                                                   self.color_indices.tolist())]
+
+
+####################################################################################################
+# @construct_poly_lines_arrays_from_poly_lines
+####################################################################################################
+def construct_poly_lines_arrays_from_poly_lines(poly_lines):
+    """Constructs a @PolyLinesArrays object from a list of poly-lines.
+
+    :param poly_lines:
+        A list of @PolyLine objects.
+    :return:
+        A reference to the @PolyLinesArrays object.
+    """
+
+    offsets = numpy.zeros(len(poly_lines) + 1, dtype=numpy.int64)
+    numpy.cumsum([len(poly_line.samples) for poly_line in poly_lines], out=offsets[1:])
+    return PolyLinesArrays(
+        points=[sample[0] for poly_line in poly_lines for sample in poly_line.samples],
+        radii=[sample[1] for poly_line in poly_lines for sample in poly_line.samples],
+        offsets=offsets,
+        color_indices=[poly_line.color_index for poly_line in poly_lines])
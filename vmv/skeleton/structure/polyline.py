@@ -26,6 +26,9 @@ class PolyLine:
     or the segment.
     """
 
+    # No dictionary per polyline
+    __slots__ = ('samples', 'color_index')
+
     ################################################################################################
     # @__init__
     ################################################################################################
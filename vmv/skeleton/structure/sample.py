@@ -15,6 +15,9 @@
 # If not, see <http://www.gnu.org/licenses/>.
 ####################################################################################################
 
+# Blender imports
+from mathutils import Vector
+
 
 ####################################################################################################
 # Sample
@@ -25,8 +28,15 @@ class Sample:
     NOTE: The section is composed of a set of segments, and each segment is composed of two samples.
     Each sample has a point in the Cartesian coordinates and a radius that reflects the cross
     sectional area of the morphology at a certain point.
+
+    NOTE: The point can be given as a Vector, or as any sequence of three coordinates, such as a
+    tuple or a row of an array. In the latter case, the Vector is only created (and kept) when the
+    point is accessed, and the coordinates can be read without creating it with @get_coordinates.
     """
 
+    # The samples are the most numerous objects of the morphology, so they have no dictionary
+    __slots__ = ('_point', 'radius', 'index', 'parent_index')
+
     ################################################################################################
     # @__init__
     ################################################################################################
@@ -47,8 +57,8 @@ class Sample:
             The index of the parent sample, if exists. Used for tracking and connectivity.
         """
 
-        # Sample cartesian point
-        self.point = point
+        # Sample cartesian point, a Vector or a sequence of coordinates till accessed
+        self._point = point
 
         # Sample radius
         self.radius = radius
@@ -58,3 +68,35 @@ class Sample:
 
         # Sample's parent index
         self.parent_index = parent_index
+
+    ################################################################################################
+    # @point
+    ################################################################################################
+    @property
+    def point(self):
+        """The Cartesian point of the sample, created as a Vector on demand.
+
+        :return:
+            Sample position in the cartesian space, Vector((x, y, z)).
+        """
+
+        point = self._point
+        if point.__class__ is not Vector:
+            point = self._point = Vector((point[0], point[1], point[2]))
+        return point
+
+    @point.setter
+    def point(self, point):
+        self._point = point
+
+    ################################################################################################
+    # @get_coordinates
+    ################################################################################################
+    def get_coordinates(self):
+        """Returns the coordinates of the sample without creating a Vector if not existing.
+
+        :return:
+            The point of the sample as a Vector or a sequence of three coordinates.
+        """
+
+        return self._point
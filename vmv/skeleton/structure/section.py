@@ -31,6 +31,11 @@ class Section:
     sectional area of the morphology at a certain point.
     """
 
+    # No dictionary per section, all the attributes must be declared here
+    __slots__ = ('index', 'samples', 'parents', 'children', 'traversed',
+                 'first_sample_average_radius', 'last_sample_average_radius',
+                 'parent', 'parent_index', 'type')
+
     ################################################################################################
     # @__init__
     ################################################################################################
@@ -67,6 +72,13 @@ class Section:
         # The average radius of the last sample w.r.t post-connected sections
         self.last_sample_average_radius = 0
 
+        # The parent section and its index, only used when reconstructing arbors from samples
+        self.parent = None
+        self.parent_index = None
+
+        # The type of the section, only used when reconstructing arbors
+        self.type = None
+
     ################################################################################################
     # @has_children
     ################################################################################################
@@ -0,0 +1,167 @@
+####################################################################################################
+# Copyright (c) 2019 - 2023, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+
+####################################################################################################
+# SimulationData
+####################################################################################################
+class SimulationData:
+    """Simulation data of (vertex x step) values, loaded lazily on the first access.
+
+    NOTE: The data are loaded once into a float32 array of (step x vertex), typically a scratch
+    memory-mapped file, where every time step is a contiguous array of the values of all the
+    vertices. Any range of time steps is then served from this array without parsing the source
+    file again.
+    """
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 number_vertices,
+                 number_steps,
+                 load_data):
+        """Constructor
+
+        :param number_vertices:
+            The number of vertices.
+        :param number_steps:
+            The number of time steps.
+        :param load_data:
+            A function that loads all the time steps and returns them in a
+            number_steps x number_vertices float32 array.
+        """
+
+        # The dimensions of the data (vertex x step)
+        self.shape = (number_vertices, number_steps)
+
+        # The loading function
+        self.load_data = load_data
+
+        # The loaded (step x vertex) data, None until the first access
+        self.data = None
+
+    ################################################################################################
+    # @__len__
+    ################################################################################################
+    def __len__(self):
+        """Returns the number of vertices, similar to a (vertex x step) array.
+
+        :return:
+            The number of vertices.
+        """
+
+        return self.shape[0]
+
+    ################################################################################################
+    # @get_data
+    ################################################################################################
+    def get_data(self):
+        """Returns all the time steps, and loads them on the first access.
+
+        :return:
+            A (step x vertex) float32 array of all the values.
+        """
+
+        if self.data is None:
+            self.data = self.load_data()
+        return self.data
+
+    ################################################################################################
+    # @get_step
+    ################################################################################################
+    def get_step(self,
+                 step):
+        """Returns the values of all the vertices at a given time step.
+
+        :param step:
+            The time step.
+        :return:
+            A float32 array of the values of all the vertices.
+        """
+
+        return self.get_data()[step]
+
+    ################################################################################################
+    # @get_steps
+    ################################################################################################
+    def get_steps(self,
+                  start,
+                  end):
+        """Returns the values of all the vertices in a range of time steps.
+
+        :param start:
+            The first time step.
+        :param end:
+            The time step after the last one.
+        :return:
+            A (step x vertex) float32 array of the values.
+        """
+
+        return self.get_data()[start:end]
+
+    ################################################################################################
+    # @__getitem__
+    ################################################################################################
+    def __getitem__(self,
+                    key):
+        """Indexes the data similar to a (vertex x step) array, where a step out of bounds raises an
+        IndexError.
+
+        :param key:
+            The index.
+        :return:
+            The indexed values.
+        """
+
+        if isinstance(key, tuple) and len(key) == 2 and isinstance(key[1], (int, numpy.integer)):
+            step = int(key[1])
+            if step >= self.shape[1] or step < -self.shape[1]:
+                raise IndexError('Step [%d] is out of bounds for [%d] steps' % (
+                    step, self.shape[1]))
+            return self.get_step(step + self.shape[1] if step < 0 else step)[key[0]]
+        return self.get_data().T[key]
+
+    ################################################################################################
+    # @__iter__
+    ################################################################################################
+    def __iter__(self):
+        """Iterates over the vertices, similar to a (vertex x step) array.
+
+        :return:
+            An iterator over the values of every vertex at all the time steps.
+        """
+
+        return iter(self.get_data().T)
+
+    ################################################################################################
+    # @__array__
+    ################################################################################################
+    def __array__(self,
+                  dtype=None,
+                  copy=None):
+        """Returns all the time steps as a (vertex x step) array, a view of the loaded data.
+
+        :return:
+            A (vertex x step) array of all the values.
+        """
+
+        data = self.get_data().T
+        return data if dtype is None else data.astype(dtype)
@@ -0,0 +1,195 @@
+####################################################################################################
+# Copyright (c) 2019 - 2023, EPFL / Blue Brain Project
+# Author(s): Marwan Abdellah <marwan.abdellah@epfl.ch>
+#
+# This file is part of VessMorphoVis <https://github.com/BlueBrain/VessMorphoVis>
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This Blender-based tool is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR
+# PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <http://www.gnu.org/licenses/>.
+####################################################################################################
+
+# System imports
+import numpy
+
+
+####################################################################################################
+# SimulationStatistics
+####################################################################################################
+class SimulationStatistics:
+    """The global and per-step statistics (minimum, maximum and percentiles) of simulation data.
+
+    The statistics can be packed into a (step + 1) x (2 + percentiles) float32 array, where the
+    first row has the global statistics and every other row has the statistics of a time step,
+    in the format [MINIMUM, MAXIMUM, PERCENTILES].
+    """
+
+    # The percentiles of the values, in the range [0, 100]
+    PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+
+    ################################################################################################
+    # @__init__
+    ################################################################################################
+    def __init__(self,
+                 minimum,
+                 maximum,
+                 percentiles,
+                 steps_minimum,
+                 steps_maximum,
+                 steps_percentiles):
+        """Constructor
+
+        :param minimum:
+            The minimum value of all the time steps.
+        :param maximum:
+            The maximum value of all the time steps.
+        :param percentiles:
+            An array of the @PERCENTILES of the values of all the time steps.
+        :param steps_minimum:
+            An array of the minimum value of every time step.
+        :param steps_maximum:
+            An array of the maximum value of every time step.
+        :param steps_percentiles:
+            A (step x percentiles) array of the @PERCENTILES of the values of every time step.
+        """
+
+        # Global statistics
+        self.minimum = float(minimum)
+        self.maximum = float(maximum)
+        self.percentiles = numpy.asarray(percentiles, dtype=numpy.float32)
+
+        # Per-step statistics
+        self.steps_minimum = numpy.asarray(steps_minimum, dtype=numpy.float32)
+        self.steps_maximum = numpy.asarray(steps_maximum, dtype=numpy.float32)
+        self.steps_percentiles = numpy.asarray(steps_percentiles, dtype=numpy.float32)
+
+    ################################################################################################
+    # @get_percentile
+    ################################################################################################
+    def get_percentile(self,
+                       percentile,
+                       time_step=None):
+        """Returns one of the @PERCENTILES of the values of all the time steps, or of a given step.
+
+        :param percentile:
+            The percentile, one of the @PERCENTILES.
+        :param time_step:
+            The time step, or None for all the time steps.
+        :return:
+            The value of the percentile.
+        """
+
+        index = self.PERCENTILES.index(percentile)
+        if time_step is None:
+            return float(self.percentiles[index])
+        return float(self.steps_percentiles[time_step, index])
+
+    ################################################################################################
+    # @to_array
+    ################################################################################################
+    def to_array(self):
+        """Packs the statistics into a (step + 1) x (2 + percentiles) float32 array.
+
+        :return:
+            The array of the statistics.
+        """
+
+        array = numpy.empty((len(self.steps_minimum) + 1, 2 + len(self.PERCENTILES)),
+                            dtype=numpy.float32)
+        array[0, 0] = self.minimum
+        array[0, 1] = self.maximum
+        array[0, 2:] = self.percentiles
+        array[1:, 0] = self.steps_minimum
+        array[1:, 1] = self.steps_maximum
+        array[1:, 2:] = self.steps_percentiles
+        return array
+
+    ################################################################################################
+    # @from_array
+    ################################################################################################
+    @staticmethod
+    def from_array(array):
+        """Unpacks the statistics from an array created by @to_array.
+
+        :param array:
+            The array of the statistics.
+        :return:
+            The statistics, or None if the array does not match the @PERCENTILES.
+        """
+
+        array = numpy.asarray(array, dtype=numpy.float32)
+        if array.ndim != 2 or len(array) == 0 or \
+                array.shape[1] != 2 + len(SimulationStatistics.PERCENTILES):
+            return None
+        return SimulationStatistics(
+            minimum=array[0, 0], maximum=array[0, 1], percentiles=array[0, 2:],
+            steps_minimum=array[1:, 0], steps_maximum=array[1:, 1],
+            steps_percentiles=array[1:, 2:])
+
+
+####################################################################################################
+# @compute_simulation_statistics
+####################################################################################################
+def compute_simulation_statistics(simulation_data,
+                                  histogram_bins=4096):
+    """Computes the global and per-step statistics of some simulation data.
+
+    The data are scanned a time step at once, so only a single time step of lazily-loaded or
+    memory-mapped data is needed at any time. The per-step statistics are exact, while the global
+    percentiles are interpolated from a histogram of all the values, with an error that is less
+    than (maximum - minimum) / histogram_bins.
+
+    :param simulation_data:
+        The (vertex x step) simulation data.
+    :param histogram_bins:
+        The number of bins of the histogram used to compute the global percentiles.
+    :return:
+        The @SimulationStatistics of the data.
+    """
+
+    from .morphology import Morphology
+
+    number_steps = Morphology.get_simulation_data_number_steps(simulation_data)
+    percentiles = SimulationStatistics.PERCENTILES
+
+    # The statistics of every time step
+    steps_minimum = numpy.zeros(number_steps, dtype=numpy.float32)
+    steps_maximum = numpy.zeros(number_steps, dtype=numpy.float32)
+    steps_percentiles = numpy.zeros((number_steps, len(percentiles)), dtype=numpy.float32)
+    for time_step in range(number_steps):
+        values = Morphology.get_simulation_data_at_step(simulation_data, time_step)
+        steps_minimum[time_step] = values.min()
+        steps_maximum[time_step] = values.max()
+        steps_percentiles[time_step] = numpy.percentile(values, percentiles)
+
+    # No time steps
+    if number_steps == 0:
+        return SimulationStatistics(0.0, 0.0, numpy.zeros(len(percentiles)),
+                                    steps_minimum, steps_maximum, steps_percentiles)
+
+    minimum = float(steps_minimum.min())
+    maximum = float(steps_maximum.max())
+
+    # The histogram of all the values, accumulated a time step at once
+    histogram = numpy.zeros(histogram_bins, dtype=numpy.int64)
+    for time_step in range(number_steps):
+        values = Morphology.get_simulation_data_at_step(simulation_data, time_step)
+        histogram += numpy.histogram(values, bins=histogram_bins, range=(minimum, maximum))[0]
+
+    # Interpolate the global percentiles within the bins of the histogram
+    cumulative_histogram = numpy.cumsum(histogram)
+    ranks = numpy.asarray(percentiles, dtype=numpy.float64) / 100.0 * cumulative_histogram[-1]
+    bins = numpy.minimum(numpy.searchsorted(cumulative_histogram, ranks), histogram_bins - 1)
+    below = numpy.where(bins > 0, cumulative_histogram[bins - 1], 0)
+    fractions = (ranks - below) / numpy.maximum(histogram[bins], 1)
+    global_percentiles = minimum + (bins + fractions) * ((maximum - minimum) / histogram_bins)
+
+    # Return the statistics
+    return SimulationStatistics(minimum, maximum, global_percentiles,
+                                steps_minimum, steps_maximum, steps_percentiles)
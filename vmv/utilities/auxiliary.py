@@ -65,6 +65,45 @@ def get_index(value,
     return math.ceil((value - minimum_value) / (1.0 * delta)) - 1
 
 
+####################################################################################################
+# @get_indices
+####################################################################################################
+def get_indices(values,
+                minimum_value,
+                maximum_value,
+                number_steps):
+    """Gets the indices of an array of values that exist between a minimum and maximum values on
+    a scale at once. This is the vectorized version of get_index, where the values that do not
+    exist between the given minimum and maximum values will have the index [-1].
+
+    :param values:
+        An array of values.
+    :param minimum_value:
+        The minimum value of the scale.
+    :param maximum_value:
+        The maximum value of the scale.
+    :param number_steps:
+        The number of steps with which the scale between the minimum and maximum values will
+        be divided.
+    :return:
+        An int32 array of the indices of the colormap.
+    """
+
+    import numpy
+
+    values = numpy.asarray(values, dtype=numpy.float64)
+
+    # Get the delta
+    delta = (1.0 * (maximum_value - minimum_value)) / number_steps
+
+    # The indices of the color map
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        indices = numpy.ceil((values - minimum_value) / delta) - 1
+    indices[(values < minimum_value) | (values > maximum_value)] = \
+        vmv.consts.Math.INDEX_OUT_OF_RANGE
+    return indices.astype(numpy.int32)
+
+
 ####################################################################################################
 # @get_random_string
 ####################################################################################################
@@ -138,3 +138,87 @@ def equal(arg1, arg2, epsilon=1e-5):
     if math.fabs(arg1 - arg2) < epsilon:
         return True
     return False
+
+
+####################################################################################################
+# @get_close_points_pairs
+####################################################################################################
+def get_close_points_pairs(points,
+                           threshold):
+    """Finds all the ordered pairs of points that are closer to each other than a given threshold.
+
+    NOTE: The points are hashed into a uniform grid with a cell size that is slightly larger than
+    the threshold, and only the points in the neighbouring cells are compared, which is linear
+    w.r.t the number of points instead of comparing every point against every other one.
+    The cell size is slightly extended to make the search conservative w.r.t the floating point
+    precision, and therefore the caller can refine the results with its own distance test.
+
+    :param points:
+        A numpy array of the shape (N, 3) containing the Cartesian coordinates of the points.
+    :param threshold:
+        The distance threshold.
+    :return:
+        Two numpy arrays (I, J) of the indices of the pairs, where I is not equal to J, sorted
+        by I and then by J. Each pair is reported in both orders.
+    """
+
+    import numpy
+
+    # The grid cell size
+    cell_size = 1.01 * threshold
+
+    # The cells of the points
+    cells = numpy.floor(points / cell_size).astype(numpy.int64)
+
+    # Large primes used to hash the cells into single integers. Collisions are harmless, since the
+    # candidate pairs are filtered with a distance test afterwards.
+    primes = numpy.array([73856093, 19349663, 83492791], dtype=numpy.int64)
+
+    # Sort the hashes of the cells to be able to search them, and get the range of the points
+    # located in every occupied cell
+    hashes = cells @ primes
+    order = numpy.argsort(hashes, kind='stable')
+    sorted_hashes = hashes[order]
+    cells_hashes, cells_starts, cells_counts = numpy.unique(
+        sorted_hashes, return_index=True, return_counts=True)
+
+    # Collect the candidate pairs from the 27 neighbouring cells
+    pairs_i = list()
+    pairs_j = list()
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            for dz in (-1, 0, 1):
+
+                # The hash of the neighbouring cell of every point. Since the hash is linear, the
+                # queries remain (almost) sorted, which makes the search much faster.
+                shift = numpy.array([dx, dy, dz], dtype=numpy.int64) @ primes
+                neighbour_hashes = sorted_hashes + shift
+
+                # The range of the points that are located in this cell, if occupied
+                cell = numpy.minimum(numpy.searchsorted(cells_hashes, neighbour_hashes),
+                                     len(cells_hashes) - 1)
+                occupied = cells_hashes[cell] == neighbour_hashes
+                lower = cells_starts[cell]
+                counts = numpy.where(occupied, cells_counts[cell], 0)
+                total = int(counts.sum())
+                if total == 0:
+                    continue
+
+                # Expand the ranges into pairs
+                i = numpy.repeat(order, counts)
+                offsets = numpy.arange(total) - numpy.repeat(numpy.cumsum(counts) - counts, counts)
+                j = order[numpy.repeat(lower, counts) + offsets]
+
+                # Filter the pairs with the extended distance
+                distances = numpy.linalg.norm(points[i] - points[j], axis=1)
+                valid = (i != j) & (distances < cell_size)
+                pairs_i.append(i[valid])
+                pairs_j.append(j[valid])
+
+    # No pairs at all
+    if len(pairs_i) == 0:
+        return numpy.zeros(0, dtype=numpy.int64), numpy.zeros(0, dtype=numpy.int64)
+
+    # Remove the duplicate pairs, and sort them
+    keys = numpy.unique(numpy.concatenate(pairs_i) * len(points) + numpy.concatenate(pairs_j))
+    return keys // len(points), keys % len(points)
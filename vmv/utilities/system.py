@@ -18,6 +18,7 @@
 # System imports
 import os
 import subprocess
+import sys
 import importlib
 
 
@@ -69,3 +70,23 @@ def import_module(module_name: str,
         if warn_me_if_unavailable:
             print('The module [ %s ] is not installed in this python environment' % module_name)
         return None
+
+
+####################################################################################################
+# @import_standalone_module
+####################################################################################################
+def import_standalone_module(file_path):
+    """Imports a module that does not depend on the vmv package, or Blender, from its file as a
+    top-level module. The functions of this module can then be executed in worker processes that
+    import it by its name, without importing the vmv package.
+
+    :param file_path:
+        The path to the file of the module.
+    :return:
+        A reference to the module.
+    """
+
+    directory, file_name = os.path.split(os.path.abspath(file_path))
+    if directory not in sys.path:
+        sys.path.append(directory)
+    return importlib.import_module(os.path.splitext(file_name)[0])